@@ -0,0 +1,82 @@
+"""Set-based balance reconciliation against the transaction ledger."""
+from decimal import Decimal
+
+from django.db import connection
+from django.db.models import Case, DecimalField, F, Value, When
+
+from .models import Account
+
+CENT = Decimal("0.01")
+
+# One grouped pass over transactions: every transaction contributes a signed
+# leg to its account, and transfers add a second leg to the destination.
+_LEDGER_SQL = """
+    SELECT a.id, a.current_balance, a.initial_balance + COALESCE(l.net, 0)
+    FROM accounts a
+    LEFT JOIN (
+        SELECT account_id, SUM(delta) AS net
+        FROM (
+            SELECT account_id,
+                   CASE WHEN type = 'income' THEN amount ELSE -amount END AS delta
+            FROM transactions
+            UNION ALL
+            SELECT transfer_to_account_id, amount
+            FROM transactions
+            WHERE type = 'transfer' AND transfer_to_account_id IS NOT NULL
+        ) legs
+        GROUP BY account_id
+    ) l ON l.account_id = a.id
+"""
+
+
+def _to_decimal(value) -> Decimal:
+    # SQLite returns floats for NUMERIC sums; Postgres returns Decimal
+    return Decimal(str(value or 0)).quantize(CENT)
+
+
+def find_drift(user_id=None) -> list:
+    """
+    Accounts whose current_balance differs from initial_balance + ledger.
+    Returns dicts with account_id, current, expected and drift.
+    """
+    sql = _LEDGER_SQL
+    params = []
+    if user_id:
+        user_field = Account._meta.get_field("user_id")
+        sql += " WHERE a.user_id = %s"
+        params.append(user_field.get_db_prep_value(user_id, connection))
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    drifted = []
+    for account_id, current, expected in rows:
+        current, expected = _to_decimal(current), _to_decimal(expected)
+        if current != expected:
+            drifted.append(
+                {
+                    "account_id": Account._meta.pk.to_python(account_id),
+                    "current": current,
+                    "expected": expected,
+                    "drift": expected - current,
+                }
+            )
+    return drifted
+
+
+def apply_corrections(drifted: list, batch_size: int = 500) -> int:
+    """
+    Shift each drifted balance by its drift in one UPDATE per batch.
+    Applying a delta rather than an absolute value keeps trigger updates
+    committed since the drift was measured.
+    """
+    for start in range(0, len(drifted), batch_size):
+        batch = drifted[start : start + batch_size]
+        correction = Case(
+            *[When(id=row["account_id"], then=Value(row["drift"])) for row in batch],
+            output_field=DecimalField(max_digits=15, decimal_places=2),
+        )
+        Account.objects.filter(id__in=[row["account_id"] for row in batch]).update(
+            current_balance=F("current_balance") + correction
+        )
+    return len(drifted)
@@ -0,0 +1,26 @@
+"""Recompute account_balance_snapshots from the ledger and repair drift."""
+from django.core.management.base import BaseCommand
+
+from apps.accounts.snapshots import rebuild_snapshots
+
+
+class Command(BaseCommand):
+    help = "Rebuild daily account balance snapshots from raw transactions."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="Only rebuild this user's snapshots.")
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drift without writing any changes.",
+        )
+
+    def handle(self, *args, **options):
+        counts = rebuild_snapshots(user_id=options["user"], dry_run=options["dry_run"])
+        verb = "Found" if options["dry_run"] else "Repaired"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} drift: {counts['created']} missing, "
+                f"{counts['updated']} changed, {counts['deleted']} stale snapshot rows."
+            )
+        )
@@ -0,0 +1,35 @@
+"""Recompute account balances from the ledger and report drift."""
+from django.core.management.base import BaseCommand
+from django.db import transaction as db_transaction
+
+from apps.accounts.ledger import apply_corrections, find_drift
+
+
+class Command(BaseCommand):
+    help = "Check current_balance = initial_balance + ledger for every account."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="Only reconcile this user's accounts.")
+        parser.add_argument(
+            "--fix", action="store_true", help="Correct drifted balances in place."
+        )
+
+    def handle(self, *args, **options):
+        with db_transaction.atomic():
+            drifted = find_drift(options["user"])
+            for row in drifted:
+                self.stdout.write(
+                    f"{row['account_id']}: current={row['current']} "
+                    f"expected={row['expected']} drift={row['drift']}"
+                )
+            if options["fix"] and drifted:
+                apply_corrections(drifted)
+
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS("All balances match the ledger."))
+        elif options["fix"]:
+            self.stdout.write(self.style.SUCCESS(f"Corrected {len(drifted)} accounts."))
+        else:
+            self.stdout.write(
+                self.style.WARNING(f"{len(drifted)} accounts drifted; rerun with --fix.")
+            )
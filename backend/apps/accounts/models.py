@@ -39,3 +39,26 @@ class Account(models.Model):
 
     def __str__(self):
         return f"{self.name} ({self.type})"
+
+
+class BalanceSnapshot(models.Model):
+    """
+    An account's balance at the end of a day with activity. Kept in sync by
+    the balance_snapshot triggers in supabase/schema.sql, which roll a
+    backdated change forward through every later day;
+    `manage.py rebuild_balance_snapshots` repairs any drift.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    user_id = models.UUIDField()
+    account_id = models.UUIDField()
+    snapshot_date = models.DateField()
+    balance = models.DecimalField(max_digits=17, decimal_places=2)
+
+    class Meta:
+        db_table = "account_balance_snapshots"
+        managed = False
+        unique_together = [("account_id", "snapshot_date")]
+
+    def __str__(self):
+        return f"{self.account_id} {self.snapshot_date}: {self.balance}"
@@ -0,0 +1,199 @@
+"""Daily account balance snapshots.
+
+`account_balance_snapshots` holds each account's balance at the end of every
+day with activity; the balance_snapshot triggers in supabase/schema.sql keep
+it in sync, rolling a backdated write forward through the later days.
+Without a row a day carries the previous day's balance, and before an
+account's first row its balance is initial_balance.
+
+A chart over [start, end] reads the opening balance (the last row on or
+before `start`, one probe of the (account_id, snapshot_date) key per
+account) alongside the accounts it needs anyway, then one index range of
+rows after `start`. The rows are forward-filled into one value per day with
+NumPy.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+
+import numpy as np
+from django.db import transaction as db_transaction
+from django.db.models import Case, DecimalField, F, OuterRef, Subquery, Sum, When
+from django.db.models.functions import Coalesce
+
+from apps.transactions.models import Transaction
+from .models import Account, BalanceSnapshot
+
+CENT = Decimal("0.01")
+DEFAULT_HISTORY_DAYS = 90
+MAX_HISTORY_DAYS = 3660
+
+
+def opening_balance(start: date):
+    """Expression for an account's balance at the end of `start`."""
+    last = BalanceSnapshot.objects.filter(
+        account_id=OuterRef("id"), snapshot_date__lte=start
+    ).order_by("-snapshot_date")
+    return Coalesce(
+        Subquery(last.values("balance")[:1]),
+        F("initial_balance"),
+        output_field=DecimalField(max_digits=17, decimal_places=2),
+    )
+
+
+def daily_balances(opening, rows, start: date, end: date):
+    """
+    One balance per day of [start, end]: `opening` until the first of
+    `rows` ((snapshot_date, balance) after `start`, in date order), then
+    each row's balance until the next.
+    """
+    days = np.arange(start.toordinal(), end.toordinal() + 1)
+    dates = np.fromiter((d.toordinal() for d, _ in rows), np.int64, len(rows))
+    balances = np.array([float(opening)] + [float(b) for _, b in rows])
+    return balances[np.searchsorted(dates, days, side="right")]
+
+
+def _dates(start: date, end: date) -> list:
+    return [
+        (start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)
+    ]
+
+
+def balance_history(account, start: date, end: date) -> dict:
+    """`account` must carry an `opening` annotation (opening_balance(start))."""
+    rows = list(
+        BalanceSnapshot.objects.filter(
+            account_id=account.id, snapshot_date__gt=start, snapshot_date__lte=end
+        )
+        .order_by("snapshot_date")
+        .values_list("snapshot_date", "balance")
+    )
+    return {
+        "account_id": str(account.id),
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        "dates": _dates(start, end),
+        "balances": np.round(
+            daily_balances(account.opening, rows, start, end), 2
+        ).tolist(),
+    }
+
+
+def net_worth(user_id, start: date, end: date) -> dict:
+    """Daily assets, liabilities and net worth over the user's active accounts."""
+    accounts = list(
+        Account.objects.filter(user_id=user_id, is_active=True)
+        .annotate(opening=opening_balance(start))
+        .order_by("created_at", "id")
+    )
+    rows = {account.id: [] for account in accounts}
+    snapshots = (
+        BalanceSnapshot.objects.filter(
+            user_id=user_id, snapshot_date__gt=start, snapshot_date__lte=end
+        )
+        .order_by("snapshot_date")
+        .values_list("account_id", "snapshot_date", "balance")
+    )
+    for account_id, snapshot_date, balance in snapshots:
+        if account_id in rows:
+            rows[account_id].append((snapshot_date, balance))
+
+    matrix = np.zeros((len(accounts), (end - start).days + 1))
+    for i, account in enumerate(accounts):
+        matrix[i] = daily_balances(account.opening, rows[account.id], start, end)
+    assets = np.clip(matrix, 0, None).sum(axis=0)
+    liabilities = -np.clip(matrix, None, 0).sum(axis=0)
+    return {
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        "dates": _dates(start, end),
+        "assets": np.round(assets, 2).tolist(),
+        "liabilities": np.round(liabilities, 2).tolist(),
+        "net_worth": np.round(assets - liabilities, 2).tolist(),
+    }
+
+
+def compute_snapshots(user_id=None) -> dict:
+    """
+    {(account_id, snapshot_date): (user_id, balance)} replayed from the
+    ledger: initial_balance plus the running sum of each day's legs.
+    """
+    transactions = Transaction.objects.all()
+    accounts = Account.objects.all()
+    if user_id:
+        transactions = transactions.filter(user_id=user_id)
+        accounts = accounts.filter(user_id=user_id)
+
+    signed = Case(
+        When(type=Transaction.TYPE_INCOME, then=F("amount")), default=-F("amount")
+    )
+    legs = list(
+        transactions.values_list("account_id", "transaction_date")
+        .annotate(delta=Sum(signed))
+        .order_by()
+    )
+    legs += list(
+        transactions.filter(
+            type=Transaction.TYPE_TRANSFER, transfer_to_account_id__isnull=False
+        )
+        .values_list("transfer_to_account_id", "transaction_date")
+        .annotate(delta=Sum("amount"))
+        .order_by()
+    )
+    deltas = {}
+    for account_id, day, delta in legs:
+        amount = Decimal(str(delta or 0)).quantize(CENT)
+        deltas[account_id, day] = deltas.get((account_id, day), Decimal("0")) + amount
+
+    owners = {
+        account_id: (owner, Decimal(str(initial)).quantize(CENT))
+        for account_id, owner, initial in accounts.values_list(
+            "id", "user_id", "initial_balance"
+        )
+    }
+    expected, running = {}, {}
+    for account_id, day in sorted(deltas):
+        if account_id not in owners:
+            continue
+        owner, initial = owners[account_id]
+        balance = running.get(account_id, initial) + deltas[account_id, day]
+        running[account_id] = balance
+        expected[account_id, day] = (owner, balance)
+    return expected
+
+
+def rebuild_snapshots(user_id=None, dry_run: bool = False) -> dict:
+    """
+    Recompute snapshots from the ledger and repair rows that drifted.
+    Returns counts of created, updated and deleted snapshot rows.
+    """
+    expected = compute_snapshots(user_id)
+    existing = BalanceSnapshot.objects.all()
+    if user_id:
+        existing = existing.filter(user_id=user_id)
+
+    to_update, to_delete = [], []
+    for snapshot in existing:
+        fresh = expected.pop((snapshot.account_id, snapshot.snapshot_date), None)
+        if fresh is None:
+            to_delete.append(snapshot.id)
+        elif snapshot.balance != fresh[1]:
+            snapshot.balance = fresh[1]
+            to_update.append(snapshot)
+    to_create = [
+        BalanceSnapshot(
+            user_id=owner, account_id=account_id, snapshot_date=day, balance=balance
+        )
+        for (account_id, day), (owner, balance) in expected.items()
+    ]
+
+    if not dry_run:
+        with db_transaction.atomic():
+            BalanceSnapshot.objects.filter(id__in=to_delete).delete()
+            BalanceSnapshot.objects.bulk_update(to_update, ["balance"], batch_size=1000)
+            BalanceSnapshot.objects.bulk_create(to_create, batch_size=1000)
+
+    return {
+        "created": len(to_create),
+        "updated": len(to_update),
+        "deleted": len(to_delete),
+    }
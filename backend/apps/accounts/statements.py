@@ -0,0 +1,191 @@
+"""Credit card statement cycles.
+
+A card's statement closes on its billing_date each month, or on the last
+day of months that are shorter. The last closed statement covers
+(previous close, last close] and the current cycle runs from the day after
+the last close up to the next one; a statement closing today is still the
+current cycle. Payment is due on the first due_date after the close.
+
+Cycles depend only on the billing day, so the 31 possible cycles are
+computed up front and joined to the user's cards in SQL. One grouped pass
+over the transaction legs since the earliest of those windows then sums
+every card's charges and credits per window with conditional aggregates,
+so the query count does not grow with the number of cards.
+
+A statement balance is what was owed at the close: what is owed now minus
+everything posted after it. Amounts are positive when owed.
+"""
+import calendar
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import connection
+
+from .models import Account
+
+CENT = Decimal("0.01")
+# Issuers differ; this is the common "a share of the balance, at least a
+# floor, never more than the balance" rule
+MINIMUM_PAYMENT_RATE = Decimal("0.05")
+MINIMUM_PAYMENT_FLOOR = Decimal("10.00")
+BILLING_DAYS = range(1, 32)
+
+
+def closing_date(year: int, month: int, day: int) -> date:
+    """`day` of the month, clamped to the month's last day."""
+    return date(year, month, min(day, calendar.monthrange(year, month)[1]))
+
+
+def _shift(day: date, months: int) -> tuple:
+    index = day.year * 12 + day.month - 1 + months
+    return index // 12, index % 12 + 1
+
+
+@dataclass(frozen=True)
+class StatementCycle:
+    previous_close: date
+    last_close: date
+    next_close: date
+
+    @classmethod
+    def for_billing_day(cls, billing_day: int, today: date) -> "StatementCycle":
+        close = closing_date(today.year, today.month, billing_day)
+        if close < today:
+            last = close
+            next_close = closing_date(*_shift(today, 1), billing_day)
+        else:
+            last = closing_date(*_shift(today, -1), billing_day)
+            next_close = close
+        return cls(closing_date(*_shift(last, -1), billing_day), last, next_close)
+
+    def payment_due(self, due_day: int) -> date:
+        """The first `due_day` after the last close."""
+        due = closing_date(self.last_close.year, self.last_close.month, due_day)
+        if due <= self.last_close:
+            due = closing_date(*_shift(self.last_close, 1), due_day)
+        return due
+
+
+# Legs as in ledger._LEDGER_SQL, signed as owed on the card: spending and
+# transfers out add to the debt, income (refunds) and transfers in pay it off
+_STATEMENTS_SQL = """
+    WITH cycles (billing_day, previous_close, last_close) AS (
+        {cycles}
+    ),
+    cards AS (
+        SELECT a.id, c.previous_close, c.last_close
+        FROM accounts a
+        JOIN cycles c ON c.billing_day = a.billing_date
+        WHERE a.user_id = %s AND a.type = %s AND a.is_active
+    ),
+    legs AS (
+        SELECT account_id, transaction_date,
+               CASE WHEN type = 'income' THEN -amount ELSE amount END AS owed
+        FROM transactions
+        WHERE user_id = %s AND transaction_date > %s
+        UNION ALL
+        SELECT transfer_to_account_id, transaction_date, -amount
+        FROM transactions
+        WHERE user_id = %s AND transaction_date > %s
+          AND type = 'transfer' AND transfer_to_account_id IS NOT NULL
+    )
+    SELECT cards.id,
+           SUM(CASE WHEN l.transaction_date <= cards.last_close AND l.owed > 0
+                    THEN l.owed ELSE 0 END),
+           SUM(CASE WHEN l.transaction_date <= cards.last_close AND l.owed < 0
+                    THEN -l.owed ELSE 0 END),
+           SUM(CASE WHEN l.transaction_date > cards.last_close AND l.owed > 0
+                    THEN l.owed ELSE 0 END),
+           SUM(CASE WHEN l.transaction_date > cards.last_close AND l.owed < 0
+                    THEN -l.owed ELSE 0 END)
+    FROM cards
+    LEFT JOIN legs l
+        ON l.account_id = cards.id AND l.transaction_date > cards.previous_close
+    GROUP BY cards.id
+"""
+
+
+def _to_decimal(value) -> Decimal:
+    # SQLite returns floats for NUMERIC sums; Postgres returns Decimal
+    return Decimal(str(value or 0)).quantize(CENT)
+
+
+def window_totals(user_id, cycles: dict) -> dict:
+    """
+    {card id: (statement charges, statement credits, cycle charges, cycle
+    credits)} for the user's active cards, in one query.
+    """
+    ops = connection.ops
+    user = Account._meta.get_field("user_id").get_db_prep_value(user_id, connection)
+    since = ops.adapt_datefield_value(min(c.previous_close for c in cycles.values()))
+    params = []
+    for day, cycle in cycles.items():
+        params += [
+            day,
+            ops.adapt_datefield_value(cycle.previous_close),
+            ops.adapt_datefield_value(cycle.last_close),
+        ]
+    params += [user, Account.TYPE_CREDIT_CARD, user, since, user, since]
+    sql = _STATEMENTS_SQL.format(
+        cycles=" UNION ALL ".join(["SELECT %s, %s, %s"] * len(cycles))
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    return {
+        str(Account._meta.pk.to_python(card_id)): tuple(map(_to_decimal, totals))
+        for card_id, *totals in rows
+    }
+
+
+def minimum_due(balance: Decimal) -> Decimal:
+    if balance <= 0:
+        return Decimal("0.00")
+    share = (balance * MINIMUM_PAYMENT_RATE).quantize(CENT)
+    return min(max(share, MINIMUM_PAYMENT_FLOOR), balance)
+
+
+def card_statement(card, totals, today: date) -> dict:
+    """
+    statement, current_cycle and utilization fields for one card, from its
+    card_statements() totals; the cycles are null without a billing_date.
+    """
+    owed = -Decimal(str(card.current_balance or 0))
+    limit = Decimal(str(card.credit_limit or 0))
+    fields = {
+        "statement": None,
+        "current_cycle": None,
+        "utilization": round(float(max(owed, 0) / limit * 100), 1) if limit else None,
+    }
+    if totals is None or not card.billing_date:
+        return fields
+
+    cycle = StatementCycle.for_billing_day(card.billing_date, today)
+    statement_charges, statement_credits, cycle_charges, cycle_credits = totals
+    balance = owed - (cycle_charges - cycle_credits)
+    due = cycle.payment_due(card.due_date) if card.due_date else None
+    fields["statement"] = {
+        "start": (cycle.previous_close + timedelta(days=1)).isoformat(),
+        "end": cycle.last_close.isoformat(),
+        "charges": float(statement_charges),
+        "credits": float(statement_credits),
+        "balance": float(balance),
+        "minimum_due": float(minimum_due(balance)),
+        "due_date": due.isoformat() if due else None,
+        "days_until_due": (due - today).days if due else None,
+    }
+    fields["current_cycle"] = {
+        "start": (cycle.last_close + timedelta(days=1)).isoformat(),
+        "end": cycle.next_close.isoformat(),
+        "charges": float(cycle_charges),
+        "credits": float(cycle_credits),
+    }
+    return fields
+
+
+def card_statements(user_id, today: date | None = None) -> dict:
+    """{card id: window_totals() row} for every active card of the user."""
+    today = today or date.today()
+    cycles = {day: StatementCycle.for_billing_day(day, today) for day in BILLING_DAYS}
+    return window_totals(user_id, cycles)
@@ -1,14 +1,32 @@
 """Account views."""
+from datetime import date
 from decimal import Decimal
+from django.shortcuts import get_object_or_404
 from rest_framework import viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
+from utils.bulk import BulkWriteMixin
+from utils.cache import CacheVersionMixin
+from utils.idempotency import IdempotencyMixin
+from utils.metadata import METADATA_NAMESPACE
+from utils.periods import date_param
+from utils.rows import RowListMixin
+from . import snapshots
 from .models import Account
+from .statements import card_statement, card_statements
 from .serializers import AccountSerializer
 
 
-class AccountViewSet(viewsets.ModelViewSet):
+class AccountViewSet(
+    CacheVersionMixin,
+    IdempotencyMixin,
+    BulkWriteMixin,
+    RowListMixin,
+    viewsets.ModelViewSet,
+):
+    cache_namespaces = ("dashboard", METADATA_NAMESPACE)
     serializer_class = AccountSerializer
 
     def get_queryset(self):
@@ -51,8 +69,57 @@ class AccountViewSet(viewsets.ModelViewSet):
     def credit_cards(self, request):
         """
         GET /accounts/credit_cards/
-        Credit card accounts with billing/due date info.
+        Credit card accounts with billing/due date info, each with its last
+        closed statement (balance, minimum due, due date), the current
+        cycle's charges and credits, and utilization of the credit limit in
+        percent. Two queries however many cards there are.
         """
-        cards = self.get_queryset().filter(type=Account.TYPE_CREDIT_CARD)
-        serializer = self.get_serializer(cards, many=True)
-        return Response(serializer.data)
+        today = date.today()
+        cards = list(self.get_queryset().filter(type=Account.TYPE_CREDIT_CARD))
+        totals = card_statements(request.user.id, today)
+        data = self.get_serializer(cards, many=True).data
+        for item, card in zip(data, cards):
+            item.update(card_statement(card, totals.get(str(card.id)), today))
+        return Response(data)
+
+    @action(detail=True, methods=["get"])
+    def balance_history(self, request, pk=None):
+        """
+        GET /accounts/{id}/balance_history/
+        The account's end-of-day balance for every day from `from` to `to`
+        (inclusive; default: the last 90 days), read from the daily
+        snapshots. "balances" lines up with "dates".
+        Query params: from, to (YYYY-MM-DD)
+        """
+        start, end = self._history_window()
+        account = get_object_or_404(
+            self.get_queryset().annotate(opening=snapshots.opening_balance(start)),
+            pk=pk,
+        )
+        return Response(snapshots.balance_history(account, start, end))
+
+    @action(detail=False, methods=["get"])
+    def net_worth(self, request):
+        """
+        GET /accounts/net_worth/
+        Daily assets (positive balances), liabilities (negative balances,
+        e.g. credit cards) and net worth across the active accounts.
+        Query params: from, to (YYYY-MM-DD; default: the last 90 days)
+        """
+        start, end = self._history_window()
+        return Response(snapshots.net_worth(request.user.id, start, end))
+
+    def _history_window(self) -> tuple:
+        params = self.request.query_params
+        end = date_param(params, "to") or date.today()
+        # The default window is clamped so a `to` in year 1 cannot underflow
+        start = date_param(params, "from") or date.fromordinal(
+            max(end.toordinal() - snapshots.DEFAULT_HISTORY_DAYS + 1, 1)
+        )
+        if start > end:
+            raise ValidationError({"to": "Must not be before from."})
+        if (end - start).days >= snapshots.MAX_HISTORY_DAYS:
+            raise ValidationError(
+                {"from": f"At most {snapshots.MAX_HISTORY_DAYS} days per request."}
+            )
+        return start, end
@@ -1,9 +1,14 @@
 """Budget plan serializers."""
 from rest_framework import serializers
+
+from apps.categories.models import Category
+from utils.serializers import OwnedReferencesMixin
 from .models import BudgetPlan
 
 
-class BudgetPlanSerializer(serializers.ModelSerializer):
+class BudgetPlanSerializer(OwnedReferencesMixin, serializers.ModelSerializer):
+    owned_references = {"category_id": Category}
+
     class Meta:
         model = BudgetPlan
         fields = [
@@ -1,17 +1,29 @@
 """Budget plan views."""
-from django.db.models import Sum
 from rest_framework import viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
-from datetime import date
 
-from apps.categories.models import Category
+from apps.transactions import rollups
 from apps.transactions.models import Transaction
+from utils.bulk import BulkWriteMixin
+from utils.cache import CacheVersionMixin
+from utils.idempotency import IdempotencyMixin
+from utils.metadata import category_names
+from utils.periods import PERIOD_MONTH, Period
+from utils.rows import RowListMixin
 from .models import BudgetPlan
 from .serializers import BudgetPlanSerializer, BudgetProgressSerializer
 
 
-class BudgetPlanViewSet(viewsets.ModelViewSet):
+class BudgetPlanViewSet(
+    CacheVersionMixin,
+    IdempotencyMixin,
+    BulkWriteMixin,
+    RowListMixin,
+    viewsets.ModelViewSet,
+):
+    cache_namespaces = ("dashboard",)
     serializer_class = BudgetPlanSerializer
 
     def get_queryset(self):
@@ -34,32 +46,21 @@ class BudgetPlanViewSet(viewsets.ModelViewSet):
         Budget vs actual spending for a given month/year.
         Defaults to current month.
         """
-        today = date.today()
-        month = int(request.query_params.get("month", today.month))
-        year = int(request.query_params.get("year", today.year))
+        period = Period.from_params(request.query_params, default=PERIOD_MONTH)
+        if period.single_month() is None:
+            raise ValidationError({"period": "Budgets are monthly; pick a single month."})
+        year, month = period.single_month()
 
         budgets = BudgetPlan.objects.filter(
             user_id=request.user.id, month=month, year=year
         )
 
         # Actual spending per category for this month
-        actuals = (
-            Transaction.objects.filter(
-                user_id=request.user.id,
-                type=Transaction.TYPE_EXPENSE,
-                transaction_date__month=month,
-                transaction_date__year=year,
-            )
-            .values("category_id")
-            .annotate(total=Sum("amount"))
+        actual_map = rollups.totals_by_category(
+            request.user.id, period, Transaction.TYPE_EXPENSE
         )
-        actual_map = {str(row["category_id"]): row["total"] for row in actuals}
 
-        category_ids = list(budgets.values_list("category_id", flat=True))
-        categories = {
-            str(c.id): c.name
-            for c in Category.objects.filter(id__in=category_ids)
-        }
+        categories = category_names(request.user.id)
 
         results = []
         for budget in budgets:
@@ -19,6 +19,7 @@ class Category(models.Model):
     color = models.CharField(max_length=7, blank=True)  # hex color
     is_default = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = "categories"
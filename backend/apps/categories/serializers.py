@@ -14,5 +14,6 @@ class CategorySerializer(serializers.ModelSerializer):
             "color",
             "is_default",
             "created_at",
+            "updated_at",
         ]
-        read_only_fields = ["id", "created_at"]
+        read_only_fields = ["id", "created_at", "updated_at"]
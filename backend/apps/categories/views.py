@@ -3,6 +3,9 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from utils.bulk import BulkWriteMixin
+from utils.cache import CacheVersionMixin
+from utils.metadata import METADATA_NAMESPACE
 from .models import Category
 from .serializers import CategorySerializer
 
@@ -26,7 +29,8 @@ DEFAULT_CATEGORIES = [
 ]
 
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(CacheVersionMixin, BulkWriteMixin, viewsets.ModelViewSet):
+    cache_namespaces = ("dashboard", METADATA_NAMESPACE)
     serializer_class = CategorySerializer
 
     def get_queryset(self):
@@ -0,0 +1,171 @@
+"""Dashboard payload: independent queries plus a pure assembly step.
+
+Every query in QUERIES depends only on (user_id, today), so callers are free
+to run them one after another (DashboardView) or concurrently
+(AsyncDashboardView) and hand the results to assemble_payload().
+
+fetch_payload_sql() gets the same payload from the dashboard_payload() SQL
+function in supabase/schema.sql in a single round trip, plus the card
+statement query. Orderings here are total so both produce identical lists.
+"""
+import json
+from datetime import date
+from types import SimpleNamespace
+
+from django.db import connection
+
+from apps.accounts.models import Account
+from apps.accounts.statements import card_statement, card_statements
+from apps.budgets.models import BudgetPlan
+from apps.transactions import rollups
+from apps.transactions.models import Transaction
+from utils.metadata import category_names
+from utils.periods import Period
+
+RECENT_TRANSACTIONS_LIMIT = 10
+BUDGET_OVERVIEW_LIMIT = 5
+
+
+def fetch_accounts(user_id, today: date) -> list:
+    return list(
+        Account.objects.filter(user_id=user_id, is_active=True).order_by(
+            "created_at", "id"
+        )
+    )
+
+
+def fetch_recent_transactions(user_id, today: date) -> list:
+    return list(
+        Transaction.objects.filter(user_id=user_id).order_by(
+            "-transaction_date", "-created_at", "-id"
+        )[:RECENT_TRANSACTIONS_LIMIT]
+    )
+
+
+def fetch_monthly_totals(user_id, today: date) -> dict:
+    return rollups.totals_by_type(user_id, Period.month(today.year, today.month))
+
+
+def fetch_budgets(user_id, today: date) -> list:
+    return list(
+        BudgetPlan.objects.filter(user_id=user_id, month=today.month, year=today.year)
+        .order_by("-planned_amount", "id")[:BUDGET_OVERVIEW_LIMIT]
+    )
+
+
+def fetch_expense_actuals(user_id, today: date) -> dict:
+    return rollups.totals_by_category(
+        user_id, Period.month(today.year, today.month), Transaction.TYPE_EXPENSE
+    )
+
+
+def fetch_card_statements(user_id, today: date) -> dict:
+    return card_statements(user_id, today)
+
+
+def fetch_category_names(user_id, today: date) -> dict:
+    # All of the user's categories, usually from the process-local cache
+    return category_names(user_id)
+
+
+QUERIES = {
+    "accounts": fetch_accounts,
+    "recent_transactions": fetch_recent_transactions,
+    "monthly_totals": fetch_monthly_totals,
+    "budgets": fetch_budgets,
+    "expense_actuals": fetch_expense_actuals,
+    "category_names": fetch_category_names,
+    "card_statements": fetch_card_statements,
+}
+
+
+def assemble_payload(
+    today: date,
+    accounts,
+    recent_transactions,
+    monthly_totals,
+    budgets,
+    expense_actuals,
+    category_names,
+    card_statements,
+) -> dict:
+    # --- Accounts ---
+    non_cc_accounts = [a for a in accounts if a.type != Account.TYPE_CREDIT_CARD]
+    cc_accounts = [a for a in accounts if a.type == Account.TYPE_CREDIT_CARD]
+
+    consolidated_balance = float(sum(acc.current_balance for acc in non_cc_accounts))
+
+    credit_cards = [
+        {
+            "id": str(acc.id),
+            "name": acc.name,
+            "provider": acc.provider,
+            "current_balance": float(acc.current_balance),
+            "credit_limit": float(acc.credit_limit) if acc.credit_limit else None,
+            "billing_date": acc.billing_date,
+            "due_date": acc.due_date,
+            **card_statement(acc, card_statements.get(str(acc.id)), today),
+        }
+        for acc in cc_accounts
+    ]
+
+    # --- Recent transactions ---
+    recent_list = [
+        {
+            "id": str(tx.id),
+            "type": tx.type,
+            "amount": float(tx.amount),
+            "description": tx.description,
+            "transaction_date": tx.transaction_date.isoformat(),
+            "account_id": str(tx.account_id),
+            "category_id": str(tx.category_id) if tx.category_id else None,
+        }
+        for tx in recent_transactions
+    ]
+
+    # --- Monthly totals ---
+    monthly_map = {tx_type: float(total) for tx_type, total in monthly_totals.items()}
+
+    # --- Top budget categories progress ---
+    actual_map = {
+        category_id: float(total) for category_id, total in expense_actuals.items()
+    }
+    budget_overview = [
+        {
+            "category_id": str(b.category_id),
+            "category_name": category_names.get(str(b.category_id), "Unknown"),
+            "planned": float(b.planned_amount),
+            "actual": actual_map.get(str(b.category_id), 0),
+        }
+        for b in budgets
+    ]
+
+    return {
+        "consolidated_balance": consolidated_balance,
+        "credit_cards": credit_cards,
+        "recent_transactions": recent_list,
+        "monthly_income": monthly_map.get(Transaction.TYPE_INCOME, 0),
+        "monthly_expenses": monthly_map.get(Transaction.TYPE_EXPENSE, 0),
+        "budget_overview": budget_overview,
+        "current_month": {"month": today.month, "year": today.year},
+    }
+
+
+def build_payload(user_id, today: date) -> dict:
+    """Run the dashboard queries one after another."""
+    results = {name: query(user_id, today) for name, query in QUERIES.items()}
+    return assemble_payload(today, **results)
+
+
+def fetch_payload_sql(user_id, today: date) -> dict:
+    """Build the payload with the dashboard_payload() function (PostgreSQL only)."""
+    with connection.cursor() as cursor:
+        # ::text so the numbers are decoded here, like the Python builder's floats
+        cursor.execute("SELECT dashboard_payload(%s, %s)::text", [str(user_id), today])
+        payload = json.loads(cursor.fetchone()[0])
+    statements = card_statements(user_id, today)
+    for card in payload["credit_cards"]:
+        card.update(
+            card_statement(SimpleNamespace(**card), statements.get(card["id"]), today)
+        )
+    return payload
@@ -1,15 +1,42 @@
 """Dashboard aggregated view."""
-from decimal import Decimal
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
-from django.db.models import Sum
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.http import parse_etags, quote_etag
+from django.views import View
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed, NotAuthenticated
+from rest_framework.renderers import JSONRenderer
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
-from apps.accounts.models import Account
-from apps.transactions.models import Transaction
-from apps.budgets.models import BudgetPlan
-from apps.categories.models import Category
+from utils.cache import get_version
+from utils.supabase_auth import SupabaseJWTAuthentication
+from utils.workers import run_task
+from . import payload as dashboard_payload
+
+DASHBOARD_CACHE_NAMESPACE = "dashboard"
+DASHBOARD_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Threads for the async fan-out. Each keeps its own DB connection, which is
+# reused across requests when CONN_MAX_AGE (DB_CONN_MAX_AGE) is non-zero.
+ASYNC_QUERY_WORKERS = 12
+_query_executor = ThreadPoolExecutor(
+    max_workers=ASYNC_QUERY_WORKERS, thread_name_prefix="dashboard-query"
+)
+
+
+def _etag(version: int, today: date) -> str:
+    return "W/" + quote_etag(f"{version}-{today.isoformat()}")
+
+
+def _cache_key(user_id, version: int, today: date) -> str:
+    return f"dashboard:{user_id}:{version}:{today.isoformat()}"
 
 
 class DashboardView(APIView):
@@ -17,107 +44,100 @@ class DashboardView(APIView):
     GET /dashboard/
     Returns all data needed for the dashboard in a single request:
     - Consolidated balance (non-credit-card accounts)
-    - Credit card summary
+    - Credit card summary, with each card's last statement and current cycle
     - Recent transactions (last 10)
     - Current month income vs expense totals
     - Budget overview (top 5 categories)
+
+    The payload is cached per user under a version that account, transaction,
+    budget and category writes bump. The ETag carries that version, so a
+    matching If-None-Match gets a 304 without touching the database.
+
+    With DASHBOARD_PAYLOAD_SQL the payload comes from the dashboard_payload()
+    database function in one round trip instead of one query per section
+    (card statements still come from their own query).
     """
 
     def get(self, request):
         user_id = request.user.id
         today = date.today()
 
-        # --- Accounts ---
-        all_accounts = Account.objects.filter(user_id=user_id, is_active=True)
-        non_cc_accounts = all_accounts.exclude(type=Account.TYPE_CREDIT_CARD)
-        cc_accounts = all_accounts.filter(type=Account.TYPE_CREDIT_CARD)
+        version = get_version(DASHBOARD_CACHE_NAMESPACE, user_id)
+        etag = _etag(version, today)
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
 
-        consolidated_balance = float(
-            sum(acc.current_balance for acc in non_cc_accounts)
-        )
+        cache_key = _cache_key(user_id, version, today)
+        payload = cache.get(cache_key)
+        if payload is None:
+            payload = self.build_payload(user_id, today)
+            cache.set(cache_key, payload, DASHBOARD_CACHE_TIMEOUT)
+        return Response(payload, headers={"ETag": etag})
 
-        credit_cards = [
-            {
-                "id": str(acc.id),
-                "name": acc.name,
-                "provider": acc.provider,
-                "current_balance": float(acc.current_balance),
-                "credit_limit": float(acc.credit_limit) if acc.credit_limit else None,
-                "billing_date": acc.billing_date,
-                "due_date": acc.due_date,
-            }
-            for acc in cc_accounts
-        ]
-
-        # --- Recent transactions ---
-        recent_txs = Transaction.objects.filter(user_id=user_id).order_by(
-            "-transaction_date", "-created_at"
-        )[:10]
-
-        recent_list = [
-            {
-                "id": str(tx.id),
-                "type": tx.type,
-                "amount": float(tx.amount),
-                "description": tx.description,
-                "transaction_date": tx.transaction_date.isoformat(),
-                "account_id": str(tx.account_id),
-                "category_id": str(tx.category_id) if tx.category_id else None,
-            }
-            for tx in recent_txs
-        ]
-
-        # --- Monthly totals ---
-        monthly = (
-            Transaction.objects.filter(
-                user_id=user_id,
-                transaction_date__month=today.month,
-                transaction_date__year=today.year,
-            )
-            .values("type")
-            .annotate(total=Sum("amount"))
-        )
-        monthly_map = {row["type"]: float(row["total"]) for row in monthly}
-
-        # --- Top budget categories progress ---
-        budgets = BudgetPlan.objects.filter(
-            user_id=user_id, month=today.month, year=today.year
-        )[:5]
-        actuals = (
-            Transaction.objects.filter(
-                user_id=user_id,
-                type=Transaction.TYPE_EXPENSE,
-                transaction_date__month=today.month,
-                transaction_date__year=today.year,
-            )
-            .values("category_id")
-            .annotate(total=Sum("amount"))
+    def build_payload(self, user_id, today: date) -> dict:
+        if settings.DASHBOARD_PAYLOAD_SQL:
+            return dashboard_payload.fetch_payload_sql(user_id, today)
+        return dashboard_payload.build_payload(user_id, today)
+
+
+async def build_payload_async(user_id, today: date) -> dict:
+    """Run the independent dashboard queries concurrently."""
+    run = sync_to_async(run_task, thread_sensitive=False, executor=_query_executor)
+    results = await asyncio.gather(
+        *(run(query, user_id, today) for query in dashboard_payload.QUERIES.values())
+    )
+    return dashboard_payload.assemble_payload(
+        today, **dict(zip(dashboard_payload.QUERIES, results))
+    )
+
+
+class AsyncDashboardView(View):
+    """
+    GET /dashboard/ when DASHBOARD_ASYNC is enabled (serve under ASGI).
+
+    Same payload, cache and ETag as DashboardView, but the queries run
+    concurrently on separate connections, so latency tracks the slowest query
+    instead of the sum of all round trips.
+    """
+
+    http_method_names = ["get", "options"]
+
+    async def get(self, request):
+        try:
+            auth = await sync_to_async(SupabaseJWTAuthentication().authenticate)(request)
+        except AuthenticationFailed as exc:
+            return self._unauthorized(exc.detail)
+        if auth is None:
+            return self._unauthorized(NotAuthenticated.default_detail)
+
+        user_id = auth[0].id
+        today = date.today()
+
+        version = await sync_to_async(get_version)(DASHBOARD_CACHE_NAMESPACE, user_id)
+        etag = _etag(version, today)
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            return HttpResponse(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        cache_key = _cache_key(user_id, version, today)
+        payload = await cache.aget(cache_key)
+        if payload is None:
+            if settings.DASHBOARD_PAYLOAD_SQL:
+                payload = await sync_to_async(dashboard_payload.fetch_payload_sql)(
+                    user_id, today
+                )
+            else:
+                payload = await build_payload_async(user_id, today)
+            await cache.aset(cache_key, payload, DASHBOARD_CACHE_TIMEOUT)
+        return HttpResponse(
+            JSONRenderer().render(payload),
+            content_type="application/json",
+            headers={"ETag": etag},
         )
-        actual_map = {str(row["category_id"]): float(row["total"]) for row in actuals}
-        category_ids = list(budgets.values_list("category_id", flat=True))
-        categories = {
-            str(c.id): c.name
-            for c in Category.objects.filter(id__in=category_ids)
-        }
-
-        budget_overview = [
-            {
-                "category_id": str(b.category_id),
-                "category_name": categories.get(str(b.category_id), "Unknown"),
-                "planned": float(b.planned_amount),
-                "actual": actual_map.get(str(b.category_id), 0),
-            }
-            for b in budgets
-        ]
-
-        return Response(
-            {
-                "consolidated_balance": consolidated_balance,
-                "credit_cards": credit_cards,
-                "recent_transactions": recent_list,
-                "monthly_income": monthly_map.get(Transaction.TYPE_INCOME, 0),
-                "monthly_expenses": monthly_map.get(Transaction.TYPE_EXPENSE, 0),
-                "budget_overview": budget_overview,
-                "current_month": {"month": today.month, "year": today.year},
-            }
+
+    def _unauthorized(self, detail):
+        return HttpResponse(
+            JSONRenderer().render({"detail": detail}),
+            content_type="application/json",
+            status=status.HTTP_401_UNAUTHORIZED,
+            headers={"WWW-Authenticate": "Bearer"},
         )
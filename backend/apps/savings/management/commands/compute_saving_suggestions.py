@@ -0,0 +1,34 @@
+"""Precompute every user's saving suggestions for a month."""
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from apps.savings.suggestions import compute_suggestions
+
+
+class Command(BaseCommand):
+    help = "Evaluate the saving rules for all users and store the suggestions."
+
+    def add_arguments(self, parser):
+        today = date.today()
+        parser.add_argument("--year", type=int, default=today.year)
+        parser.add_argument(
+            "--month", type=int, default=today.month, choices=range(1, 13)
+        )
+        parser.add_argument("--user", help="Only compute suggestions for this user id.")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        count = compute_suggestions(
+            options["year"],
+            options["month"],
+            user_ids=[options["user"]] if options["user"] else None,
+        )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Stored suggestions for {count} users for "
+                f"{options['year']}-{options['month']:02d} in {elapsed:.1f}s."
+            )
+        )
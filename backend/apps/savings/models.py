@@ -33,3 +33,25 @@ class SavingPlan(models.Model):
 
     def __str__(self):
         return f"{self.name} ({self.status})"
+
+
+class SavingSuggestion(models.Model):
+    """
+    A user's saving suggestions for one month, as GET /savings/suggestions/
+    returns them. Written in bulk by compute_saving_suggestions.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    user_id = models.UUIDField()
+    year = models.IntegerField()
+    month = models.IntegerField()  # 1-12
+    payload = models.JSONField()
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        db_table = "saving_suggestions"
+        managed = False
+        unique_together = [("user_id", "year", "month")]
+
+    def __str__(self):
+        return f"Suggestions {self.year}-{self.month:02d} for {self.user_id}"
@@ -0,0 +1,190 @@
+"""Monte Carlo projections of saving plans.
+
+A user's monthly surplus (income minus expenses) over their recent complete
+months is read from the monthly rollups with one grouped query. Each
+simulated path draws one historical surplus per future month (a bootstrap
+of the user's own months); the plan gets its monthly_contribution, capped
+by that month's surplus, or the whole positive surplus when no contribution
+is set. Paths advance together in chunks of paths x months arrays: each
+chunk's draws are shared by every plan of a batch, and each plan costs a
+handful of vector operations instead of a Python loop per path and month.
+Only the months each path needs per plan are kept, so memory follows the
+chunk size rather than paths x horizon, and paths x horizon itself is
+capped by MAX_SIMULATED_MONTHS (long horizons get fewer paths).
+
+Plans are projected independently, as if each had the user's whole surplus
+to draw from. Paths are seeded from the user id, so repeated requests
+return the same projection until the history changes.
+"""
+import uuid
+from datetime import date, timedelta
+
+import numpy as np
+
+from apps.transactions import rollups
+from apps.transactions.models import Transaction
+from apps.transactions.trends import build_matrix
+from utils.periods import Period
+
+DEFAULT_PATHS = 5000
+MAX_PATHS = 20000
+DEFAULT_HISTORY_MONTHS = 24
+MAX_HISTORY_MONTHS = 120
+# Paths run at least this long; plans with a later target_date run to it
+HORIZON_MONTHS = 120
+MAX_HORIZON_MONTHS = 600
+# Paths are cut so that paths x horizon stays within this many months
+MAX_SIMULATED_MONTHS = MAX_PATHS * HORIZON_MONTHS
+# Path months drawn and processed at a time
+CHUNK_MONTHS = 250_000
+PERCENTILES = (10, 50, 90)
+
+
+def monthly_surpluses(user_id, months: int, today: date | None = None):
+    """
+    Income minus expenses for each of the last `months` complete months,
+    oldest first, starting at the user's first month with any activity.
+    """
+    today = today or date.today()
+    period = Period.last_months(months, today.replace(day=1) - timedelta(days=1))
+    keys, matrix = build_matrix(
+        rollups.monthly_totals(user_id, period, "type"), period.months()
+    )
+    rows = dict(zip(keys, matrix))
+    empty = np.zeros(months)
+    surpluses = rows.get(Transaction.TYPE_INCOME, empty) - rows.get(
+        Transaction.TYPE_EXPENSE, empty
+    )
+    active = matrix.any(axis=0).nonzero()[0]
+    return surpluses[active[0]:] if len(active) else surpluses[:0]
+
+
+def months_until(target: date, today: date) -> int:
+    """Whole months from this month to `target`'s (contributions due by then)."""
+    return max((target.year - today.year) * 12 + target.month - today.month, 0)
+
+
+def _month_label(today: date, offset: int) -> str:
+    year, month = divmod(today.year * 12 + today.month - 1 + offset, 12)
+    return f"{year:04d}-{month + 1:02d}"
+
+
+def completion_months(draws, current: float, target: float, contribution):
+    """
+    Months until each path reaches `target`, inf for paths that do not
+    within the simulated months.
+    """
+    capacity = np.maximum(draws, 0.0)
+    if contribution is not None:
+        capacity = np.minimum(capacity, contribution)
+    reached = current + np.cumsum(capacity, axis=1) >= target
+    return np.where(reached.any(axis=1), reached.argmax(axis=1) + 1.0, np.inf)
+
+
+def plan_months(plan, draws):
+    """completion_months of `plan` over `draws`, 0 for plans already reached."""
+    target = float(plan.target_amount)
+    current = float(plan.current_amount or 0)
+    if current >= target:
+        return np.zeros(draws.shape[0])
+    contribution = (
+        float(plan.monthly_contribution)
+        if plan.monthly_contribution is not None
+        else None
+    )
+    return completion_months(draws, current, target, contribution)
+
+
+def simulate(plans, surpluses, paths: int, horizon: int, rng) -> list:
+    """
+    Completion months of each plan over `paths` bootstrapped paths, drawn
+    CHUNK_MONTHS at a time; the draws are the same as one paths x horizon
+    draw from `rng`.
+    """
+    chunk = max(CHUNK_MONTHS // horizon, 1)
+    months = [[] for _ in plans]
+    for start in range(0, paths, chunk):
+        size = min(chunk, paths - start)
+        draws = surpluses[rng.integers(len(surpluses), size=(size, horizon))]
+        for plan, parts in zip(plans, months):
+            parts.append(plan_months(plan, draws))
+    return [np.concatenate(parts) for parts in months]
+
+
+def project(plan, months, horizon: int, today: date) -> dict:
+    """
+    The projection payload for one plan from its completion months per
+    path, None without history to simulate from.
+    """
+    deadline = (
+        min(months_until(plan.target_date, today), horizon)
+        if plan.target_date
+        else horizon
+    )
+    payload = {
+        "plan_id": str(plan.id),
+        "target_amount": float(plan.target_amount),
+        "current_amount": float(plan.current_amount or 0),
+        "target_date": plan.target_date.isoformat() if plan.target_date else None,
+        "monthly_contribution": (
+            float(plan.monthly_contribution)
+            if plan.monthly_contribution is not None
+            else None
+        ),
+        "probability": None,
+        "completion_dates": {f"p{pct}": None for pct in PERCENTILES},
+    }
+    if months is None:
+        return payload
+    payload["probability"] = round(float(np.mean(months <= deadline)), 4)
+    # inverted_cdf picks an actual path, so paths that never finish stay inf
+    quantiles = np.percentile(months, PERCENTILES, method="inverted_cdf")
+    payload["completion_dates"] = {
+        f"p{pct}": _month_label(today, int(q)) if np.isfinite(q) else None
+        for pct, q in zip(PERCENTILES, quantiles)
+    }
+    return payload
+
+
+def project_plans(
+    user_id,
+    plans,
+    paths: int = DEFAULT_PATHS,
+    history_months: int = DEFAULT_HISTORY_MONTHS,
+    today: date | None = None,
+    seed=None,
+) -> dict:
+    """
+    Projections for `plans` (all the user's) from one history query and one
+    set of simulated paths. `paths` is lowered as needed to keep
+    paths x horizon within MAX_SIMULATED_MONTHS; the payload reports the
+    paths actually run.
+    """
+    today = today or date.today()
+    plans = list(plans)
+    surpluses = monthly_surpluses(user_id, history_months, today)
+    horizon = HORIZON_MONTHS
+    for plan in plans:
+        if plan.target_date:
+            horizon = max(horizon, months_until(plan.target_date, today))
+    horizon = min(horizon, MAX_HORIZON_MONTHS)
+    paths = min(paths, MAX_SIMULATED_MONTHS // horizon)
+
+    mean_surplus = None
+    months = [None] * len(plans)
+    if len(surpluses):
+        mean_surplus = round(float(surpluses.mean()), 2)
+        rng = np.random.default_rng(
+            uuid.UUID(str(user_id)).int if seed is None else seed
+        )
+        months = simulate(plans, surpluses, paths, horizon, rng)
+    return {
+        "paths": paths,
+        "history_months": len(surpluses),
+        "horizon_months": horizon,
+        "mean_monthly_surplus": mean_surplus,
+        "projections": [
+            project(plan, completion, horizon, today)
+            for plan, completion in zip(plans, months)
+        ],
+    }
@@ -1,57 +1,117 @@
-"""Rule-based saving suggestion engine. Future: replace/augment with AI."""
+"""Rule-based saving suggestion engine. Future: replace/augment with AI.
+
+Rules live in a registry. Each rule is a function of NumPy arrays: it gets
+incomes and surpluses, one entry per user, and returns the suggested
+monthly amounts and whether each user can afford them. A single user is a
+batch of one, so one request and a nightly run over every user go through
+the same code.
+"""
+from dataclasses import dataclass
 from decimal import Decimal
+from typing import Callable
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class SavingRule:
+    key: str
+    name: str
+    description: str
+    # (incomes, surpluses) -> (amounts, feasible), all arrays of one shape
+    evaluate: Callable
+
+
+RULES: dict[str, SavingRule] = {}
+
+
+def register_rule(key: str, name: str, description: str):
+    """Decorator adding a rule to the registry; rules run in registration order."""
+
+    def decorator(evaluate):
+        RULES[key] = SavingRule(key, name, description, evaluate)
+        return evaluate
+
+    return decorator
+
+
+@register_rule(
+    "50_30_20",
+    "50/30/20 Rule",
+    "Allocate 50% to needs, 30% to wants, 20% to savings.",
+)
+def _rule_50_30_20(income, surplus):
+    amount = income * 0.20
+    return amount, surplus >= amount
+
+
+@register_rule(
+    "10_percent",
+    "10% Rule",
+    "Save at least 10% of your monthly income.",
+)
+def _rule_10_percent(income, surplus):
+    amount = income * 0.10
+    return amount, surplus >= amount
+
+
+@register_rule(
+    "surplus",
+    "Surplus Savings",
+    "Save everything left after planned expenses.",
+)
+def _rule_surplus(income, surplus):
+    return np.maximum(surplus, 0.0), surplus > 0
 
 
 class SavingRuleEngine:
     """
     Generates saving suggestions based on income and expenses.
-    Each rule is self-contained and returns a suggestion dict.
+    suggest() handles one user; evaluate() and payloads() a whole batch.
     """
 
     @classmethod
     def suggest(cls, monthly_income: Decimal, monthly_expenses: Decimal) -> dict:
-        surplus = monthly_income - monthly_expenses
-        suggestions = [
-            cls._rule_50_30_20(monthly_income, surplus),
-            cls._rule_10_percent(monthly_income, surplus),
-            cls._rule_surplus(surplus),
-        ]
-        return {
-            "monthly_income": float(monthly_income),
-            "monthly_expenses": float(monthly_expenses),
-            "surplus": float(surplus),
-            "suggestions": suggestions,
-        }
+        return cls.payloads(
+            np.array([float(monthly_income)]), np.array([float(monthly_expenses)])
+        )[0]
 
     @classmethod
-    def _rule_50_30_20(cls, income: Decimal, surplus: Decimal) -> dict:
-        amount = income * Decimal("0.20")
+    def evaluate(cls, incomes, expenses) -> dict:
+        """{rule key: (amounts, feasible)} for arrays of incomes and expenses."""
+        surpluses = incomes - expenses
         return {
-            "rule": "50_30_20",
-            "name": "50/30/20 Rule",
-            "description": "Allocate 50% to needs, 30% to wants, 20% to savings.",
-            "suggested_monthly_amount": float(amount),
-            "feasible": surplus >= amount,
+            key: rule.evaluate(incomes, surpluses) for key, rule in RULES.items()
         }
 
     @classmethod
-    def _rule_10_percent(cls, income: Decimal, surplus: Decimal) -> dict:
-        amount = income * Decimal("0.10")
-        return {
-            "rule": "10_percent",
-            "name": "10% Rule",
-            "description": "Save at least 10% of your monthly income.",
-            "suggested_monthly_amount": float(amount),
-            "feasible": surplus >= amount,
-        }
-
-    @classmethod
-    def _rule_surplus(cls, surplus: Decimal) -> dict:
-        amount = max(surplus, Decimal("0"))
-        return {
-            "rule": "surplus",
-            "name": "Surplus Savings",
-            "description": "Save everything left after planned expenses.",
-            "suggested_monthly_amount": float(amount),
-            "feasible": surplus > 0,
-        }
+    def payloads(cls, incomes, expenses) -> list:
+        """The suggest() payload for each position of `incomes` and `expenses`."""
+        incomes = np.round(np.asarray(incomes, dtype=float), 2)
+        expenses = np.round(np.asarray(expenses, dtype=float), 2)
+        surpluses = np.round(incomes - expenses, 2)
+        results = cls.evaluate(incomes, expenses)
+        columns = [
+            (RULES[key], np.round(amounts, 2).tolist(), feasible.tolist())
+            for key, (amounts, feasible) in results.items()
+        ]
+        return [
+            {
+                "monthly_income": income,
+                "monthly_expenses": expense,
+                "surplus": surplus,
+                "suggestions": [
+                    {
+                        "rule": rule.key,
+                        "name": rule.name,
+                        "description": rule.description,
+                        "suggested_monthly_amount": amounts[i],
+                        "feasible": feasible[i],
+                    }
+                    for rule, amounts, feasible in columns
+                ],
+            }
+            for i, (income, expense, surplus) in enumerate(
+                zip(incomes.tolist(), expenses.tolist(), surpluses.tolist())
+            )
+        ]
@@ -0,0 +1,132 @@
+"""Saving suggestions computed in bulk and stored per user and month.
+
+compute_suggestions() loads every user's income (profiles) and the month's
+expenses (monthly rollups) with one grouped query each, evaluates all
+registered rules over those vectors at once and upserts one
+SavingSuggestion row per user. GET /savings/suggestions/ then reads a single
+row; a month that has not been computed yet is computed for that user on
+the spot and stored the same way.
+
+A stored row is stale once the user's income or transactions change after
+its computed_at: a backdated transaction can move any past month, and the
+nightly run only refreshes the current one. Writes reach the database
+through the Data API as well as this app, so the read compares computed_at
+with the profile's updated_at, the newest transaction updated_at and the
+newest transaction tombstone (index probes in the same query) and
+recomputes the month if any is later.
+"""
+import numpy as np
+from django.db.models import OuterRef, Subquery, Sum
+from django.utils import timezone
+
+from apps.sync.models import Tombstone
+from apps.transactions.models import MonthlyRollup, Transaction
+from apps.users.models import Profile
+from .models import SavingSuggestion
+from .rules import SavingRuleEngine
+
+WRITE_BATCH_SIZE = 1000
+
+
+def load_vectors(year: int, month: int, user_ids=None) -> tuple:
+    """(user_ids, incomes, expenses) aligned by position, zeros where missing."""
+    profiles = Profile.objects.all()
+    expenses = MonthlyRollup.objects.filter(
+        year=year, month=month, type=Transaction.TYPE_EXPENSE
+    )
+    if user_ids is not None:
+        profiles = profiles.filter(id__in=user_ids)
+        expenses = expenses.filter(user_id__in=user_ids)
+
+    ids, incomes = [], []
+    for user_id, income in profiles.values_list("id", "monthly_income").iterator(
+        chunk_size=10_000
+    ):
+        ids.append(user_id)
+        incomes.append(income or 0)
+    index = {user_id: i for i, user_id in enumerate(ids)}
+
+    expense_vector = np.zeros(len(ids))
+    totals = expenses.values_list("user_id").annotate(total=Sum("total_amount"))
+    for user_id, total in totals.order_by():
+        if user_id in index:
+            expense_vector[index[user_id]] = total or 0
+    return ids, np.array(incomes, dtype=float), expense_vector
+
+
+def store_suggestions(year: int, month: int, user_ids, payloads, computed_at) -> None:
+    """Upsert the payloads; `computed_at` must precede loading their inputs."""
+    SavingSuggestion.objects.bulk_create(
+        [
+            SavingSuggestion(
+                user_id=user_id,
+                year=year,
+                month=month,
+                payload=payload,
+                computed_at=computed_at,
+            )
+            for user_id, payload in zip(user_ids, payloads)
+        ],
+        batch_size=WRITE_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=["user_id", "year", "month"],
+        update_fields=["payload", "computed_at"],
+    )
+
+
+def compute_suggestions(year: int, month: int, user_ids=None) -> int:
+    """Compute and store suggestions for every user (or `user_ids`)."""
+    computed_at = timezone.now()
+    ids, incomes, expenses = load_vectors(year, month, user_ids)
+    store_suggestions(
+        year, month, ids, SavingRuleEngine.payloads(incomes, expenses), computed_at
+    )
+    return len(ids)
+
+
+def _latest(queryset, field: str):
+    """Subquery for the newest `field` of the outer row's user."""
+    return Subquery(
+        queryset.filter(user_id=OuterRef("user_id"))
+        .order_by(f"-{field}")
+        .values(field)[:1]
+    )
+
+
+def get_suggestions(user_id, year: int, month: int):
+    """
+    The stored payload, (re)computing it first if it is missing or stale;
+    None without a profile.
+    """
+    stored = (
+        SavingSuggestion.objects.filter(user_id=user_id, year=year, month=month)
+        .annotate(
+            profile_changed=Subquery(
+                Profile.objects.filter(id=OuterRef("user_id")).values("updated_at")
+            ),
+            transaction_changed=_latest(Transaction.objects.all(), "updated_at"),
+            transaction_deleted=_latest(
+                Tombstone.objects.filter(entity="transactions"), "deleted_at"
+            ),
+        )
+        .values_list(
+            "payload",
+            "computed_at",
+            "profile_changed",
+            "transaction_changed",
+            "transaction_deleted",
+        )
+        .first()
+    )
+    if stored is not None:
+        payload, computed_at, *changes = stored
+        if all(changed is None or changed <= computed_at for changed in changes):
+            return payload
+
+    computed_at = timezone.now()
+    ids, incomes, expenses = load_vectors(year, month, [user_id])
+    if not ids:
+        return None
+    (payload,) = SavingRuleEngine.payloads(incomes, expenses)
+    store_suggestions(year, month, ids, [payload], computed_at)
+    return payload
@@ -1,18 +1,26 @@
 """Saving plan views."""
-from decimal import Decimal
-from django.db.models import Sum
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.views import APIView
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
-from apps.users.models import Profile
-from apps.transactions.models import Transaction
+from utils.bulk import BulkWriteMixin
+from utils.idempotency import IdempotencyMixin
+from utils.periods import PERIOD_MONTH, Period, int_param
+from .projection import (
+    DEFAULT_HISTORY_MONTHS,
+    DEFAULT_PATHS,
+    MAX_HISTORY_MONTHS,
+    MAX_PATHS,
+    project_plans,
+)
 from .models import SavingPlan
 from .serializers import SavingPlanSerializer
-from .rules import SavingRuleEngine
+from .suggestions import get_suggestions
 
 
-class SavingPlanViewSet(viewsets.ModelViewSet):
+class SavingPlanViewSet(IdempotencyMixin, BulkWriteMixin, viewsets.ModelViewSet):
     serializer_class = SavingPlanSerializer
 
     def get_queryset(self):
@@ -23,33 +31,63 @@ class SavingPlanViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(user_id=self.request.user.id)
 
+    @action(detail=True, methods=["get"])
+    def projection(self, request, pk=None):
+        """
+        GET /savings/plans/{id}/projection/
+        Monte Carlo projection of the plan from the user's monthly surpluses:
+        the probability of reaching target_amount by target_date (within
+        the simulated horizon when there is no target_date) and the months
+        by which 10%, 50% and 90% of the paths have reached it (null when
+        beyond the horizon). Probability and dates are null without any
+        history to simulate from.
+        Query params: paths (default 5000, fewer when target dates push
+        the horizon past 10 years; the response reports the paths run),
+        history (months of history, default 24)
+        """
+        payload = self._project([self.get_object()])
+        payload.update(payload.pop("projections")[0])
+        return Response(payload)
+
+    @action(detail=False, methods=["get"])
+    def projections(self, request):
+        """
+        GET /savings/plans/projections/
+        The projection of every plan of the user, from one set of paths.
+        Query params as for projection.
+        """
+        return Response(self._project(self.get_queryset()))
+
+    def _project(self, plans) -> dict:
+        params = self.request.query_params
+        return project_plans(
+            self.request.user.id,
+            plans,
+            paths=int_param(params, "paths", DEFAULT_PATHS, 100, MAX_PATHS),
+            history_months=int_param(
+                params, "history", DEFAULT_HISTORY_MONTHS, 3, MAX_HISTORY_MONTHS
+            ),
+        )
+
 
 class SavingSuggestionsView(APIView):
     """
     GET /savings/suggestions/
     Returns rule-based saving suggestions based on income and expenses.
+    Query params: year, month (default: current month)
+
+    Suggestions are precomputed for every user by the nightly
+    compute_saving_suggestions command and read here with one lookup; a month
+    without stored suggestions is computed for this user and stored.
     """
 
     def get(self, request):
-        try:
-            profile = Profile.objects.get(id=request.user.id)
-        except Profile.DoesNotExist:
-            return Response({"detail": "Profile not found."}, status=404)
+        period = Period.from_params(request.query_params, default=PERIOD_MONTH)
+        if period.single_month() is None:
+            raise ValidationError({"period": "Suggestions are monthly; pick a single month."})
+        year, month = period.single_month()
 
-        monthly_income = profile.monthly_income or Decimal("0")
-
-        # Sum of current month's expenses from budget plans or actual transactions
-        from datetime import date
-
-        today = date.today()
-        monthly_expenses_agg = Transaction.objects.filter(
-            user_id=request.user.id,
-            type=Transaction.TYPE_EXPENSE,
-            transaction_date__month=today.month,
-            transaction_date__year=today.year,
-        ).aggregate(total=Sum("amount"))
-        monthly_expenses = monthly_expenses_agg["total"] or Decimal("0")
-
-        return Response(
-            SavingRuleEngine.suggest(monthly_income, monthly_expenses)
-        )
+        payload = get_suggestions(request.user.id, year, month)
+        if payload is None:
+            return Response({"detail": "Profile not found."}, status=404)
+        return Response(payload)
@@ -0,0 +1,29 @@
+"""Delete sync tombstones past the retention window."""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.sync.models import Tombstone
+
+
+class Command(BaseCommand):
+    help = "Delete sync tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=None,
+            help="Retention in days (default: SYNC_TOMBSTONE_RETENTION_DAYS).",
+        )
+
+    def handle(self, *args, **options):
+        days = options["days"] or settings.SYNC_TOMBSTONE_RETENTION_DAYS
+        # Clients whose cursor predates the cutoff get a full resync instead
+        cutoff = timezone.now() - timedelta(days=days)
+        deleted, _ = Tombstone.objects.filter(deleted_at__lt=cutoff).delete()
+        self.stdout.write(
+            self.style.SUCCESS(f"Deleted {deleted} tombstones older than {days} days.")
+        )
@@ -0,0 +1,22 @@
+"""Tombstones for deleted rows, written by database triggers."""
+from django.db import models
+
+
+class Tombstone(models.Model):
+    """
+    One deleted row of a synced table. `entity` is the table name; the
+    record_sync_tombstones() trigger in supabase/schema.sql inserts these.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    user_id = models.UUIDField()
+    entity = models.CharField(max_length=30)
+    object_id = models.UUIDField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "sync_tombstones"
+        managed = False
+
+    def __str__(self):
+        return f"{self.entity} {self.object_id} deleted at {self.deleted_at}"
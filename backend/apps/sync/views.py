@@ -0,0 +1,164 @@
+"""Delta sync view."""
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.accounts.models import Account
+from apps.accounts.serializers import AccountSerializer
+from apps.budgets.models import BudgetPlan
+from apps.budgets.serializers import BudgetPlanSerializer
+from apps.categories.models import Category
+from apps.categories.serializers import CategorySerializer
+from apps.savings.models import SavingPlan
+from apps.savings.serializers import SavingPlanSerializer
+from apps.transactions.models import Transaction
+from apps.transactions.serializers import TransactionSerializer
+from utils.rows import row_encoder
+from .models import Tombstone
+
+# Response key -> (model, serializer); the table name is the tombstone entity
+SYNC_ENTITIES = {
+    "accounts": (Account, AccountSerializer),
+    "categories": (Category, CategorySerializer),
+    "transactions": (Transaction, TransactionSerializer),
+    "budgets": (BudgetPlan, BudgetPlanSerializer),
+    "saving_plans": (SavingPlan, SavingPlanSerializer),
+}
+DELETED = "deleted"
+
+# updated_at is the writing transaction's start time, so a row can commit
+# after rows with later timestamps were already synced. A caught-up table's
+# cursor is set to now - CURSOR_OVERLAP, so rows in that window are sent
+# again on the next call (clients upsert by id) rather than missed.
+CURSOR_OVERLAP = timedelta(seconds=30)
+
+
+def _keyset(queryset, position, timestamp_field):
+    """Rows after `position` = (timestamp, id) in (timestamp, id) order."""
+    if position:
+        ts, pk = position
+        # The leading range predicate lets the (user_id, <timestamp>, id)
+        # index seek; the OR resolves ties within one timestamp
+        queryset = queryset.filter(**{f"{timestamp_field}__gte": ts}).filter(
+            Q(**{f"{timestamp_field}__gt": ts}) | Q(id__gt=pk)
+        )
+    return queryset.order_by(timestamp_field, "id")
+
+
+def encode_cursor(positions: dict) -> str:
+    raw = {key: [ts.isoformat(), str(pk)] for key, (ts, pk) in positions.items()}
+    return base64.urlsafe_b64encode(json.dumps(raw).encode()).decode()
+
+
+def decode_cursor(encoded: str) -> dict:
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+        positions = {}
+        for key, (ts, pk) in raw.items():
+            if key not in SYNC_ENTITIES and key != DELETED:
+                raise ValueError(key)
+            ts = datetime.fromisoformat(ts)
+            if timezone.is_naive(ts):
+                raise ValueError(ts)
+            positions[key] = (ts, int(pk) if key == DELETED else uuid.UUID(pk))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, AttributeError):
+        raise ValidationError({"since": "Invalid cursor."})
+    return positions
+
+
+class SyncView(APIView):
+    """
+    GET /sync/?since=<cursor>
+    Accounts, categories, transactions, budgets and saving plans created or
+    changed since the cursor, ids deleted since then under "deleted", and
+    the cursor for the next call. Without `since`, or with a cursor older
+    than SYNC_TOMBSTONE_RETENTION_DAYS, the response has "reset": true and
+    starts over: the client should drop its local copy first. Clients upsert
+    the returned rows by id, then remove the deleted ids.
+
+    Each table returns at most `page_size` rows; while "has_more" is true,
+    call again right away with the new cursor.
+    """
+
+    page_size = 500
+
+    def get(self, request):
+        user_id = request.user.id
+        now = timezone.now()
+        since = request.query_params.get("since")
+        positions = decode_cursor(since) if since else {}
+
+        cutoff = now - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+        # Tombstones older than the cutoff may have been purged
+        reset = DELETED not in positions or positions[DELETED][0] < cutoff
+        if reset:
+            positions = {}
+
+        ceiling = now - CURSOR_OVERLAP
+        payload = {"reset": reset}
+        has_more = False
+        next_positions = {}
+        for key, (model, serializer_class) in SYNC_ENTITIES.items():
+            queryset = _keyset(
+                model.objects.filter(user_id=user_id), positions.get(key), "updated_at"
+            )
+            rows, data = self.page(queryset, serializer_class)
+            payload[key] = data
+            has_more |= len(rows) > self.page_size
+            next_positions[key] = self.next_position(
+                rows, "updated_at", (ceiling, uuid.UUID(int=0))
+            )
+
+        tombstones = list(
+            _keyset(
+                Tombstone.objects.filter(user_id=user_id),
+                positions.get(DELETED),
+                "deleted_at",
+            ).values_list("id", "entity", "object_id", "deleted_at", named=True)[
+                : self.page_size + 1
+            ]
+        )
+        tables = {m._meta.db_table: key for key, (m, _) in SYNC_ENTITIES.items()}
+        payload[DELETED] = {key: [] for key in SYNC_ENTITIES}
+        for tombstone in tombstones[: self.page_size]:
+            key = tables.get(tombstone.entity)
+            if key:
+                payload[DELETED][key].append(str(tombstone.object_id))
+        has_more |= len(tombstones) > self.page_size
+        next_positions[DELETED] = self.next_position(
+            tombstones, "deleted_at", (ceiling, 0)
+        )
+
+        payload["has_more"] = has_more
+        payload["cursor"] = encode_cursor(next_positions)
+        return Response(payload)
+
+    def page(self, queryset, serializer_class):
+        """(rows, serialized data) for up to page_size + 1 rows of `queryset`."""
+        encoder = row_encoder(serializer_class)
+        if encoder and {"id", "updated_at"} <= set(encoder.sources):
+            rows = list(
+                queryset.values_list(*encoder.sources, named=True)[: self.page_size + 1]
+            )
+            return rows, [encoder(row) for row in rows[: self.page_size]]
+        rows = list(queryset[: self.page_size + 1])
+        return rows, serializer_class(rows[: self.page_size], many=True).data
+
+    def next_position(self, rows, timestamp_field, caught_up):
+        """
+        Where the next call resumes: after the last row returned while a table
+        has more rows, else the `caught_up` position (see CURSOR_OVERLAP).
+        """
+        if len(rows) > self.page_size:
+            last = rows[self.page_size - 1]
+            return (getattr(last, timestamp_field), last.id)
+        return caught_up
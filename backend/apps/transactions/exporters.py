@@ -0,0 +1,98 @@
+"""Streaming CSV / NDJSON encoders for transaction exports."""
+import csv
+import json
+
+EXPORT_FIELDS = [
+    "id",
+    "transaction_date",
+    "type",
+    "amount",
+    "account_id",
+    "category_id",
+    "category_name",
+    "description",
+    "notes",
+    "transfer_to_account_id",
+    "created_at",
+    "updated_at",
+]
+# Selected from the database; category_name is filled in by with_category_names
+QUERY_FIELDS = [f for f in EXPORT_FIELDS if f != "category_name"]
+TEXT_FIELDS = {"description", "notes", "category_name"}
+ROWS_PER_CHUNK = 500
+
+FORMAT_CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+class _Echo:
+    """File-like object whose write() returns the value instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def _cell(field, value):
+    if value is None:
+        return ""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    value = str(value)
+    # Keep spreadsheet apps from evaluating user text as a formula
+    if field in TEXT_FIELDS and value[:1] in ("=", "+", "-", "@"):
+        return "'" + value
+    return value
+
+
+def _json_value(value):
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)  # Decimal and UUID, as in the JSON API
+
+
+def with_category_names(rows, names: dict):
+    """
+    Rows of QUERY_FIELDS as rows of EXPORT_FIELDS, category_name looked up
+    in `names` ({str(category id): name}).
+    """
+    position = EXPORT_FIELDS.index("category_name")
+    category = QUERY_FIELDS.index("category_id")
+    for row in rows:
+        name = names.get(str(row[category])) if row[category] else None
+        yield row[:position] + (name,) + row[position:]
+
+
+def iter_csv(rows):
+    """Yield CSV text in chunks of ROWS_PER_CHUNK rows, header first."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    chunk = []
+    for row in rows:
+        chunk.append(
+            writer.writerow([_cell(f, v) for f, v in zip(EXPORT_FIELDS, row)])
+        )
+        if len(chunk) >= ROWS_PER_CHUNK:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
+
+
+def iter_ndjson(rows):
+    """Yield one JSON object per line, in chunks of ROWS_PER_CHUNK rows."""
+    chunk = []
+    for row in rows:
+        record = {f: _json_value(v) for f, v in zip(EXPORT_FIELDS, row)}
+        chunk.append(json.dumps(record, ensure_ascii=False) + "\n")
+        if len(chunk) >= ROWS_PER_CHUNK:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
+
+
+ENCODERS = {"csv": iter_csv, "ndjson": iter_ndjson}
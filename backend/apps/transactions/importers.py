@@ -0,0 +1,222 @@
+"""Streaming bulk import of bank exports (CSV and OFX).
+
+Rows are parsed lazily from the file, validated in batches and written with
+one multi-row INSERT per batch. Invalid rows are reported individually and
+never abort the rest of the import. The encoding is checked over the whole
+upload before anything is written, so a bad byte late in a file cannot
+leave the first batches committed.
+"""
+import codecs
+import csv
+import io
+import re
+import uuid
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+from django.db import transaction as db_transaction
+from rest_framework.exceptions import ValidationError
+
+from apps.accounts.models import Account
+from utils.metadata import category_metadata
+from .models import Transaction
+
+FORMAT_CSV = "csv"
+FORMAT_OFX = "ofx"
+FORMATS = (FORMAT_CSV, FORMAT_OFX)
+
+ENCODING = "utf-8-sig"
+CHUNK_SIZE = 64 * 1024
+
+_OFX_TOKEN = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+
+
+def open_text(binary, chunk_size: int = CHUNK_SIZE):
+    """
+    Text stream over an uploaded file, after decoding all of it once in
+    chunks. Raises ValidationError if any byte is not valid UTF-8.
+    """
+    decoder = codecs.getincrementaldecoder(ENCODING)()
+    try:
+        while chunk := binary.read(chunk_size):
+            decoder.decode(chunk)
+        decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        raise ValidationError({"file": "File is not valid UTF-8 text."})
+    binary.seek(0)
+    return io.TextIOWrapper(binary, encoding=ENCODING, newline="")
+
+
+def iter_csv_rows(stream):
+    """
+    Yield (row_number, row) from a CSV with a header line.
+    Recognised columns: date, amount, description, notes, type, category.
+    A malformed line the csv module cannot recover from (an oversized or
+    unterminated field) ends the file with a RowError in place of the row.
+    """
+    reader = csv.DictReader(stream)
+    row_number = 1
+    try:
+        for row_number, row in enumerate(reader, start=2):
+            yield row_number, {
+                key.strip().lower(): (value or "").strip()
+                for key, value in row.items()
+                if key is not None  # surplus cells without a header
+            }
+    except csv.Error as exc:
+        yield row_number + 1, RowError({"file": f"Unreadable CSV line: {exc}."})
+
+
+def iter_ofx_rows(stream, chunk_size: int = CHUNK_SIZE):
+    """
+    Yield (index, row) for each <STMTTRN> block of an OFX 1.x (SGML) or 2.x
+    (XML) statement. Reads the stream in chunks, so single-line files are
+    handled without loading them whole.
+    """
+    buffer = ""
+    current = None
+    index = 0
+    while True:
+        chunk = stream.read(chunk_size)
+        buffer += chunk
+        # Anything after the last "<" may be a partial tag; keep it for later
+        cut = buffer.rfind("<") if chunk else len(buffer)
+        for match in _OFX_TOKEN.finditer(buffer, 0, cut):
+            closing, tag, value = match.groups()
+            tag = tag.upper()
+            if tag == "STMTTRN":
+                if closing and current is not None:
+                    index += 1
+                    yield index, _ofx_to_row(current)
+                    current = None
+                elif not closing:
+                    current = {}
+            elif current is not None and not closing:
+                current[tag] = value.strip()
+        buffer = buffer[cut:] if chunk else ""
+        if not chunk:
+            break
+
+
+def _ofx_to_row(fields: dict) -> dict:
+    posted = fields.get("DTPOSTED", "")
+    return {
+        "date": f"{posted[:4]}-{posted[4:6]}-{posted[6:8]}" if len(posted) >= 8 else "",
+        "amount": fields.get("TRNAMT", ""),
+        "description": fields.get("NAME", ""),
+        "notes": fields.get("MEMO", ""),
+    }
+
+
+def iter_rows(stream, file_format: str):
+    if file_format == FORMAT_OFX:
+        return iter_ofx_rows(stream)
+    return iter_csv_rows(stream)
+
+
+class RowError(Exception):
+    def __init__(self, errors: dict):
+        super().__init__(errors)
+        self.errors = errors
+
+
+class TransactionImporter:
+    """
+    Imports parsed rows into one account of one user.
+
+    Rows without a `type` column are typed by the sign of `amount`
+    (negative = expense). Known category names are matched per type;
+    unknown ones are left uncategorized.
+    """
+
+    BATCH_SIZE = 1000
+    MAX_REPORTED_ERRORS = 100
+    IMPORTABLE_TYPES = (Transaction.TYPE_INCOME, Transaction.TYPE_EXPENSE)
+    MAX_AMOUNT = Decimal("1e13")  # NUMERIC(15, 2)
+
+    def __init__(self, user_id, account_id, batch_size: int | None = None):
+        self.user_id = user_id
+        self.account_id = account_id
+        self.batch_size = batch_size or self.BATCH_SIZE
+
+    def run(self, rows) -> dict:
+        if not Account.objects.filter(
+            id=self.account_id, user_id=self.user_id, is_active=True
+        ).exists():
+            raise ValidationError({"account_id": "Account not found."})
+        self.categories = self._load_categories()
+
+        report = {"imported": 0, "failed": 0, "errors": []}
+        rows = iter(rows)
+        while batch := list(islice(rows, self.batch_size)):
+            valid = []
+            for row_number, raw in batch:
+                try:
+                    if isinstance(raw, RowError):
+                        raise raw
+                    valid.append(self.build_transaction(raw))
+                except RowError as exc:
+                    report["failed"] += 1
+                    if len(report["errors"]) < self.MAX_REPORTED_ERRORS:
+                        report["errors"].append({"row": row_number, "errors": exc.errors})
+            if valid:
+                with db_transaction.atomic():
+                    Transaction.objects.bulk_create(valid, batch_size=self.batch_size)
+                report["imported"] += len(valid)
+        return report
+
+    def _load_categories(self) -> dict:
+        return {
+            (meta.name.lower(), meta.type): uuid.UUID(category_id)
+            for category_id, meta in category_metadata(self.user_id).items()
+        }
+
+    def build_transaction(self, raw: dict) -> Transaction:
+        errors = {}
+
+        tx_date = None
+        try:
+            tx_date = date.fromisoformat(raw.get("date", ""))
+        except ValueError:
+            errors["date"] = "Expected a date in YYYY-MM-DD format."
+
+        amount = None
+        try:
+            amount = Decimal(raw.get("amount", "").replace(",", ""))
+        except InvalidOperation:
+            errors["amount"] = "A valid number is required."
+        else:
+            if not amount.is_finite() or amount == 0:
+                errors["amount"] = "Amount must be a non-zero number."
+            elif abs(amount) >= self.MAX_AMOUNT:
+                errors["amount"] = "Amount is too large."
+
+        tx_type = raw.get("type", "").lower()
+        if tx_type and tx_type not in self.IMPORTABLE_TYPES:
+            errors["type"] = "Only income and expense rows can be imported."
+        elif not tx_type and "amount" not in errors:
+            tx_type = Transaction.TYPE_EXPENSE if amount < 0 else Transaction.TYPE_INCOME
+
+        if errors:
+            raise RowError(errors)
+
+        category = raw.get("category", "")
+        return Transaction(
+            user_id=self.user_id,
+            account_id=self.account_id,
+            category_id=self.categories.get((category.lower(), tx_type)),
+            type=tx_type,
+            amount=abs(amount).quantize(Decimal("0.01")),
+            description=raw.get("description", "")[:255],
+            notes=raw.get("notes", ""),
+            transaction_date=tx_date,
+        )
+
+
+def detect_format(filename: str, requested: str | None = None) -> str:
+    if requested:
+        if requested not in FORMATS:
+            raise ValidationError({"format": f"Expected one of: {', '.join(FORMATS)}."})
+        return requested
+    return FORMAT_OFX if filename.lower().endswith((".ofx", ".qfx")) else FORMAT_CSV
@@ -0,0 +1,46 @@
+"""Import a CSV or OFX bank export into one account."""
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+
+from apps.transactions.importers import (
+    TransactionImporter,
+    detect_format,
+    iter_rows,
+    open_text,
+)
+from utils.cache import bump_version
+
+
+class Command(BaseCommand):
+    help = "Stream-import transactions from a CSV or OFX file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Path to the CSV or OFX file.")
+        parser.add_argument("--user", required=True, help="Owner user id.")
+        parser.add_argument("--account", required=True, help="Target account id.")
+        parser.add_argument("--format", choices=["csv", "ofx"], help="Override detection.")
+        parser.add_argument(
+            "--batch-size", type=int, default=TransactionImporter.BATCH_SIZE
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        importer = TransactionImporter(
+            options["user"], options["account"], batch_size=options["batch_size"]
+        )
+        try:
+            file_format = detect_format(path, options["format"])
+            with open(path, "rb") as binary:
+                report = importer.run(iter_rows(open_text(binary), file_format))
+        except (OSError, ValidationError) as exc:
+            raise CommandError(str(exc))
+
+        if report["imported"]:
+            bump_version("dashboard", options["user"])
+        for error in report["errors"]:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {report['imported']} transactions, {report['failed']} rows failed."
+            )
+        )
@@ -0,0 +1,26 @@
+"""Recompute transaction_monthly_rollups from the ledger and repair drift."""
+from django.core.management.base import BaseCommand
+
+from apps.transactions.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild monthly category/type rollups from raw transactions."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="Only rebuild rollups for this user id.")
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drift without writing any changes.",
+        )
+
+    def handle(self, *args, **options):
+        counts = rebuild_rollups(user_id=options["user"], dry_run=options["dry_run"])
+        verb = "Found" if options["dry_run"] else "Repaired"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} drift: {counts['created']} missing, "
+                f"{counts['updated']} changed, {counts['deleted']} stale rollup rows."
+            )
+        )
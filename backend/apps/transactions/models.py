@@ -33,3 +33,28 @@ class Transaction(models.Model):
 
     def __str__(self):
         return f"{self.type} {self.amount} on {self.transaction_date}"
+
+
+class MonthlyRollup(models.Model):
+    """
+    Per-user monthly totals by category and type.
+    Kept in sync by the transaction_rollup_trigger in supabase/schema.sql;
+    `manage.py rebuild_rollups` repairs any drift.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    user_id = models.UUIDField()
+    year = models.IntegerField()
+    month = models.IntegerField()  # 1-12
+    category_id = models.UUIDField(null=True, blank=True)
+    type = models.CharField(max_length=10, choices=Transaction.TYPE_CHOICES)
+    total_amount = models.DecimalField(max_digits=17, decimal_places=2, default=0)
+    transaction_count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = "transaction_monthly_rollups"
+        managed = False
+        unique_together = [("user_id", "year", "month", "category_id", "type")]
+
+    def __str__(self):
+        return f"{self.type} {self.year}-{self.month:02d} category={self.category_id}"
@@ -0,0 +1,88 @@
+"""Keyset (cursor) pagination for transactions."""
+import base64
+import binascii
+from datetime import date
+from uuid import UUID
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class TransactionCursorPagination(BasePagination):
+    """
+    Newest-first keyset pagination on (transaction_date, created_at, id).
+
+    Each page seeks past the last row of the previous page instead of using
+    OFFSET, and no COUNT(*) is issued, so deep pages cost the same as the
+    first one. Cursors are opaque to clients and forward-only.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    ordering = ("-transaction_date", "-created_at", "-id")
+    invalid_cursor_message = "Invalid cursor."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+
+        queryset = queryset.order_by(*self.ordering)
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded:
+            tx_date, created_at, tx_id = self.decode_cursor(encoded)
+            # The leading range predicate lets the planner seek into
+            # idx_transactions_user_date; the OR resolves ties within a day.
+            queryset = queryset.filter(transaction_date__lte=tx_date).filter(
+                Q(transaction_date__lt=tx_date)
+                | Q(transaction_date=tx_date, created_at__lt=created_at)
+                | Q(transaction_date=tx_date, created_at=created_at, id__lt=tx_id)
+            )
+
+        rows = list(queryset[: self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[: self.page_size]
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return api_settings.PAGE_SIZE
+        return max(1, min(size, self.max_page_size))
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        cursor = self.encode_cursor(last.transaction_date, last.created_at, last.id)
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    @staticmethod
+    def encode_cursor(tx_date, created_at, tx_id) -> str:
+        raw = f"{tx_date.isoformat()}|{created_at.isoformat()}|{tx_id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    def decode_cursor(self, encoded: str):
+        try:
+            raw = base64.urlsafe_b64decode(encoded.encode()).decode()
+            tx_date, created_at, tx_id = raw.split("|")
+            parsed = (
+                date.fromisoformat(tx_date),
+                parse_datetime(created_at),
+                UUID(tx_id),
+            )
+        except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+        if parsed[1] is None:
+            raise NotFound(self.invalid_cursor_message)
+        return parsed
@@ -0,0 +1,161 @@
+"""Monthly rollup readers and maintenance.
+
+Aggregating endpoints read per-month totals from `transaction_monthly_rollups`
+instead of summing raw transactions, so their cost grows with the number of
+months and categories rather than the number of transactions. Periods that
+do not fall on month boundaries are summed from the ledger over a half-open
+date range instead.
+"""
+from decimal import Decimal
+
+from django.db import transaction as db_transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+from utils.periods import Period
+from .models import MonthlyRollup, Transaction
+
+
+def _rollup_rows(user_id, period: Period):
+    """Rollup rows for a month-aligned period (None if it is not aligned)."""
+    span = period.month_span()
+    if span is None:
+        return None
+    first, last = span
+    qs = MonthlyRollup.objects.filter(user_id=user_id)
+    if first or last:
+        qs = qs.alias(period=F("year") * 100 + F("month"))
+        if first:
+            qs = qs.filter(period__gte=first[0] * 100 + first[1])
+        if last:
+            qs = qs.filter(period__lte=last[0] * 100 + last[1])
+    return qs
+
+
+def _ledger_rows(user_id, period: Period):
+    # Half-open date range on the (user_id, transaction_date) index
+    return period.filter(Transaction.objects.filter(user_id=user_id))
+
+
+def totals_by_type(user_id, period: Period) -> dict:
+    """{type: total} over a period."""
+    rollup = _rollup_rows(user_id, period)
+    if rollup is not None:
+        rows = rollup.values("type").annotate(total=Sum("total_amount"))
+    else:
+        rows = _ledger_rows(user_id, period).values("type").annotate(total=Sum("amount"))
+    return {row["type"]: row["total"] for row in rows.order_by()}
+
+
+def totals_by_category(user_id, period: Period, tx_type: str) -> dict:
+    """{str(category_id): total} over a period for one transaction type."""
+    return {
+        str(row["category_id"]): row["total"]
+        for row in category_summary(user_id, tx_type, period).order_by()
+    }
+
+
+def category_summary(user_id, tx_type: str, period: Period, category_id=None):
+    """
+    Per-category totals and counts over a period, largest first. Month-aligned
+    periods read the rollup; others aggregate the ledger over the date range.
+    Rows match the shape of the raw `values("category_id")` aggregate.
+    """
+    rollup = _rollup_rows(user_id, period)
+    if rollup is not None:
+        qs = rollup.filter(type=tx_type)
+        total, count = Sum("total_amount"), Sum("transaction_count")
+    else:
+        qs = _ledger_rows(user_id, period).filter(type=tx_type)
+        total, count = Sum("amount"), Count("id")
+    if category_id:
+        qs = qs.filter(category_id=category_id)
+    return qs.values("category_id").annotate(total=total, count=count).order_by("-total")
+
+
+def monthly_totals(user_id, period: Period, key_field: str, tx_type=None):
+    """
+    (year, month, <key_field>, total) rows per month of a month-aligned
+    period, optionally for one transaction type.
+    """
+    qs = _rollup_rows(user_id, period)
+    if tx_type:
+        qs = qs.filter(type=tx_type)
+    return (
+        qs.values_list("year", "month", key_field)
+        .annotate(total=Sum("total_amount"))
+        .order_by()
+    )
+
+
+def compute_rollups(user_id=None):
+    """Grouped aggregate of raw transactions in rollup shape."""
+    qs = Transaction.objects.all()
+    if user_id:
+        qs = qs.filter(user_id=user_id)
+    return (
+        qs.annotate(
+            year=ExtractYear("transaction_date"), month=ExtractMonth("transaction_date")
+        )
+        .values("user_id", "year", "month", "category_id", "type")
+        .annotate(total=Sum("amount"), count=Count("id"))
+        .order_by()
+    )
+
+
+def rebuild_rollups(user_id=None, dry_run: bool = False) -> dict:
+    """
+    Recompute rollups from the ledger and repair rows that drifted.
+    Returns counts of created, updated and deleted rollup rows.
+    """
+
+    def key(user, year, month, category, tx_type):
+        return (str(user), year, month, str(category) if category else None, tx_type)
+
+    expected = {
+        key(r["user_id"], r["year"], r["month"], r["category_id"], r["type"]): r
+        for r in compute_rollups(user_id)
+    }
+    existing_qs = MonthlyRollup.objects.all()
+    if user_id:
+        existing_qs = existing_qs.filter(user_id=user_id)
+
+    to_update, to_delete = [], []
+    for rollup in existing_qs:
+        k = key(rollup.user_id, rollup.year, rollup.month, rollup.category_id, rollup.type)
+        fresh = expected.pop(k, None)
+        if fresh is None:
+            to_delete.append(rollup.id)
+        elif (rollup.total_amount, rollup.transaction_count) != (
+            fresh["total"],
+            fresh["count"],
+        ):
+            rollup.total_amount = fresh["total"]
+            rollup.transaction_count = fresh["count"]
+            to_update.append(rollup)
+    to_create = [
+        MonthlyRollup(
+            user_id=r["user_id"],
+            year=r["year"],
+            month=r["month"],
+            category_id=r["category_id"],
+            type=r["type"],
+            total_amount=r["total"] or Decimal("0"),
+            transaction_count=r["count"],
+        )
+        for r in expected.values()
+    ]
+
+    if not dry_run:
+        with db_transaction.atomic():
+            MonthlyRollup.objects.filter(id__in=to_delete).delete()
+            MonthlyRollup.objects.bulk_update(
+                to_update, ["total_amount", "transaction_count"], batch_size=1000
+            )
+            MonthlyRollup.objects.bulk_create(to_create, batch_size=1000)
+
+    return {
+        "created": len(to_create),
+        "updated": len(to_update),
+        "deleted": len(to_delete),
+    }
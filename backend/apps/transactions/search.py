@@ -0,0 +1,90 @@
+"""Ranked full-text search over transaction descriptions and notes.
+
+The query is split into words and every word must match, as a prefix, so
+"rid sha" finds "Ride Share". Matches carry a `search_rank` (higher is
+better) and stay an ordinary queryset, so the list filters and pagination
+apply on top.
+
+On PostgreSQL the words become a prefix tsquery against
+`transactions.search_vector`, a generated tsvector over description and
+notes with a GIN index (supabase/schema.sql). A pg_trgm word-similarity
+match on description, served by a trigram GIN index, also admits partial
+and misspelled merchant names ("grocr"); the rank is ts_rank plus that
+similarity.
+
+On SQLite (tests and benchmarks) the `transactions_fts` FTS5 table, an
+external-content index over the same columns kept in sync by triggers
+(benchmarks.schema), is joined on rowid and ranked by bm25 with
+description weighted over notes. FTS5 has no similarity operator, so only
+the prefix matching applies there.
+
+The ORM cannot join a table on rowid, hence QuerySet.extra().
+"""
+import re
+
+from django.db import connections
+from django.db.models import FloatField
+from django.db.models.expressions import RawSQL
+
+MAX_TERMS = 8
+# Tie-break within a rank, as the list orders (TransactionCursorPagination)
+ORDERING = ("-transaction_date", "-created_at", "-id")
+
+_WORD = re.compile(r"\w+")
+
+
+def search_terms(query: str) -> list:
+    """The words of `query`, lowercased; punctuation and operators are dropped."""
+    return _WORD.findall(query.lower())[:MAX_TERMS]
+
+
+def search(queryset, query: str):
+    """
+    Transactions of `queryset` matching `query`, best first and newest
+    first within a rank. A query without words matches nothing.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset.none()
+    if connections[queryset.db].vendor == "postgresql":
+        queryset = _search_postgresql(queryset, terms)
+    else:
+        queryset = _search_sqlite(queryset, terms)
+    return queryset.order_by("-search_rank", *ORDERING)
+
+
+def _search_postgresql(queryset, terms):
+    tsquery = " & ".join(f"'{term}':*" for term in terms)
+    text = " ".join(terms)
+    return queryset.extra(
+        where=[
+            "(transactions.search_vector @@ to_tsquery('simple', %s)"
+            " OR %s <%% transactions.description)"
+        ],
+        params=[tsquery, text],
+    ).annotate(
+        search_rank=RawSQL(
+            "ts_rank(transactions.search_vector, to_tsquery('simple', %s))"
+            " + word_similarity(%s, transactions.description)",
+            [tsquery, text],
+            output_field=FloatField(),
+        )
+    )
+
+
+def _search_sqlite(queryset, terms):
+    match = " AND ".join(f'"{term}"*' for term in terms)
+    return queryset.extra(
+        tables=["transactions_fts"],
+        # The unary + keeps the planner from probing the index once per
+        # row of the user's transactions instead of running the MATCH once
+        where=[
+            "transactions.rowid = +transactions_fts.rowid",
+            "transactions_fts MATCH %s",
+        ],
+        params=[match],
+    ).annotate(
+        search_rank=RawSQL(
+            "-bm25(transactions_fts, 2.0, 1.0)", [], output_field=FloatField()
+        )
+    )
@@ -1,9 +1,19 @@
 """Transaction serializers."""
 from rest_framework import serializers
+
+from apps.accounts.models import Account
+from apps.categories.models import Category
+from utils.serializers import OwnedReferencesMixin
 from .models import Transaction
 
 
-class TransactionSerializer(serializers.ModelSerializer):
+class TransactionSerializer(OwnedReferencesMixin, serializers.ModelSerializer):
+    owned_references = {
+        "account_id": Account,
+        "category_id": Category,
+        "transfer_to_account_id": Account,
+    }
+
     class Meta:
         model = Transaction
         fields = [
@@ -34,7 +44,8 @@ class TransactionSerializer(serializers.ModelSerializer):
                         )
                     }
                 )
-        if data.get("amount", 0) <= 0:
+        # Partial updates may leave the stored amount as it is
+        if data.get("amount", getattr(self.instance, "amount", 0)) <= 0:
             raise serializers.ValidationError({"amount": "Amount must be positive."})
         return data
 
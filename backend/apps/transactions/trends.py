@@ -0,0 +1,143 @@
+"""Multi-month spending trends.
+
+One grouped query returns (year, month, key, total) rows for the whole
+window: the monthly rollups answer category and type groupings, and
+accounts, which the rollups do not carry, are grouped from the ledger by
+calendar month. The rows are scattered into a dense keys x months matrix
+with NumPy, so months without activity are zero, and moving averages and
+month-over-month changes are computed for every series at once.
+"""
+from datetime import date
+
+import numpy as np
+from django.db.models import Sum
+from django.db.models.functions import TruncMonth
+
+from utils.metadata import account_metadata, category_metadata
+from utils.periods import Period
+from . import rollups
+from .models import Transaction
+
+GROUP_BY_CATEGORY = "category"
+GROUP_BY_TYPE = "type"
+GROUP_BY_ACCOUNT = "account"
+GROUP_BY_CHOICES = (GROUP_BY_CATEGORY, GROUP_BY_TYPE, GROUP_BY_ACCOUNT)
+
+MAX_MONTHS = 120
+MAX_WINDOW = 12
+
+UNCATEGORIZED = "Uncategorized"
+
+
+def trend_rows(user_id, group_by: str, tx_type: str, period: Period) -> list:
+    """[(year, month, key, total)] for every month and key with activity."""
+    if group_by == GROUP_BY_ACCOUNT:
+        rows = (
+            period.filter(Transaction.objects.filter(user_id=user_id, type=tx_type))
+            .annotate(month_start=TruncMonth("transaction_date"))
+            .values_list("month_start", "account_id")
+            .annotate(total=Sum("amount"))
+            .order_by()
+        )
+        return [(m.year, m.month, key, total) for m, key, total in rows]
+    if group_by == GROUP_BY_TYPE:
+        return list(rollups.monthly_totals(user_id, period, "type"))
+    return list(rollups.monthly_totals(user_id, period, "category_id", tx_type))
+
+
+def build_matrix(rows, months: list) -> tuple:
+    """
+    (keys, matrix): one row per key, largest total first, and one column per
+    (year, month) in `months`; months without rows are zero.
+    """
+    column = {month: i for i, month in enumerate(months)}
+    rows = [row for row in rows if (row[0], row[1]) in column]
+    keys = list(dict.fromkeys(row[2] for row in rows))
+    index = {key: i for i, key in enumerate(keys)}
+    count = len(rows)
+    row_index = np.fromiter((index[row[2]] for row in rows), np.intp, count)
+    col_index = np.fromiter((column[row[0], row[1]] for row in rows), np.intp, count)
+    values = np.fromiter((row[3] or 0 for row in rows), float, count)
+    matrix = np.zeros((len(keys), len(months)))
+    np.add.at(matrix, (row_index, col_index), values)
+    order = np.argsort(-matrix.sum(axis=1), kind="stable")
+    return [keys[i] for i in order], matrix[order]
+
+
+def moving_average(matrix, window: int):
+    """Trailing mean over `window` months; the first months average what exists."""
+    months = matrix.shape[1]
+    sums = np.cumsum(matrix, axis=1)
+    if window < months:
+        sums[:, window:] -= sums[:, :-window].copy()
+    return sums / np.minimum(np.arange(1, months + 1), window)
+
+
+def month_over_month(matrix):
+    """Change from the previous month; NaN for the first month."""
+    changes = np.full(matrix.shape, np.nan)
+    changes[:, 1:] = np.diff(matrix, axis=1)
+    return changes
+
+
+def _columns(matrix) -> list:
+    """Rows of `matrix` as lists rounded to cents, NaN as None."""
+    rounded = np.round(matrix, 2).astype(object)
+    rounded[np.isnan(matrix)] = None
+    return rounded.tolist()
+
+
+def _labels(user_id, group_by: str, keys: list) -> list:
+    if group_by == GROUP_BY_TYPE:
+        names = dict(Transaction.TYPE_CHOICES)
+        return [names.get(key, key) for key in keys]
+    metadata = (
+        account_metadata(user_id)
+        if group_by == GROUP_BY_ACCOUNT
+        else category_metadata(user_id)
+    )
+    return [
+        metadata[str(key)].name if str(key) in metadata else UNCATEGORIZED
+        for key in keys
+    ]
+
+
+def build_trends(
+    user_id,
+    months: int,
+    group_by: str = GROUP_BY_CATEGORY,
+    tx_type: str = Transaction.TYPE_EXPENSE,
+    window: int = 3,
+    today: date | None = None,
+) -> dict:
+    """Columnar trends payload; see TransactionViewSet.trends."""
+    period = Period.last_months(months, today)
+    month_keys = period.months()
+    keys, matrix = build_matrix(
+        trend_rows(user_id, group_by, tx_type, period), month_keys
+    )
+    # The total is one more row, so it goes through the same vector operations
+    matrix = np.vstack([matrix, matrix.sum(axis=0)])
+    totals = _columns(matrix)
+    averages = _columns(moving_average(matrix, window))
+    changes = _columns(month_over_month(matrix))
+    labels = _labels(user_id, group_by, keys) + ["Total"]
+
+    series = [
+        {
+            "key": str(key) if key is not None else None,
+            "label": label,
+            "totals": totals[i],
+            "moving_average": averages[i],
+            "change": changes[i],
+        }
+        for i, (key, label) in enumerate(zip(keys + [None], labels))
+    ]
+    return {
+        "group_by": group_by,
+        "type": None if group_by == GROUP_BY_TYPE else tx_type,
+        "window": window,
+        "months": [f"{year:04d}-{month:02d}" for year, month in month_keys],
+        "series": series[:-1],
+        "total": series[-1],
+    }
@@ -1,16 +1,35 @@
 """Transaction views."""
 from django.db.models import Sum, Count
-from rest_framework import viewsets
+from django.http import StreamingHttpResponse
+from rest_framework import status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 
-from apps.categories.models import Category
+from utils.bulk import BulkWriteMixin
+from utils.cache import CacheVersionMixin
+from utils.idempotency import IdempotencyMixin
+from utils.metadata import category_names
+from utils.periods import Period, int_param
+from utils.rows import RowListMixin
+from . import exporters, rollups, search, trends
+from .importers import TransactionImporter, detect_format, iter_rows, open_text
 from .models import Transaction
+from .pagination import TransactionCursorPagination
 from .serializers import TransactionSerializer, TransactionSummarySerializer
 
 
-class TransactionViewSet(viewsets.ModelViewSet):
+class TransactionViewSet(
+    CacheVersionMixin,
+    IdempotencyMixin,
+    BulkWriteMixin,
+    RowListMixin,
+    viewsets.ModelViewSet,
+):
+    cache_namespaces = ("dashboard",)
     serializer_class = TransactionSerializer
+    EXPORT_CHUNK_SIZE = 2000
 
     def get_queryset(self):
         qs = Transaction.objects.filter(user_id=self.request.user.id)
@@ -19,8 +38,7 @@ class TransactionViewSet(viewsets.ModelViewSet):
         account_id = self.request.query_params.get("account_id")
         category_id = self.request.query_params.get("category_id")
         tx_type = self.request.query_params.get("type")
-        date_from = self.request.query_params.get("date_from")
-        date_to = self.request.query_params.get("date_to")
+        period = Period.from_params(self.request.query_params)
 
         if account_id:
             qs = qs.filter(account_id=account_id)
@@ -28,13 +46,31 @@ class TransactionViewSet(viewsets.ModelViewSet):
             qs = qs.filter(category_id=category_id)
         if tx_type:
             qs = qs.filter(type=tx_type)
-        if date_from:
-            qs = qs.filter(transaction_date__gte=date_from)
-        if date_to:
-            qs = qs.filter(transaction_date__lte=date_to)
+        if period:
+            qs = period.filter(qs)
+
+        # Best matches first; cursor pagination re-orders by date
+        query = self.request.query_params.get("search")
+        if query:
+            qs = search.search(qs, query)
 
         return qs
 
+    @property
+    def paginator(self):
+        """Keyset pagination when the client sends ?pagination=cursor or a cursor."""
+        if not hasattr(self, "_paginator"):
+            params = self.request.query_params
+            if params.get("pagination") == "cursor" or "cursor" in params:
+                self._paginator = TransactionCursorPagination()
+        return super().paginator
+
+    def perform_content_negotiation(self, request, force=False):
+        # On export, ?format= names the file format rather than a renderer
+        return super().perform_content_negotiation(
+            request, force=force or self.action == "export"
+        )
+
     def perform_create(self, serializer):
         serializer.save(user_id=self.request.user.id)
 
@@ -42,24 +78,33 @@ class TransactionViewSet(viewsets.ModelViewSet):
     def summary(self, request):
         """
         GET /transactions/summary/
-        Spending totals grouped by category for a date range.
-        Query params: date_from, date_to, type (default: expense)
+        Spending totals grouped by category for a period.
+        Query params: period (see utils.periods) or date_from/date_to,
+        category_id, account_id, search, type (default: expense)
         """
-        tx_type = request.query_params.get("type", Transaction.TYPE_EXPENSE)
-        qs = self.get_queryset().filter(type=tx_type)
+        params = request.query_params
+        tx_type = params.get("type", Transaction.TYPE_EXPENSE)
 
-        aggregated = (
-            qs.values("category_id")
-            .annotate(total=Sum("amount"), count=Count("id"))
-            .order_by("-total")
-        )
+        # Without an account filter or a search the rollup (or, for periods
+        # that do not fall on month boundaries, a date-range aggregate)
+        # answers directly; the rollup knows nothing of either
+        if not params.get("account_id") and not params.get("search"):
+            aggregated = rollups.category_summary(
+                request.user.id,
+                tx_type,
+                Period.from_params(params) or Period(),
+                category_id=params.get("category_id"),
+            )
+        else:
+            aggregated = (
+                self.get_queryset()
+                .filter(type=tx_type)
+                .values("category_id")
+                .annotate(total=Sum("amount"), count=Count("id"))
+                .order_by("-total")
+            )
 
-        # Enrich with category names
-        category_ids = [row["category_id"] for row in aggregated if row["category_id"]]
-        categories = {
-            str(c.id): c.name
-            for c in Category.objects.filter(id__in=category_ids)
-        }
+        categories = category_names(request.user.id)
 
         results = [
             {
@@ -73,3 +118,95 @@ class TransactionViewSet(viewsets.ModelViewSet):
 
         serializer = TransactionSummarySerializer(results, many=True)
         return Response(serializer.data)
+
+    @action(detail=False, methods=["get"])
+    def trends(self, request):
+        """
+        GET /transactions/trends/
+        Monthly totals over the last `months` months (default 12, this month
+        included) per category, type or account, zero-filled, with a trailing
+        moving average and month-over-month change for each series. Arrays
+        line up with "months"; a series' first change is null.
+        Query params: months, group_by (category|type|account, default:
+        category), type (default: expense; ignored for group_by=type),
+        window (moving average months, default 3)
+        """
+        params = request.query_params
+        group_by = params.get("group_by", trends.GROUP_BY_CATEGORY)
+        if group_by not in trends.GROUP_BY_CHOICES:
+            raise ValidationError(
+                {"group_by": f"Expected one of: {', '.join(trends.GROUP_BY_CHOICES)}."}
+            )
+        tx_type = params.get("type", Transaction.TYPE_EXPENSE)
+        if tx_type not in dict(Transaction.TYPE_CHOICES):
+            raise ValidationError({"type": "Not a valid transaction type."})
+        return Response(
+            trends.build_trends(
+                request.user.id,
+                months=int_param(params, "months", 12, 1, trends.MAX_MONTHS),
+                group_by=group_by,
+                tx_type=tx_type,
+                window=int_param(params, "window", 3, 1, trends.MAX_WINDOW),
+            )
+        )
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        parser_classes=[MultiPartParser],
+    )
+    def import_file(self, request):
+        """
+        POST /transactions/import/
+        Multipart upload of a CSV or OFX bank export into one account.
+        Fields: file, account_id, format (csv|ofx, default: from file name)
+        Returns counts plus per-row errors; valid rows are imported either way.
+        """
+        upload = request.FILES.get("file")
+        account_id = request.data.get("account_id")
+        if upload is None:
+            raise ValidationError({"file": "This field is required."})
+        if not account_id:
+            raise ValidationError({"account_id": "This field is required."})
+
+        file_format = detect_format(upload.name, request.data.get("format"))
+        report = TransactionImporter(request.user.id, account_id).run(
+            iter_rows(open_text(upload.file), file_format)
+        )
+        status_code = (
+            status.HTTP_201_CREATED if report["imported"] else status.HTTP_400_BAD_REQUEST
+        )
+        return Response(report, status=status_code)
+
+    @action(detail=False, methods=["get"])
+    def export(self, request):
+        """
+        GET /transactions/export/?format=csv|ndjson
+        Streams the full filtered history (same filters as the list).
+        Rows come from a server-side cursor in chunks, so memory stays flat.
+        Category names come from the user's category metadata, not a
+        per-row lookup.
+        """
+        export_format = request.query_params.get("format", "csv")
+        if export_format not in exporters.ENCODERS:
+            raise ValidationError(
+                {"format": f"Expected one of: {', '.join(exporters.ENCODERS)}."}
+            )
+
+        rows = exporters.with_category_names(
+            self.get_queryset()
+            .order_by("-transaction_date", "-created_at", "-id")
+            .values_list(*exporters.QUERY_FIELDS)
+            .iterator(chunk_size=self.EXPORT_CHUNK_SIZE),
+            category_names(request.user.id),
+        )
+        response = StreamingHttpResponse(
+            exporters.ENCODERS[export_format](rows),
+            content_type=exporters.FORMAT_CONTENT_TYPES[export_format],
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="transactions.{export_format}"'
+        )
+        return response
+
@@ -0,0 +1,86 @@
+"""Compare the three ways of building the dashboard payload.
+
+sync   DashboardView: one query per section, one after another
+async  AsyncDashboardView: the same queries, concurrently
+sql    dashboard_payload() database function: one round trip
+
+Needs a Postgres database with supabase/schema.sql applied and at least one
+user with data. Each round trip goes through LatencyProxy, so the numbers
+reflect a remote database rather than a local one:
+
+    DATABASE_URL=postgres://... python -m benchmarks.dashboard \
+        --user <uuid> --delay-ms 20 --iterations 50
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from datetime import date
+
+import django
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+
+
+def _report(label, samples):
+    print(
+        f"{label:<6} p50={_percentile(samples, 50) * 1000:8.1f}ms "
+        f"p95={_percentile(samples, 95) * 1000:8.1f}ms "
+        f"mean={statistics.mean(samples) * 1000:8.1f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--user", required=True, help="Profile id to build the dashboard for")
+    parser.add_argument("--delay-ms", type=float, default=20.0, help="Injected delay per round trip")
+    parser.add_argument("--iterations", type=int, default=30)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.development")
+    django.setup()
+
+    from django.conf import settings
+    from django.db import connections
+
+    from apps.dashboard.payload import build_payload, fetch_payload_sql
+    from apps.dashboard.views import build_payload_async
+    from .latency_proxy import LatencyProxy
+
+    db = settings.DATABASES["default"]
+    today = date.today()
+
+    with LatencyProxy(db["HOST"] or "127.0.0.1", db["PORT"] or 5432, args.delay_ms / 1000) as proxy:
+        db.update(HOST="127.0.0.1", PORT=proxy.port, CONN_MAX_AGE=None)
+        connections.close_all()
+
+        builders = {
+            "sync": lambda: build_payload(args.user, today),
+            "async": lambda: asyncio.run(build_payload_async(args.user, today)),
+            "sql": lambda: fetch_payload_sql(args.user, today),
+        }
+
+        # Warm up every path so connection setup is not measured
+        expected = builders["sync"]()
+        for label, build in builders.items():
+            if build() != expected:
+                raise SystemExit(f"{label} payload differs from the sync payload")
+
+        timings = {label: [] for label in builders}
+        for _ in range(args.iterations):
+            for label, build in builders.items():
+                start = time.perf_counter()
+                build()
+                timings[label].append(time.perf_counter() - start)
+
+    print(f"{args.iterations} iterations, {args.delay_ms:g}ms injected per round trip")
+    for label, samples in timings.items():
+        _report(label, samples)
+
+
+if __name__ == "__main__":
+    main()
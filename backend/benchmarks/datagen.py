@@ -0,0 +1,278 @@
+"""Synthetic users with realistic finance data.
+
+Each user gets the default categories, a handful of accounts (two of them
+credit cards), monthly budgets, saving plans and `transactions` transactions
+spread over the last `months` months: a salary each month, transfers to
+savings and card payments, and expenses whose category mix and amounts
+follow typical household spending. Output is deterministic for a given seed.
+"""
+import calendar
+import math
+import random
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from decimal import Decimal
+from itertools import islice
+
+from django.db import connection, transaction as db_transaction
+
+from apps.accounts import ledger, snapshots
+from apps.accounts.models import Account
+from apps.budgets.models import BudgetPlan
+from apps.categories.models import Category
+from apps.categories.views import DEFAULT_CATEGORIES
+from apps.savings.models import SavingPlan
+from apps.transactions import rollups
+from apps.transactions.models import Transaction
+from apps.users.models import Profile
+from .schema import has_triggers
+
+BATCH_SIZE = 5000
+CENT = Decimal("0.01")
+
+# Category: (share of expense transactions, median amount, merchants)
+EXPENSE_PROFILE = {
+    "Food & Dining": (0.34, 18, ["Grocer", "Cafe", "Pizza Place", "Bakery", "Food Delivery"]),
+    "Transport": (0.18, 12, ["Ride Share", "Metro Card", "Fuel Station", "Parking"]),
+    "Shopping": (0.14, 35, ["Online Store", "Department Store", "Electronics"]),
+    "Entertainment": (0.09, 20, ["Cinema", "Streaming", "Concert Hall"]),
+    "Utilities": (0.07, 60, ["Power Co", "Water Board", "Internet", "Mobile Plan"]),
+    "Healthcare": (0.05, 40, ["Pharmacy", "Clinic", "Dentist"]),
+    "Education": (0.04, 50, ["Bookstore", "Online Course"]),
+    "Housing": (0.03, 900, ["Rent", "Maintenance"]),
+    "Other": (0.06, 25, ["Misc"]),
+}
+UNCATEGORIZED_SHARE = 0.04
+
+ACCOUNTS = [
+    # name, type, provider, initial balance, credit limit, expense weight
+    ("Checking", Account.TYPE_BANK, "City Bank", 4000, None, 0.30),
+    ("Savings", Account.TYPE_BANK, "City Bank", 12000, None, 0.0),
+    ("Wallet", Account.TYPE_CASH, "", 200, None, 0.12),
+    ("Mobile Money", Account.TYPE_MFS, "bKash", 300, None, 0.10),
+    ("Rewards Card", Account.TYPE_CREDIT_CARD, "Visa", 0, 5000, 0.33),
+    ("Store Card", Account.TYPE_CREDIT_CARD, "Mastercard", 0, 1500, 0.15),
+]
+ACCOUNTS_BY_NAME = {row[0]: row for row in ACCOUNTS}
+SAVING_GOALS = [("Emergency fund", 15000), ("Vacation", 4000), ("New laptop", 2000)]
+
+
+@dataclass
+class GeneratedUser:
+    id: uuid.UUID
+    email: str
+    account_ids: list = field(default_factory=list)
+    transaction_count: int = 0
+
+
+def _month_starts(today: date, months: int) -> list:
+    starts = []
+    year, month = today.year, today.month
+    for _ in range(months):
+        starts.append(date(year, month, 1))
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    return starts[::-1]
+
+
+def _money(value: float) -> Decimal:
+    return Decimal(str(max(value, 0.01))).quantize(CENT)
+
+
+def _create_profile(rng, index: int, monthly_income: Decimal) -> Profile:
+    user_id = uuid.UUID(int=rng.getrandbits(128), version=4)
+    email = f"bench{index}-{user_id.hex[:8]}@example.com"
+    if connection.vendor == "postgresql":
+        # profiles.id references auth.users; its trigger creates the profile
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO auth.users (id, email) VALUES (%s, %s)", [user_id, email]
+            )
+        Profile.objects.filter(id=user_id).update(
+            full_name=f"Bench User {index}",
+            monthly_income=monthly_income,
+            onboarding_completed=True,
+        )
+        return Profile.objects.get(id=user_id)
+    return Profile.objects.create(
+        id=user_id,
+        email=email,
+        full_name=f"Bench User {index}",
+        monthly_income=monthly_income,
+        onboarding_completed=True,
+    )
+
+
+def _transactions(rng, user_id, accounts, categories, months, count):
+    """Yield unsaved Transaction objects for one user, month by month."""
+    checking, savings = accounts["Checking"], accounts["Savings"]
+    cards = [a for a in accounts.values() if a.type == Account.TYPE_CREDIT_CARD]
+    spend_accounts = [a for a in accounts.values() if ACCOUNTS_BY_NAME[a.name][5]]
+    spend_weights = [ACCOUNTS_BY_NAME[a.name][5] for a in spend_accounts]
+    expense_names = list(EXPENSE_PROFILE)
+    expense_weights = [EXPENSE_PROFILE[name][0] for name in expense_names]
+    salary = categories[("Salary", Category.TYPE_INCOME)]
+    freelance = categories[("Freelance", Category.TYPE_INCOME)]
+    today = date.today()
+
+    per_month = max(count // len(months), 1)
+    remaining = count
+    for index, start in enumerate(months):
+        n = remaining if index == len(months) - 1 else min(per_month, remaining)
+        remaining -= n
+        if (start.year, start.month) == (today.year, today.month):
+            days = today.day
+        else:
+            days = calendar.monthrange(start.year, start.month)[1]
+
+        def tx(**fields):
+            return Transaction(
+                user_id=user_id,
+                transaction_date=start + timedelta(days=rng.randrange(days)),
+                **fields,
+            )
+
+        # Payroll, savings transfer, card payments and some side income
+        fixed = [
+            tx(
+                account_id=checking.id,
+                category_id=salary.id,
+                type=Transaction.TYPE_INCOME,
+                amount=_money(rng.gauss(5200, 150)),
+                description="Payroll",
+            ),
+            tx(
+                account_id=checking.id,
+                transfer_to_account_id=savings.id,
+                type=Transaction.TYPE_TRANSFER,
+                amount=_money(rng.uniform(300, 900)),
+                description="Monthly savings",
+            ),
+        ]
+        fixed += [
+            tx(
+                account_id=checking.id,
+                transfer_to_account_id=card.id,
+                type=Transaction.TYPE_TRANSFER,
+                amount=_money(rng.uniform(200, 1200)),
+                description=f"{card.name} payment",
+            )
+            for card in cards
+        ]
+        if rng.random() < 0.3:
+            fixed.append(
+                tx(
+                    account_id=checking.id,
+                    category_id=freelance.id,
+                    type=Transaction.TYPE_INCOME,
+                    amount=_money(rng.uniform(200, 1500)),
+                    description="Client invoice",
+                )
+            )
+        fixed = fixed[:n]
+        yield from fixed
+
+        for _ in range(n - len(fixed)):
+            name = rng.choices(expense_names, expense_weights)[0]
+            _, median, merchants = EXPENSE_PROFILE[name]
+            uncategorized = rng.random() < UNCATEGORIZED_SHARE
+            yield tx(
+                account_id=rng.choices(spend_accounts, spend_weights)[0].id,
+                category_id=None
+                if uncategorized
+                else categories[(name, Category.TYPE_EXPENSE)].id,
+                type=Transaction.TYPE_EXPENSE,
+                amount=_money(median * math.exp(rng.gauss(0, 0.6))),
+                description=rng.choice(merchants),
+                notes="" if rng.random() < 0.9 else "auto-generated",
+            )
+
+
+def generate_user(rng, index: int, transactions: int, months: int = 24) -> GeneratedUser:
+    profile = _create_profile(rng, index, _money(rng.gauss(5200, 150)))
+    user = GeneratedUser(id=profile.id, email=profile.email)
+
+    categories = {
+        (c.name, c.type): c
+        for c in Category.objects.bulk_create(
+            Category(
+                user_id=user.id,
+                name=data["name"],
+                type=data["type"],
+                icon=data["icon"],
+                color=data["color"],
+                is_default=True,
+            )
+            for data in DEFAULT_CATEGORIES
+        )
+    }
+    accounts = {
+        a.name: a
+        for a in Account.objects.bulk_create(
+            Account(
+                user_id=user.id,
+                name=name,
+                type=acc_type,
+                provider=provider,
+                initial_balance=Decimal(initial),
+                current_balance=Decimal(initial),
+                credit_limit=Decimal(limit) if limit else None,
+                billing_date=rng.randint(1, 28) if limit else None,
+                due_date=rng.randint(1, 28) if limit else None,
+            )
+            for name, acc_type, provider, initial, limit, _ in ACCOUNTS
+        )
+    }
+    user.account_ids = [a.id for a in accounts.values()]
+
+    month_starts = _month_starts(date.today(), months)
+    BudgetPlan.objects.bulk_create(
+        BudgetPlan(
+            user_id=user.id,
+            category_id=categories[(name, Category.TYPE_EXPENSE)].id,
+            month=start.month,
+            year=start.year,
+            planned_amount=_money(
+                median * share * transactions / months * rng.uniform(0.9, 1.4)
+            ),
+        )
+        for start in month_starts
+        for name, (share, median, _) in EXPENSE_PROFILE.items()
+    )
+    SavingPlan.objects.bulk_create(
+        SavingPlan(
+            user_id=user.id,
+            name=name,
+            target_amount=Decimal(target),
+            current_amount=_money(target * rng.uniform(0, 0.8)),
+            target_date=date.today() + timedelta(days=rng.randint(90, 900)),
+            monthly_contribution=Decimal(target // 24),
+        )
+        for name, target in SAVING_GOALS
+    )
+
+    rows = _transactions(rng, user.id, accounts, categories, month_starts, transactions)
+    while batch := list(islice(rows, BATCH_SIZE)):
+        Transaction.objects.bulk_create(batch)
+        user.transaction_count += len(batch)
+
+    if not has_triggers():
+        # No balance, rollup or snapshot triggers outside Postgres; derive them
+        ledger.apply_corrections(ledger.find_drift(user.id))
+        rollups.rebuild_rollups(user.id)
+        snapshots.rebuild_snapshots(user.id)
+    return user
+
+
+def generate(
+    users: int, transactions: int, months: int = 24, seed: int = 0, progress=None
+) -> list:
+    """Create `users` users with `transactions` transactions each."""
+    rng = random.Random(seed)
+    generated = []
+    for index in range(users):
+        with db_transaction.atomic():
+            generated.append(generate_user(rng, index, transactions, months))
+        if progress:
+            progress(generated[-1])
+    return generated
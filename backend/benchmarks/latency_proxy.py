@@ -0,0 +1,65 @@
+"""TCP proxy that adds a fixed delay to every round trip to the database.
+
+A local Postgres answers in well under a millisecond, which hides the cost of
+sequential queries against the remote Supabase instance. Pointing Django at
+this proxy instead makes each query pay `delay` seconds, like a real network.
+"""
+import asyncio
+import threading
+
+
+class LatencyProxy:
+    """
+    Forwards 127.0.0.1:<port> to upstream, delaying each client->server chunk.
+
+        with LatencyProxy("db.example.com", 5432, delay=0.02) as proxy:
+            DATABASES["default"].update(HOST="127.0.0.1", PORT=proxy.port)
+    """
+
+    def __init__(self, upstream_host: str, upstream_port: int, delay: float):
+        self.upstream_host = upstream_host
+        self.upstream_port = int(upstream_port)
+        self.delay = delay
+        self.port = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._server = None
+
+    def __enter__(self):
+        self._thread.start()
+        self._server = asyncio.run_coroutine_threadsafe(
+            asyncio.start_server(self._handle, "127.0.0.1", 0), self._loop
+        ).result()
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    def __exit__(self, *exc):
+        self._server.close()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    async def _handle(self, client_reader, client_writer):
+        try:
+            upstream_reader, upstream_writer = await asyncio.open_connection(
+                self.upstream_host, self.upstream_port
+            )
+        except OSError:
+            client_writer.close()
+            return
+        await asyncio.gather(
+            self._pipe(client_reader, upstream_writer, self.delay),
+            self._pipe(upstream_reader, client_writer, 0),
+        )
+
+    @staticmethod
+    async def _pipe(reader, writer, delay):
+        try:
+            while data := await reader.read(65536):
+                if delay:
+                    await asyncio.sleep(delay)
+                writer.write(data)
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
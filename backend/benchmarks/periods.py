@@ -0,0 +1,80 @@
+"""EXTRACT()-style month filters versus half-open date ranges.
+
+Runs the same monthly expense aggregate for each benchmark user both ways,
+prints the query plan of each and their timings. Expects data generated by
+benchmarks.run (same settings and database):
+
+    python -m benchmarks.periods --iterations 50
+"""
+import argparse
+import os
+import statistics
+import time
+from datetime import date
+
+import django
+
+
+def explain(queryset) -> str:
+    from django.db import connection
+
+    sql, params = queryset.query.sql_with_params()
+    prefix = "EXPLAIN QUERY PLAN " if connection.vendor == "sqlite" else "EXPLAIN "
+    with connection.cursor() as cursor:
+        cursor.execute(prefix + sql, params)
+        rows = cursor.fetchall()
+    return "\n".join("  " + str(row[-1]) for row in rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=30)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.benchmark")
+    django.setup()
+
+    from django.db.models import Sum
+
+    from apps.transactions.models import Transaction
+    from apps.users.models import Profile
+    from utils.periods import Period
+
+    today = date.today()
+    period = Period.month(today.year, today.month)
+    user_ids = list(
+        Profile.objects.filter(email__startswith="bench").values_list("id", flat=True)
+    )
+    if not user_ids:
+        raise SystemExit("No benchmark users; run python -m benchmarks.run first")
+
+    def extract_lookup(user_id):
+        return Transaction.objects.filter(
+            user_id=user_id,
+            type=Transaction.TYPE_EXPENSE,
+            transaction_date__year=today.year,
+            transaction_date__month=today.month,
+        )
+
+    def date_range(user_id):
+        return period.filter(
+            Transaction.objects.filter(user_id=user_id, type=Transaction.TYPE_EXPENSE)
+        )
+
+    for label, build in [("__year/__month", extract_lookup), ("Period range", date_range)]:
+        aggregate = build(user_ids[0]).values("type").annotate(total=Sum("amount"))
+        print(f"{label}:\n{explain(aggregate.order_by())}")
+        totals, samples = set(), []
+        for n in range(args.iterations):
+            qs = build(user_ids[n % len(user_ids)])
+            start = time.perf_counter()
+            totals.add(qs.aggregate(total=Sum("amount"))["total"])
+            samples.append(time.perf_counter() - start)
+        print(
+            f"  median {statistics.median(samples) * 1000:.1f}ms, "
+            f"max {max(samples) * 1000:.1f}ms over {args.iterations} runs\n"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,474 @@
+"""Load test every API endpoint against generated data and track a baseline.
+
+    # build the schema, generate 3 users x 1M transactions, run, save baseline
+    python -m benchmarks.run --users 3 --transactions 1000000 --save-baseline
+
+    # later: rerun on the existing data and fail on regressions
+    python -m benchmarks.run --compare
+
+Requests go through the full middleware stack in-process (Django's test
+client), so latency excludes the network but includes auth, serialization
+and rendering. Query counts come from the Server-Timing header added by
+utils.instrumentation, executor-thread queries (dashboard pool, /batch/)
+included. A streamed body runs its queries after the header is sent, so
+streaming endpoints (the export) record null queries: not measured, and
+not compared.
+
+Endpoints that write run each request in a transaction that is rolled back
+once the response is read, so every run, and every request of a run, sees
+the same data. Their timings therefore leave out the commit.
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+import django
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+# Regressions must exceed both to fail, so timer noise on fast endpoints
+# does not trip the comparison
+P95_TOLERANCE = 0.5
+P95_MIN_DELTA_MS = 5.0
+
+_QUERY_COUNT = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+
+@dataclass
+class Endpoint:
+    name: str
+    method: str
+    path: str
+    body: object = None
+    format: str = "json"
+    writes: bool = False
+
+
+# What the mobile home screen hydrates in one POST /batch/
+MOBILE_HOME_PATHS = (
+    "dashboard/",
+    "accounts/",
+    "categories/",
+    "budgets/progress/",
+    "savings/plans/",
+)
+
+
+def endpoints(user) -> list:
+    """One entry per route in config/api_urls.py, filled with this user's ids."""
+    from apps.accounts.models import Account
+    from apps.budgets.models import BudgetPlan
+    from apps.categories.models import Category
+    from apps.savings.models import SavingPlan
+    from apps.transactions.models import Transaction
+
+    account = Account.objects.filter(user_id=user.id).order_by("created_at", "id").first()
+    category = Category.objects.filter(user_id=user.id, type="expense").first()
+    budget = BudgetPlan.objects.filter(user_id=user.id).first()
+    plan = SavingPlan.objects.filter(user_id=user.id).first()
+    tx = Transaction.objects.filter(user_id=user.id).first()
+    today = date.today()
+    month_start = today.replace(day=1).isoformat()
+    year_ago = (today - timedelta(days=364)).isoformat()
+    csv_rows = "".join(
+        f"{today.isoformat()},-{i % 50 + 1}.25,Benchmark import {i}\n" for i in range(100)
+    )
+    return [
+        Endpoint("health", "get", "/api/v1/health/"),
+        Endpoint("auth-me", "get", "/api/v1/auth/me/"),
+        Endpoint("auth-sync", "post", "/api/v1/auth/sync/", {}),
+        Endpoint("dashboard", "get", "/api/v1/dashboard/"),
+        Endpoint("account-list", "get", "/api/v1/accounts/"),
+        Endpoint("account-detail", "get", f"/api/v1/accounts/{account.id}/"),
+        Endpoint("account-consolidated-balance", "get", "/api/v1/accounts/consolidated_balance/"),
+        Endpoint("account-credit-cards", "get", "/api/v1/accounts/credit_cards/"),
+        Endpoint(
+            "account-balance-history",
+            "get",
+            f"/api/v1/accounts/{account.id}/balance_history/?from={year_ago}",
+        ),
+        Endpoint(
+            "account-net-worth", "get", f"/api/v1/accounts/net_worth/?from={year_ago}"
+        ),
+        Endpoint("category-list", "get", "/api/v1/categories/"),
+        Endpoint("category-detail", "get", f"/api/v1/categories/{category.id}/"),
+        Endpoint(
+            "category-seed-defaults",
+            "post",
+            "/api/v1/categories/seed_defaults/",
+            {},
+            writes=True,
+        ),
+        Endpoint("transaction-list", "get", "/api/v1/transactions/"),
+        Endpoint(
+            "transaction-list-cursor", "get", "/api/v1/transactions/?pagination=cursor"
+        ),
+        Endpoint(
+            "transaction-list-filtered",
+            "get",
+            f"/api/v1/transactions/?category_id={category.id}&date_from={month_start}",
+        ),
+        Endpoint(
+            "transaction-search", "get", "/api/v1/transactions/?search=dentist"
+        ),
+        Endpoint("transaction-detail", "get", f"/api/v1/transactions/{tx.id}/"),
+        Endpoint(
+            "transaction-create",
+            "post",
+            "/api/v1/transactions/",
+            {
+                "account_id": str(account.id),
+                "category_id": str(category.id),
+                "type": "expense",
+                "amount": "12.34",
+                "description": "Benchmark",
+                "transaction_date": today.isoformat(),
+            },
+            writes=True,
+        ),
+        Endpoint(
+            "transaction-bulk",
+            "post",
+            "/api/v1/transactions/bulk/",
+            # Fresh client ids per request, as a replayed offline queue sends
+            lambda: {
+                "operations": [
+                    {
+                        "op": "create",
+                        "id": str(uuid.uuid4()),
+                        "data": {
+                            "account_id": str(account.id),
+                            "category_id": str(category.id),
+                            "type": "expense",
+                            "amount": f"{i + 1}.50",
+                            "description": f"Offline {i}",
+                            "transaction_date": today.isoformat(),
+                        },
+                    }
+                    for i in range(20)
+                ]
+                + [
+                    {"op": "update", "id": str(tx.id), "data": {"notes": "Synced"}},
+                ]
+            },
+            writes=True,
+        ),
+        Endpoint("transaction-summary", "get", "/api/v1/transactions/summary/"),
+        Endpoint(
+            "transaction-summary-month",
+            "get",
+            f"/api/v1/transactions/summary/?date_from={month_start}",
+        ),
+        Endpoint(
+            "transaction-trends", "get", "/api/v1/transactions/trends/?months=24"
+        ),
+        Endpoint(
+            "transaction-export",
+            "get",
+            f"/api/v1/transactions/export/?format=csv&date_from={month_start}",
+        ),
+        Endpoint(
+            "transaction-import-file",
+            "post",
+            "/api/v1/transactions/import/",
+            lambda: {
+                "account_id": str(account.id),
+                "file": _upload("date,amount,description\n" + csv_rows),
+            },
+            format="multipart",
+            writes=True,
+        ),
+        Endpoint("budget-list", "get", "/api/v1/budgets/"),
+        Endpoint("budget-detail", "get", f"/api/v1/budgets/{budget.id}/"),
+        Endpoint("budget-progress", "get", "/api/v1/budgets/progress/"),
+        Endpoint("saving-plan-list", "get", "/api/v1/savings/plans/"),
+        Endpoint("saving-plan-detail", "get", f"/api/v1/savings/plans/{plan.id}/"),
+        Endpoint(
+            "saving-plan-projection",
+            "get",
+            f"/api/v1/savings/plans/{plan.id}/projection/",
+        ),
+        Endpoint("saving-plan-projections", "get", "/api/v1/savings/plans/projections/"),
+        Endpoint("savings-suggestions", "get", "/api/v1/savings/suggestions/"),
+        Endpoint("sync", "get", "/api/v1/sync/"),
+        *(
+            Endpoint(
+                name,
+                "post",
+                f"/api/v1/{prefix}/bulk/",
+                {"operations": [op]},
+                writes=True,
+            )
+            for name, prefix, op in (
+                ("account-bulk", "accounts", _touch(account, name=account.name)),
+                ("category-bulk", "categories", _touch(category, color=category.color)),
+                ("budget-bulk", "budgets", _touch(budget, month=budget.month)),
+                ("saving-plan-bulk", "savings/plans", _touch(plan, name=plan.name)),
+            )
+        ),
+        Endpoint(
+            "batch",
+            "post",
+            "/api/v1/batch/",
+            {"paths": list(MOBILE_HOME_PATHS)},
+        ),
+    ]
+
+
+def _touch(obj, **data) -> dict:
+    """A bulk operation that rewrites `obj` with values it already has."""
+    return {"op": "update", "id": str(obj.id), "data": data}
+
+
+def _upload(text: str):
+    from django.core.files.uploadedfile import SimpleUploadedFile
+
+    return SimpleUploadedFile("bench.csv", text.encode(), content_type="text/csv")
+
+
+@contextmanager
+def rolled_back():
+    """Undo every write made inside the block."""
+    from django.db import transaction
+
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def uncovered_routes(covered: set) -> list:
+    """Named routes in config.api_urls that no benchmark endpoint resolves to."""
+    from django.urls import get_resolver
+
+    names = set()
+    for name in get_resolver("config.api_urls").reverse_dict:
+        if isinstance(name, str) and name != "api-root":
+            names.add(name)
+    return sorted(names - covered)
+
+
+def percentile(samples: list, pct: float) -> float:
+    ordered = sorted(samples)
+    rank = pct / 100 * (len(ordered) - 1)
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def make_clients(users):
+    from django.conf import settings
+    import jwt
+    from rest_framework.test import APIClient
+
+    clients = []
+    for user in users:
+        now = int(time.time())
+        token = jwt.encode(
+            {
+                "sub": str(user.id),
+                "email": user.email,
+                "role": "authenticated",
+                "aud": "authenticated",
+                "iat": now,
+                "exp": now + 24 * 3600,
+            },
+            settings.SUPABASE_JWT_SECRET,
+            algorithm="HS256",
+        )
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        clients.append(client)
+    return clients
+
+
+def run_endpoint(index: int, clients: list, users: list, requests: int, concurrency: int):
+    """Time `requests` calls of endpoint `index`, round-robin over users."""
+    from django.db import connections
+    from django.urls import resolve
+
+    per_user = [endpoints(user)[index] for user in users]
+    route = resolve(per_user[0].path.split("?")[0]).url_name
+
+    def call(n):
+        spec = per_user[n % len(users)]
+        body = spec.body() if callable(spec.body) else spec.body
+        send = getattr(clients[n % len(users)], spec.method)
+        with rolled_back() if spec.writes else nullcontext():
+            start = time.perf_counter()
+            if spec.method == "get":
+                response = send(spec.path)
+            else:
+                response = send(spec.path, body, format=spec.format)
+            if response.streaming:
+                b"".join(response.streaming_content)
+            elapsed = time.perf_counter() - start
+        match = _QUERY_COUNT.search(response.get("Server-Timing", ""))
+        queries = int(match.group(1)) if match and not response.streaming else None
+        return elapsed, queries, response.status_code
+
+    def worker(numbers):
+        try:
+            return [call(n) for n in numbers]
+        finally:
+            connections.close_all()
+
+    call(0)  # warm up
+    start = time.perf_counter()
+    if concurrency > 1:
+        chunks = [range(i, requests, concurrency) for i in range(concurrency)]
+        with ThreadPoolExecutor(concurrency) as pool:
+            results = [r for chunk in pool.map(worker, chunks) for r in chunk]
+    else:
+        results = [call(n) for n in range(requests)]
+    wall = time.perf_counter() - start
+
+    latencies = [r[0] for r in results]
+    queries = [r[1] for r in results if r[1] is not None]
+    return route, {
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 2),
+        "queries": max(queries) if queries else None,
+        "rps": round(len(results) / wall, 1),
+        "errors": sum(1 for r in results if r[2] >= 400),
+    }
+
+
+def compare(results: dict, baseline: dict) -> list:
+    """
+    Human-readable regressions of `results` against `baseline`. Endpoints
+    the baseline does not have count too: it needs recording again.
+    """
+    regressions = []
+    for name, current in results.items():
+        before = baseline.get(name)
+        if before is None:
+            regressions.append(f"{name}: not in the baseline, rerun with --save-baseline")
+            continue
+        if (
+            current["queries"] is not None
+            and before["queries"] is not None
+            and current["queries"] > before["queries"]
+        ):
+            regressions.append(
+                f"{name}: {current['queries']} queries (baseline {before['queries']})"
+            )
+        delta = current["p95_ms"] - before["p95_ms"]
+        if delta > P95_MIN_DELTA_MS and delta > before["p95_ms"] * P95_TOLERANCE:
+            regressions.append(
+                f"{name}: p95 {current['p95_ms']}ms (baseline {before['p95_ms']}ms)"
+            )
+        if current["errors"] > before["errors"]:
+            regressions.append(f"{name}: {current['errors']} errors")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every API endpoint.")
+    parser.add_argument("--users", type=int, default=3)
+    parser.add_argument("--transactions", type=int, default=100_000, help="Per user")
+    parser.add_argument("--months", type=int, default=24)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--requests", type=int, default=50, help="Per endpoint")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--only", help="Regex of endpoint names to run")
+    parser.add_argument("--regenerate", action="store_true", help="Discard existing data")
+    parser.add_argument(
+        "--save-baseline", nargs="?", const=BASELINE_PATH, type=Path, metavar="PATH"
+    )
+    parser.add_argument("--compare", nargs="?", const=BASELINE_PATH, type=Path, metavar="PATH")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.benchmark")
+    django.setup()
+
+    from django.db import connection
+
+    from apps.users.models import Profile
+    from .datagen import GeneratedUser, generate
+    from .schema import create_schema, drop_schema
+
+    if args.regenerate:
+        drop_schema()
+    create_schema()
+
+    users = [
+        GeneratedUser(id=p.id, email=p.email)
+        for p in Profile.objects.filter(email__startswith="bench").order_by("email")
+    ]
+    if not users:
+        print(f"Generating {args.users} users x {args.transactions} transactions...")
+        start = time.perf_counter()
+        users = generate(
+            args.users,
+            args.transactions,
+            args.months,
+            args.seed,
+            progress=lambda u: print(f"  {u.email}: {u.transaction_count} transactions"),
+        )
+        print(f"  done in {time.perf_counter() - start:.1f}s")
+
+    clients = make_clients(users)
+    specs = endpoints(users[0])
+    results, covered = {}, set()
+    print(f"{'endpoint':<32}{'p50':>9}{'p95':>9}{'p99':>9}{'queries':>9}{'req/s':>9}")
+    for index, spec in enumerate(specs):
+        if args.only and not re.search(args.only, spec.name):
+            continue
+        route, stats = run_endpoint(index, clients, users, args.requests, args.concurrency)
+        covered.add(route)
+        results[spec.name] = stats
+        queries = "-" if stats["queries"] is None else stats["queries"]
+        print(
+            f"{spec.name:<32}{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}"
+            f"{stats['p99_ms']:>9.1f}{queries:>9}{stats['rps']:>9.1f}"
+            + (f"  ({stats['errors']} errors)" if stats["errors"] else "")
+        )
+
+    if not args.only:
+        missing = uncovered_routes(covered)
+        if missing:
+            print(f"Routes without a benchmark: {', '.join(missing)}", file=sys.stderr)
+
+    if args.save_baseline:
+        from apps.transactions.models import Transaction
+
+        baseline = {
+            "meta": {
+                "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "database": connection.vendor,
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "users": len(users),
+                "transactions": Transaction.objects.count(),
+                "requests": args.requests,
+                "concurrency": args.concurrency,
+            },
+            "endpoints": results,
+        }
+        args.save_baseline.write_text(json.dumps(baseline, indent=2) + "\n")
+        print(f"Baseline written to {args.save_baseline}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        regressions = compare(results, baseline["endpoints"])
+        if regressions:
+            print("Regressions against baseline:", *regressions, sep="\n  ")
+            sys.exit(1)
+        print("No regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Create the application tables in a local database.
+
+Every model is unmanaged because Supabase owns the schema, so neither the
+test runner nor `migrate` creates tables. On PostgreSQL this loads
+supabase/schema.sql itself (after a minimal stand-in for Supabase's `auth`
+schema and its anon and authenticated roles), triggers and functions
+included. On SQLite it creates the tables
+from the models plus the composite indexes, the sync tombstone triggers
+and an FTS5 search index with the triggers that keep it in sync;
+there are no balance, rollup or snapshot triggers, so account balances,
+monthly rollups and balance snapshots must be derived after loading data
+(see benchmarks.datagen).
+"""
+from pathlib import Path
+
+from django.apps import apps
+from django.db import connection as default_connection
+
+SCHEMA_SQL = Path(__file__).resolve().parents[2] / "supabase" / "schema.sql"
+
+AUTH_STUB_SQL = """
+DO $$
+BEGIN
+    CREATE ROLE anon NOLOGIN;
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
+DO $$
+BEGIN
+    CREATE ROLE authenticated NOLOGIN;
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
+CREATE SCHEMA IF NOT EXISTS auth;
+CREATE TABLE IF NOT EXISTS auth.users (
+    id UUID PRIMARY KEY,
+    email TEXT,
+    raw_user_meta_data JSONB NOT NULL DEFAULT '{}'
+);
+CREATE OR REPLACE FUNCTION auth.uid() RETURNS UUID AS $$
+    SELECT NULLIF(current_setting('request.jwt.claim.sub', TRUE), '')::UUID
+$$ LANGUAGE sql STABLE;
+"""
+
+SYNC_TABLES = ["accounts", "transactions", "categories", "budget_plans", "saving_plans"]
+
+SQLITE_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_transactions_user_date ON transactions "
+    "(user_id, transaction_date DESC, created_at DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_transactions_category ON transactions (category_id)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS transaction_monthly_rollups_key ON "
+    "transaction_monthly_rollups (user_id, year, month, category_id, type)",
+    "CREATE INDEX IF NOT EXISTS idx_account_balance_snapshots_user_date ON "
+    "account_balance_snapshots (user_id, snapshot_date)",
+    "CREATE INDEX IF NOT EXISTS idx_sync_tombstones_user_deleted ON sync_tombstones "
+    "(user_id, deleted_at, id)",
+] + [
+    f"CREATE INDEX IF NOT EXISTS idx_{table}_user_updated ON {table} "
+    "(user_id, updated_at, id)"
+    for table in SYNC_TABLES
+]
+
+# Stands in for the search_vector and trigram indexes (apps.transactions.search)
+SQLITE_SEARCH_TABLE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5("
+    "description, notes, content='transactions', content_rowid='rowid', "
+    "tokenize='unicode61 remove_diacritics 2')"
+)
+
+# Tombstones are the one trigger-maintained table the app cannot do without
+# on SQLite; the timestamp matches Django's SQLite datetime format. The
+# external-content search index needs its rows deleted with the old values.
+SQLITE_TRIGGERS = [
+    f"CREATE TRIGGER IF NOT EXISTS {table}_tombstones AFTER DELETE ON {table} "
+    "BEGIN INSERT INTO sync_tombstones (user_id, entity, object_id, deleted_at) "
+    f"VALUES (OLD.user_id, '{table}', OLD.id, "
+    "strftime('%Y-%m-%d %H:%M:%f', 'now') || '000'); END"
+    for table in SYNC_TABLES
+] + [
+    "CREATE TRIGGER IF NOT EXISTS transactions_fts_insert AFTER INSERT ON transactions "
+    "BEGIN INSERT INTO transactions_fts (rowid, description, notes) "
+    "VALUES (NEW.rowid, NEW.description, NEW.notes); END",
+    "CREATE TRIGGER IF NOT EXISTS transactions_fts_delete AFTER DELETE ON transactions "
+    "BEGIN INSERT INTO transactions_fts (transactions_fts, rowid, description, notes) "
+    "VALUES ('delete', OLD.rowid, OLD.description, OLD.notes); END",
+    "CREATE TRIGGER IF NOT EXISTS transactions_fts_update "
+    "AFTER UPDATE OF description, notes ON transactions "
+    "BEGIN INSERT INTO transactions_fts (transactions_fts, rowid, description, notes) "
+    "VALUES ('delete', OLD.rowid, OLD.description, OLD.notes); "
+    "INSERT INTO transactions_fts (rowid, description, notes) "
+    "VALUES (NEW.rowid, NEW.description, NEW.notes); END",
+]
+
+
+def app_models():
+    return [
+        model
+        for model in apps.get_models()
+        if not model._meta.managed and model.__module__.startswith("apps.")
+    ]
+
+
+def create_schema(connection=default_connection) -> bool:
+    """Create the tables unless they exist. Returns True if anything was created."""
+    if "transactions" in connection.introspection.table_names():
+        return False
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(AUTH_STUB_SQL)
+            cursor.execute(SCHEMA_SQL.read_text())
+        return True
+
+    with connection.schema_editor() as editor:
+        for model in app_models():
+            editor.create_model(model)
+    with connection.cursor() as cursor:
+        for statement in SQLITE_INDEXES + [SQLITE_SEARCH_TABLE] + SQLITE_TRIGGERS:
+            cursor.execute(statement)
+    return True
+
+
+def drop_schema(connection=default_connection) -> None:
+    """Drop the application tables (and on PostgreSQL the stub auth users)."""
+    existing = set(connection.introspection.table_names())
+    with connection.schema_editor() as editor:
+        for model in app_models():
+            if model._meta.db_table in existing:
+                editor.delete_model(model)
+    if "transactions_fts" in existing:
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TABLE transactions_fts")
+    if connection.vendor == "postgresql" and "profiles" in existing:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "DROP TRIGGER IF EXISTS on_auth_user_created ON auth.users;"
+                "DELETE FROM auth.users;"
+            )
+
+
+def has_triggers(connection=default_connection) -> bool:
+    """Whether balances, rollups and snapshots are maintained by the database."""
+    return connection.vendor == "postgresql"
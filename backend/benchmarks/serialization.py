@@ -0,0 +1,106 @@
+"""Microbenchmark: ModelSerializer + JSONRenderer vs RowEncoder + ORJSONRenderer.
+
+Encodes a page of in-memory transactions, accounts and budget plans both
+ways, checks the bytes match and prints the time per page. No database
+needed:
+
+    python -m benchmarks.serialization --rows 200 --iterations 200
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+import uuid
+from collections import namedtuple
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import django
+
+
+def _instances(model, rows, rng):
+    """`rows` unsaved instances of `model` with every field populated."""
+    from django.db import models
+
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    instances = []
+    for _ in range(rows):
+        values = {}
+        for field in model._meta.concrete_fields:
+            if isinstance(field, models.UUIDField):
+                value = uuid.UUID(int=rng.getrandbits(128), version=4)
+            elif isinstance(field, models.DecimalField):
+                value = Decimal(rng.randrange(1, 10**6)) / 100
+            elif isinstance(field, models.DateTimeField):
+                value = now + timedelta(microseconds=rng.randrange(10**12))
+            elif isinstance(field, models.DateField):
+                value = date(2026, 1, 1) + timedelta(days=rng.randrange(365))
+            elif isinstance(field, models.BooleanField):
+                value = rng.random() < 0.9
+            elif isinstance(field, models.IntegerField):
+                value = rng.randint(1, 12)
+            elif field.choices:
+                value = rng.choice(field.choices)[0]
+            else:
+                value = rng.choice(["Grocer", "Café", "Metro Card", "Payroll", ""])
+            values[field.attname] = value
+        instances.append(model(**values))
+    return instances
+
+
+def _time(fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200, help="rows per page")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.benchmark")
+    django.setup()
+
+    from rest_framework.renderers import JSONRenderer
+
+    from apps.accounts.serializers import AccountSerializer
+    from apps.budgets.serializers import BudgetPlanSerializer
+    from apps.transactions.serializers import TransactionSerializer
+    from utils.renderers import ORJSONRenderer
+    from utils.rows import row_encoder
+
+    rng = random.Random(0)
+    json_renderer, orjson_renderer = JSONRenderer(), ORJSONRenderer()
+    print(f"{'serializer':<24}{'rows':>6}{'DRF ms':>10}{'fast ms':>10}{'speedup':>9}")
+    for serializer_class in (TransactionSerializer, AccountSerializer, BudgetPlanSerializer):
+        encoder = row_encoder(serializer_class)
+        instances = _instances(serializer_class.Meta.model, args.rows, rng)
+        Row = namedtuple("Row", encoder.sources)
+        rows = [Row(*(getattr(obj, s) for s in encoder.sources)) for obj in instances]
+
+        def drf():
+            data = serializer_class(instances, many=True).data
+            return json_renderer.render({"count": len(data), "results": data})
+
+        def fast():
+            data = [encoder(row) for row in rows]
+            return orjson_renderer.render({"count": len(data), "results": data})
+
+        if drf() != fast():
+            raise SystemExit(f"{serializer_class.__name__}: output differs")
+        slow_ms = _time(drf, args.iterations)
+        fast_ms = _time(fast, args.iterations)
+        print(
+            f"{serializer_class.__name__:<24}{args.rows:>6}"
+            f"{slow_ms:>10.2f}{fast_ms:>10.2f}{slow_ms / fast_ms:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 """API v1 URL routing."""
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
@@ -8,7 +9,9 @@ from apps.transactions.views import TransactionViewSet
 from apps.categories.views import CategoryViewSet
 from apps.budgets.views import BudgetPlanViewSet
 from apps.savings.views import SavingPlanViewSet, SavingSuggestionsView
-from apps.dashboard.views import DashboardView
+from apps.dashboard.views import AsyncDashboardView, DashboardView
+from apps.sync.views import SyncView
+from utils.batch import BatchView
 from utils.views import HealthCheckView
 
 router = DefaultRouter()
@@ -23,6 +26,12 @@ urlpatterns = [
     path("auth/sync/", AuthSyncView.as_view(), name="auth-sync"),
     path("auth/me/", ProfileViewSet.as_view({"get": "me"}), name="auth-me"),
     path("savings/suggestions/", SavingSuggestionsView.as_view(), name="savings-suggestions"),
-    path("dashboard/", DashboardView.as_view(), name="dashboard"),
+    path(
+        "dashboard/",
+        (AsyncDashboardView if settings.DASHBOARD_ASYNC else DashboardView).as_view(),
+        name="dashboard",
+    ),
+    path("sync/", SyncView.as_view(), name="sync"),
+    path("batch/", BatchView.as_view(), name="batch"),
     path("health/", HealthCheckView.as_view(), name="health"),
 ]
@@ -27,9 +27,11 @@ INSTALLED_APPS = [
     "apps.budgets",
     "apps.savings",
     "apps.dashboard",
+    "apps.sync",
 ]
 
 MIDDLEWARE = [
+    "utils.instrumentation.RequestMetricsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -57,6 +59,35 @@ TEMPLATES = [
 DATABASES = {
     "default": env.db("DATABASE_URL")
 }
+# Seconds to keep connections open; lets the async dashboard's query threads
+# reuse their connections instead of reconnecting per request
+DATABASES["default"]["CONN_MAX_AGE"] = env.int("DB_CONN_MAX_AGE", default=0)
+
+# Serve /dashboard/ from AsyncDashboardView (concurrent queries; run under ASGI)
+DASHBOARD_ASYNC = env.bool("DASHBOARD_ASYNC", default=False)
+# Build the dashboard with the dashboard_payload() SQL function (one round trip);
+# enable once that function from supabase/schema.sql is deployed
+DASHBOARD_PAYLOAD_SQL = env.bool("DASHBOARD_PAYLOAD_SQL", default=False)
+# Serve transaction/account/budget lists from values_list() rows (utils.rows)
+# instead of model instances and ModelSerializer
+FAST_LIST_READS = env.bool("FAST_LIST_READS", default=True)
+# Threads (and so database connections) for running POST /batch/ items
+BATCH_MAX_WORKERS = env.int("BATCH_MAX_WORKERS", default=4)
+# Days deleted rows are reported to GET /sync/; clients with an older cursor
+# get a full resync (purge_sync_tombstones removes older tombstones)
+SYNC_TOMBSTONE_RETENTION_DAYS = env.int("SYNC_TOMBSTONE_RETENTION_DAYS", default=90)
+# Users whose category/account metadata each process keeps (utils.metadata),
+# and the seconds an entry lives before it is reloaded regardless of version
+METADATA_CACHE_SIZE = env.int("METADATA_CACHE_SIZE", default=1024)
+METADATA_CACHE_TTL = env.int("METADATA_CACHE_TTL", default=60)
+# Seconds a POST response is kept for replay to retries with its Idempotency-Key
+IDEMPOTENCY_KEY_TTL = env.int("IDEMPOTENCY_KEY_TTL", default=24 * 60 * 60)
+
+# Cache — local memory by default; use a shared backend such as
+# filecache:///var/tmp/finance-cache when running more than one worker
+CACHES = {
+    "default": env.cache("CACHE_URL", default="locmemcache://")
+}
 
 # Internationalization
 LANGUAGE_CODE = "en-us"
@@ -84,6 +115,29 @@ REST_FRAMEWORK = {
     "UNAUTHENTICATED_USER": None,
 }
 
+# Request metrics — share of requests that get a Server-Timing header and
+# slow-query logging (0 disables), and the slow-query threshold
+REQUEST_METRICS_SAMPLE_RATE = env.float("REQUEST_METRICS_SAMPLE_RATE", default=1.0)
+SLOW_QUERY_MS = env.float("SLOW_QUERY_MS", default=200)
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "json": {"()": "utils.instrumentation.JSONLogFormatter"},
+    },
+    "handlers": {
+        "slow_query": {"class": "logging.StreamHandler", "formatter": "json"},
+    },
+    "loggers": {
+        "finance.slow_query": {
+            "handlers": ["slow_query"],
+            "level": "WARNING",
+            "propagate": False,
+        },
+    },
+}
+
 # Supabase
 SUPABASE_URL = env("SUPABASE_URL")
 SUPABASE_JWT_SECRET = env("SUPABASE_JWT_SECRET")
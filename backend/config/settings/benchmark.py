@@ -0,0 +1,37 @@
+"""Benchmark settings — a local database filled by benchmarks.datagen.
+
+SQLite file by default; set BENCHMARK_DATABASE_URL to a local Postgres to
+benchmark against supabase/schema.sql with its triggers and functions.
+"""
+import os
+
+for name, default in [
+    ("SECRET_KEY", "benchmark"),
+    ("SUPABASE_URL", "http://localhost"),
+    ("SUPABASE_JWT_SECRET", "benchmark-secret-key-32-chars-minimum"),
+    ("DATABASE_URL", "sqlite:///:memory:"),
+]:
+    os.environ.setdefault(name, default)
+
+from .base import *  # noqa: E402, F401, F403
+
+DEBUG = False
+ALLOWED_HOSTS = ["testserver"]
+
+DATABASES = {
+    "default": env.db(  # noqa: F405
+        "BENCHMARK_DATABASE_URL",
+        default=f"sqlite:///{BASE_DIR / 'benchmarks' / 'benchmark.sqlite3'}",  # noqa: F405
+    )
+}
+if DATABASES["default"]["ENGINE"].endswith("sqlite3"):
+    DATABASES["default"]["OPTIONS"] = {"timeout": 30}
+
+# Measure the database path, not cache hits, unless a cache is configured
+CACHES = {
+    "default": env.cache("BENCHMARK_CACHE_URL", default="dummycache://")  # noqa: F405
+}
+
+# Every request reports its query count through Server-Timing
+REQUEST_METRICS_SAMPLE_RATE = 1.0
+SLOW_QUERY_MS = 10_000
@@ -1,6 +1,7 @@
 """Production settings."""
 from .base import *  # noqa: F401, F403
 import environ
+from django.core.exceptions import ImproperlyConfigured
 
 env = environ.Env()
 
@@ -11,7 +12,25 @@ SECURE_SSL_REDIRECT = True
 SESSION_COOKIE_SECURE = True
 CSRF_COOKIE_SECURE = True
 
-# JSON-only in production
+# JSON-only in production, encoded with orjson (same bytes as JSONRenderer)
 REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] = [  # noqa: F405
-    "rest_framework.renderers.JSONRenderer",
+    "utils.renderers.ORJSONRenderer",
 ]
+
+# Time one request in ten
+REQUEST_METRICS_SAMPLE_RATE = env.float("REQUEST_METRICS_SAMPLE_RATE", default=0.1)
+
+# Cache versions (utils.cache) must be visible to every gunicorn worker, or a
+# write on one leaves the others serving cached dashboards and 304s
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+if (
+    env.int("WEB_CONCURRENCY", default=1) > 1
+    and CACHES["default"]["BACKEND"] in PROCESS_LOCAL_CACHES  # noqa: F405
+):
+    raise ImproperlyConfigured(
+        "WEB_CONCURRENCY > 1 needs a CACHE_URL shared by all workers "
+        "(e.g. filecache:///var/tmp/finance-cache on one host)."
+    )
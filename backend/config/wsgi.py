@@ -4,3 +4,8 @@ from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.production")
 application = get_wsgi_application()
+
+# Warm the JWKS in this worker so no request waits on the endpoint
+from utils.supabase_auth import start_jwks_refresh  # noqa: E402
+
+start_jwks_refresh()
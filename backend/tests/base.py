@@ -0,0 +1,62 @@
+"""Shared setup for tests against the application schema and API."""
+from django.db import connection
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from benchmarks.datagen import generate
+from benchmarks.schema import create_schema, drop_schema
+from tests.test_auth import make_token, FAKE_SECRET
+
+
+class SchemaTestCase(TestCase):
+    """
+    TestCase on the application tables. Every model is unmanaged, so the
+    test runner creates none; benchmarks.schema builds them before the
+    class and drops them after it.
+
+    With `dataset` set to benchmarks.datagen.generate() arguments, the
+    generated users are `users`, the first is `user` and the second, if
+    any, `other`.
+    """
+
+    dataset = None
+
+    @classmethod
+    def setUpClass(cls):
+        create_schema(connection)
+        try:
+            super().setUpClass()
+        except Exception:
+            drop_schema(connection)
+            raise
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        drop_schema(connection)
+
+    @classmethod
+    def setUpTestData(cls):
+        if cls.dataset is None:
+            return
+        cls.users = generate(**cls.dataset)
+        cls.user = cls.users[0]
+        cls.other = cls.users[1] if len(cls.users) > 1 else None
+
+
+class AuthenticatedClientMixin:
+    """self.client signed in as self.user with a token for FAKE_SECRET."""
+
+    def setUp(self):
+        super().setUp()
+        secret = override_settings(SUPABASE_JWT_SECRET=FAKE_SECRET)
+        secret.enable()
+        self.addCleanup(secret.disable)
+        self.client = self.client_for(self.user)
+
+    @staticmethod
+    def client_for(user) -> APIClient:
+        token, _ = make_token(sub=str(user.id), email=user.email)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        return client
@@ -0,0 +1,73 @@
+"""Local stub of Supabase's JWKS endpoint for ES256 authentication tests."""
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import ec
+from jwt.algorithms import ECAlgorithm
+
+JWKS_PATH = "/auth/v1/.well-known/jwks.json"
+
+
+class StubJWKSServer:
+    """
+    Serves one generated P-256 public key on 127.0.0.1 and counts fetches.
+
+        with StubJWKSServer() as stub:
+            token = stub.make_token()
+            with override_settings(SUPABASE_URL=stub.url): ...
+    """
+
+    def __init__(self):
+        self.kid = uuid.uuid4().hex
+        self.private_key = ec.generate_private_key(ec.SECP256R1())
+        jwk = ECAlgorithm.to_jwk(self.private_key.public_key(), as_dict=True)
+        jwk.update({"kid": self.kid, "alg": "ES256", "use": "sig"})
+        self.body = json.dumps({"keys": [jwk]}).encode()
+        self.fetch_count = 0
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != JWKS_PATH:
+                    self.send_error(404)
+                    return
+                stub.fetch_count += 1
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(stub.body)))
+                self.end_headers()
+                self.wfile.write(stub.body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def make_token(self, sub=None, expires_in=3600):
+        now = int(time.time())
+        payload = {
+            "sub": sub or str(uuid.uuid4()),
+            "email": "es256@example.com",
+            "role": "authenticated",
+            "aud": "authenticated",
+            "iat": now,
+            "exp": now + expires_in,
+        }
+        return jwt.encode(
+            payload, self.private_key, algorithm="ES256", headers={"kid": self.kid}
+        )
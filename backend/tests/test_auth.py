@@ -6,6 +6,15 @@ import jwt
 from django.test import TestCase, override_settings
 from rest_framework.test import APIClient
 
+from utils.supabase_auth import (
+    TOKEN_CACHE_SIZE,
+    VerifiedTokenCache,
+    start_jwks_refresh,
+    stop_jwks_refresh,
+    token_cache_stats,
+)
+from tests.jwks_stub import StubJWKSServer
+
 
 FAKE_SECRET = "test-secret-key-32-chars-minimum-here"
 
@@ -69,3 +78,75 @@ class SupabaseJWTAuthTest(TestCase):
         response = self.client.get("/api/v1/health/")
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data["status"], "ok")
+
+
+class VerifiedTokenCacheTest(TestCase):
+    def test_hit_until_expiry(self):
+        cache = VerifiedTokenCache(maxsize=10)
+        cache.set("live", {"sub": "a", "exp": time.time() + 60})
+        cache.set("stale", {"sub": "b", "exp": time.time() - 1})
+        self.assertEqual(cache.get("live")["sub"], "a")
+        self.assertIsNone(cache.get("stale"))
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_tokens_without_exp_are_not_cached(self):
+        cache = VerifiedTokenCache(maxsize=10)
+        cache.set("forever", {"sub": "a"})
+        self.assertIsNone(cache.get("forever"))
+
+    def test_bounded_lru(self):
+        cache = VerifiedTokenCache(maxsize=2)
+        exp = time.time() + 60
+        cache.set("a", {"exp": exp})
+        cache.set("b", {"exp": exp})
+        cache.get("a")  # a becomes most recently used
+        cache.set("c", {"exp": exp})
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertEqual(cache.stats()["size"], 2)
+
+
+class ES256JWKSTest(TestCase):
+    def setUp(self):
+        self.stub = StubJWKSServer().__enter__()
+        self.addCleanup(self.stub.__exit__, None, None, None)
+        self.addCleanup(stop_jwks_refresh)
+        self.client = APIClient()
+
+    def _get_health_as(self, token):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        return self.client.get("/api/v1/health/")
+
+    def test_es256_token_verified_once_then_cached(self):
+        token = self.stub.make_token()
+        before = token_cache_stats()
+        with override_settings(SUPABASE_URL=self.stub.url):
+            self.assertEqual(self._get_health_as(token).status_code, 200)
+            self.assertEqual(self._get_health_as(token).status_code, 200)
+        after = token_cache_stats()
+        self.assertEqual(self.stub.fetch_count, 1)
+        self.assertEqual(after["hits"] - before["hits"], 1)
+
+    def test_health_reports_token_cache_counters(self):
+        token = self.stub.make_token()
+        with override_settings(SUPABASE_URL=self.stub.url):
+            first = self._get_health_as(token).data["token_cache"]
+            second = self._get_health_as(token).data["token_cache"]
+        self.assertEqual(second["hits"] - first["hits"], 1)
+        self.assertEqual(second["misses"], first["misses"])
+        self.assertEqual(second["maxsize"], TOKEN_CACHE_SIZE)
+
+    def test_prefetch_means_requests_never_fetch(self):
+        refresher = start_jwks_refresh(self.stub.url, interval=60)
+        for _ in range(50):
+            if self.stub.fetch_count:
+                break
+            time.sleep(0.02)
+        self.assertIsNotNone(refresher)
+        self.assertEqual(self.stub.fetch_count, 1)
+
+        with override_settings(SUPABASE_URL=self.stub.url):
+            response = self._get_health_as(self.stub.make_token())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.stub.fetch_count, 1)
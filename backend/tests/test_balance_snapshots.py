@@ -0,0 +1,212 @@
+"""Tests for daily balance snapshots, balance history and net worth."""
+import unittest
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import connection
+
+from apps.accounts import snapshots
+from apps.accounts.models import Account, BalanceSnapshot
+from apps.transactions.models import Transaction
+from benchmarks.datagen import generate
+from tests.base import AuthenticatedClientMixin, SchemaTestCase
+
+ACCOUNTS_URL = "/api/v1/accounts/"
+
+
+def replay(account, day: date) -> Decimal:
+    """The account's balance at the end of `day`, from every transaction."""
+    balance = account.initial_balance
+    for tx in Transaction.objects.filter(transaction_date__lte=day):
+        if tx.account_id == account.id:
+            balance += tx.amount if tx.type == "income" else -tx.amount
+        if tx.type == "transfer" and tx.transfer_to_account_id == account.id:
+            balance += tx.amount
+    return balance
+
+
+def stored():
+    rows = BalanceSnapshot.objects.values_list("account_id", "snapshot_date", "balance")
+    return {(account_id, day): balance for account_id, day, balance in rows}
+
+
+class BalanceSnapshotTest(AuthenticatedClientMixin, SchemaTestCase):
+    dataset = dict(users=1, transactions=300, months=4, seed=18)
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.account = Account.objects.filter(user_id=cls.user.id, type="bank")[0]
+
+    def get(self, path, params=None):
+        response = self.client.get(path, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_latest_snapshot_is_the_current_balance(self):
+        for account in Account.objects.filter(user_id=self.user.id):
+            latest = (
+                BalanceSnapshot.objects.filter(account_id=account.id)
+                .order_by("-snapshot_date")
+                .first()
+            )
+            if latest:
+                self.assertEqual(latest.balance, account.current_balance, account.name)
+
+    def test_rebuild_repairs_drift(self):
+        self.assertEqual(
+            snapshots.rebuild_snapshots(self.user.id),
+            {"created": 0, "updated": 0, "deleted": 0},
+        )
+        expected = stored()
+        first, second = BalanceSnapshot.objects.filter(account_id=self.account.id)[:2]
+        BalanceSnapshot.objects.filter(id=first.id).update(balance=Decimal("1"))
+        second.delete()
+        BalanceSnapshot.objects.create(
+            user_id=self.user.id,
+            account_id=self.account.id,
+            snapshot_date=date(1999, 1, 1),
+            balance=Decimal("5"),
+        )
+        self.assertEqual(
+            snapshots.rebuild_snapshots(self.user.id, dry_run=True),
+            {"created": 1, "updated": 1, "deleted": 1},
+        )
+        snapshots.rebuild_snapshots(self.user.id)
+        self.assertEqual(stored(), expected)
+
+    def test_balance_history_forward_fills_each_day(self):
+        end = date.today()
+        start = end - timedelta(days=59)
+        url = f"{ACCOUNTS_URL}{self.account.id}/balance_history/"
+        with self.assertNumQueries(2):
+            payload = self.get(url, {"from": start.isoformat(), "to": end.isoformat()})
+        self.assertEqual(len(payload["dates"]), 60)
+        self.assertEqual(payload["dates"][0], start.isoformat())
+        for i in (0, 1, 29, 59):
+            day = start + timedelta(days=i)
+            self.assertEqual(
+                payload["balances"][i], float(replay(self.account, day)), day
+            )
+
+    def test_history_before_any_activity_is_the_initial_balance(self):
+        payload = self.get(
+            f"{ACCOUNTS_URL}{self.account.id}/balance_history/",
+            {"from": "2000-01-01", "to": "2000-01-10"},
+        )
+        self.assertEqual(
+            set(payload["balances"]), {float(self.account.initial_balance)}
+        )
+
+    def test_net_worth(self):
+        with self.assertNumQueries(2):
+            payload = self.get(f"{ACCOUNTS_URL}net_worth/")
+        self.assertEqual(len(payload["dates"]), snapshots.DEFAULT_HISTORY_DAYS)
+        accounts = Account.objects.filter(user_id=self.user.id, is_active=True)
+        balances = [replay(account, date.today()) for account in accounts]
+        self.assertAlmostEqual(
+            payload["net_worth"][-1], float(sum(balances)), places=2
+        )
+        self.assertAlmostEqual(
+            payload["liabilities"][-1],
+            float(-sum(b for b in balances if b < 0)),
+            places=2,
+        )
+        for assets, liabilities, net in zip(
+            payload["assets"], payload["liabilities"], payload["net_worth"]
+        ):
+            self.assertAlmostEqual(assets - liabilities, net, places=2)
+
+    def test_invalid_windows(self):
+        url = f"{ACCOUNTS_URL}{self.account.id}/balance_history/"
+        for params in (
+            {"from": "2026-02-01", "to": "2026-01-01"},
+            {"from": "2000-01-01", "to": "2026-01-01"},
+            {"from": "yesterday"},
+        ):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get(url, params).status_code, 400)
+
+    def test_default_window_stops_at_the_first_date(self):
+        for path in (f"{self.account.id}/balance_history/", "net_worth/"):
+            with self.subTest(path=path):
+                payload = self.get(f"{ACCOUNTS_URL}{path}", {"to": "0001-01-05"})
+                self.assertEqual(payload["from"], "0001-01-01")
+                self.assertEqual(len(payload["dates"]), 5)
+
+    def test_other_users_account(self):
+        (other,) = generate(users=1, transactions=10, months=1, seed=19)
+        account = Account.objects.filter(user_id=other.id)[0]
+        response = self.client.get(f"{ACCOUNTS_URL}{account.id}/balance_history/")
+        self.assertEqual(response.status_code, 404)
+
+
+@unittest.skipUnless(
+    connection.vendor == "postgresql", "snapshot triggers are PostgreSQL-only"
+)
+class SnapshotTriggerTest(SchemaTestCase):
+    """The triggers must leave exactly what a rebuild from the ledger would."""
+
+    dataset = dict(users=1, transactions=200, months=3, seed=20)
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.bank, cls.other = Account.objects.filter(
+            user_id=cls.user.id, type="bank"
+        ).order_by("created_at")[:2]
+
+    def assertMatchesLedger(self):
+        expected = {
+            key: balance
+            for key, (_, balance) in snapshots.compute_snapshots(self.user.id).items()
+        }
+        actual = stored()
+        # Rows are never deleted: a day whose activity moved away or was
+        # deleted keeps its row, which must carry the previous day's balance
+        for account_id, day in set(actual) - set(expected):
+            earlier = [d for a, d in expected if a == account_id and d < day]
+            previous = (
+                expected[account_id, max(earlier)]
+                if earlier
+                else Account.objects.get(id=account_id).initial_balance
+            )
+            self.assertEqual(actual.pop((account_id, day)), previous)
+        self.assertEqual(actual, expected)
+
+    def test_backdated_writes_roll_forward(self):
+        old = date.today() - timedelta(days=75)
+        tx = Transaction.objects.create(
+            user_id=self.user.id,
+            account_id=self.bank.id,
+            type="expense",
+            amount=Decimal("123.45"),
+            transaction_date=old,
+        )
+        self.assertMatchesLedger()
+        Transaction.objects.filter(id=tx.id).update(
+            transaction_date=old - timedelta(days=10), amount=Decimal("50")
+        )
+        self.assertMatchesLedger()
+        Transaction.objects.create(
+            user_id=self.user.id,
+            account_id=self.bank.id,
+            type="transfer",
+            amount=Decimal("80"),
+            transaction_date=old,
+            transfer_to_account_id=self.other.id,
+        )
+        self.assertMatchesLedger()
+        Transaction.objects.filter(id=tx.id).delete()
+        self.assertMatchesLedger()
+
+    def test_helper_is_not_callable_by_api_roles(self):
+        with connection.cursor() as cursor:
+            for role in ("anon", "authenticated"):
+                cursor.execute(
+                    "SELECT has_function_privilege(%s, "
+                    "'public.apply_balance_snapshots(uuid[], date[], numeric[])', "
+                    "'EXECUTE')",
+                    [role],
+                )
+                self.assertFalse(cursor.fetchone()[0], role)
@@ -0,0 +1,136 @@
+"""Tests for the batched GET endpoint."""
+import threading
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import connections
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from benchmarks.datagen import generate
+from benchmarks.run import MOBILE_HOME_PATHS
+from tests.base import AuthenticatedClientMixin, SchemaTestCase
+from utils import batch
+from utils.supabase_auth import SupabaseJWTAuthentication
+
+BATCH_URL = "/api/v1/batch/"
+
+
+class BatchViewTest(AuthenticatedClientMixin, SchemaTestCase):
+    dataset = dict(users=1, transactions=120, months=2, seed=5)
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def batch(self, paths):
+        response = self.client.post(BATCH_URL, {"paths": paths}, format="json")
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()["responses"]
+
+    def test_items_match_individual_requests(self):
+        paths = list(MOBILE_HOME_PATHS) + ["transactions/?page_size=5&type=expense"]
+        items = self.batch(paths)
+        self.assertEqual([item["path"] for item in items], paths)
+        for item in items:
+            with self.subTest(path=item["path"]):
+                cache.clear()
+                direct = self.client.get("/api/v1/" + item["path"])
+                self.assertEqual(item["status"], direct.status_code)
+                self.assertEqual(item["body"], direct.json())
+
+    def test_authenticates_once(self):
+        with patch.object(
+            SupabaseJWTAuthentication,
+            "authenticate",
+            autospec=True,
+            side_effect=SupabaseJWTAuthentication.authenticate,
+        ) as authenticate:
+            items = self.batch(["accounts/", "categories/", "savings/plans/"])
+        self.assertEqual(authenticate.call_count, 1)
+        self.assertEqual([item["status"] for item in items], [200, 200, 200])
+
+    def test_per_item_errors(self):
+        items = self.batch(
+            [
+                "no-such-route/",
+                "https://example.com/api/v1/accounts/",
+                "batch/",
+                "transactions/export/?format=csv",
+                "transactions/?period=bogus",
+                "accounts/",
+            ]
+        )
+        self.assertEqual(
+            [item["status"] for item in items], [404, 400, 400, 400, 400, 200]
+        )
+        self.assertIn("period", items[4]["body"])
+
+    def test_other_users_rows_are_not_visible(self):
+        (other,) = generate(users=1, transactions=10, months=1, seed=6)
+        item = self.batch([f"accounts/{other.account_ids[0]}/"])[0]
+        self.assertEqual(item["status"], 404)
+
+    def test_rejects_bad_bodies(self):
+        for body in ({}, {"paths": "accounts/"}, {"paths": [1]}):
+            with self.subTest(body=body):
+                response = self.client.post(BATCH_URL, body, format="json")
+                self.assertEqual(response.status_code, 400)
+        response = self.client.post(
+            BATCH_URL,
+            {"paths": ["accounts/"] * (batch.BATCH_MAX_REQUESTS + 1)},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_requires_authentication(self):
+        response = APIClient().post(BATCH_URL, {"paths": ["accounts/"]}, format="json")
+        self.assertEqual(response.status_code, 401)
+
+
+class RunTasksTest(TestCase):
+    def test_concurrent_tasks_overlap(self):
+        # Each task waits for all of them to start; run in order the barrier
+        # would time out and raise BrokenBarrierError
+        count = min(batch._batch_executor._max_workers, 4)
+        barrier = threading.Barrier(count, timeout=5)
+
+        def task(n):
+            def run():
+                barrier.wait()
+                return n
+
+            return run
+
+        results = batch.run_tasks([task(n) for n in range(count)], concurrent=True)
+        self.assertEqual(results, list(range(count)))
+
+    def test_sequential_tasks_run_on_the_request_thread(self):
+        threads = []
+
+        def task():
+            threads.append(threading.current_thread())
+            return len(threads)
+
+        self.assertEqual(batch.run_tasks([task, task], concurrent=False), [1, 2])
+        self.assertEqual(threads, [threading.current_thread()] * 2)
+
+    def test_pool_threads_release_their_connections(self):
+        used = []
+
+        def task():
+            wrapper = connections["default"]
+            wrapper.ensure_connection()
+            used.append(wrapper)
+
+        # SQLite ignores close() on the in-memory test database
+        with patch.object(
+            type(connections["default"]),
+            "is_in_memory_db",
+            lambda self: False,
+            create=True,
+        ):
+            batch.run_tasks([task] * 4, concurrent=True)
+        self.assertEqual(len(used), 4)
+        for wrapper in used:
+            self.assertIsNone(wrapper.connection)
@@ -0,0 +1,97 @@
+"""Tests for the benchmark schema builder, data generator and comparison."""
+import unittest
+
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from apps.accounts import ledger
+from apps.accounts.models import Account
+from apps.budgets.models import BudgetPlan
+from apps.transactions import rollups
+from apps.transactions.models import Transaction
+from benchmarks.run import (
+    compare,
+    endpoints,
+    make_clients,
+    percentile,
+    run_endpoint,
+)
+from tests.base import SchemaTestCase
+from tests.test_auth import FAKE_SECRET
+
+
+class DataGeneratorTest(SchemaTestCase):
+    dataset = dict(users=2, transactions=300, months=3, seed=7)
+
+    def test_volume(self):
+        for user in self.users:
+            self.assertEqual(user.transaction_count, 300)
+            self.assertEqual(Transaction.objects.filter(user_id=user.id).count(), 300)
+        self.assertEqual(BudgetPlan.objects.filter(user_id=self.users[0].id).count(), 27)
+
+    def test_balances_and_rollups_consistent(self):
+        self.assertEqual(ledger.find_drift(), [])
+        self.assertEqual(rollups.rebuild_rollups(dry_run=True), {
+            "created": 0, "updated": 0, "deleted": 0,
+        })
+
+    def test_mix(self):
+        user_id = self.users[0].id
+        types = set(Transaction.objects.filter(user_id=user_id).values_list("type", flat=True))
+        self.assertEqual(types, {"income", "expense", "transfer"})
+        self.assertEqual(
+            Account.objects.filter(user_id=user_id, type=Account.TYPE_CREDIT_CARD).count(), 2
+        )
+
+
+@unittest.skipUnless(
+    connection.vendor == "postgresql", "rollup triggers are PostgreSQL-only"
+)
+class RollupHelperTest(SchemaTestCase):
+    def test_helper_is_not_callable_by_api_roles(self):
+        with connection.cursor() as cursor:
+            for role in ("anon", "authenticated"):
+                cursor.execute(
+                    "SELECT has_function_privilege(%s, 'public.apply_monthly_rollup("
+                    "uuid, date, uuid, text, numeric, integer)', 'EXECUTE')",
+                    [role],
+                )
+                self.assertFalse(cursor.fetchone()[0], role)
+
+
+class CompareTest(TestCase):
+    BASE = {"p95_ms": 10.0, "queries": 3, "errors": 0}
+
+    def test_query_count_increase_is_regression(self):
+        regressions = compare({"x": {**self.BASE, "queries": 4}}, {"x": self.BASE})
+        self.assertEqual(regressions, ["x: 4 queries (baseline 3)"])
+
+    def test_small_latency_noise_tolerated(self):
+        self.assertEqual(compare({"x": {**self.BASE, "p95_ms": 14.0}}, {"x": self.BASE}), [])
+        self.assertEqual(len(compare({"x": {**self.BASE, "p95_ms": 40.0}}, {"x": self.BASE})), 1)
+
+    def test_endpoint_missing_from_baseline_is_reported(self):
+        regressions = compare({"x": self.BASE, "y": self.BASE}, {"x": self.BASE})
+        self.assertEqual(
+            regressions, ["y: not in the baseline, rerun with --save-baseline"]
+        )
+
+    def test_percentile_interpolates(self):
+        self.assertEqual(percentile([1, 2, 3, 4, 5], 50), 3)
+        self.assertAlmostEqual(percentile([0, 10], 95), 9.5)
+
+
+@override_settings(SUPABASE_JWT_SECRET=FAKE_SECRET)
+class RunEndpointTest(SchemaTestCase):
+    dataset = dict(users=1, transactions=100, months=2, seed=8)
+
+    def test_writes_are_rolled_back(self):
+        names = [spec.name for spec in endpoints(self.users[0])]
+        before = Transaction.objects.count()
+        for name in ("transaction-create", "transaction-bulk", "transaction-import-file"):
+            with self.subTest(name=name):
+                _, stats = run_endpoint(
+                    names.index(name), make_clients(self.users), self.users, 3, 1
+                )
+                self.assertEqual(stats["errors"], 0)
+                self.assertEqual(Transaction.objects.count(), before)
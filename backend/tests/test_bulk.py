@@ -0,0 +1,184 @@
+"""Tests for the bulk write endpoints and owned-reference validation."""
+import uuid
+from datetime import date
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.budgets.models import BudgetPlan
+from apps.categories.models import Category
+from apps.transactions.models import Transaction
+from apps.transactions.views import TransactionViewSet
+from tests.base import AuthenticatedClientMixin, SchemaTestCase
+
+BULK_URL = "/api/v1/transactions/bulk/"
+
+
+class BulkWriteTest(AuthenticatedClientMixin, SchemaTestCase):
+    dataset = dict(users=2, transactions=30, months=1, seed=9)
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.category = Category.objects.filter(user_id=cls.user.id, type="expense")[0]
+
+    def tx_data(self, **overrides):
+        return {
+            "account_id": str(self.user.account_ids[0]),
+            "category_id": str(self.category.id),
+            "type": "expense",
+            "amount": "12.50",
+            "description": "Offline",
+            "transaction_date": date.today().isoformat(),
+            **overrides,
+        }
+
+    def create_op(self, **overrides):
+        data = self.tx_data(**overrides)
+        return {"op": "create", "id": str(uuid.uuid4()), "data": data}
+
+    def bulk(self, operations, url=BULK_URL):
+        return self.client.post(url, {"operations": operations}, format="json")
+
+    def test_applies_operations_in_order(self):
+        first, second = self.create_op(), self.create_op(description="Second")
+        existing = Transaction.objects.filter(user_id=self.user.id, type="expense")[0]
+        response = self.bulk(
+            [
+                first,
+                {"op": "update", "id": first["id"], "data": {"description": "Edited"}},
+                second,
+                {"op": "delete", "id": str(existing.id)},
+            ]
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        results = response.json()["results"]
+        self.assertEqual([r["status"] for r in results], [201, 200, 201, 204])
+        self.assertEqual(results[0]["data"]["id"], first["id"])
+        self.assertEqual(results[1]["data"]["description"], "Edited")
+        self.assertEqual(Transaction.objects.get(id=first["id"]).description, "Edited")
+        self.assertTrue(Transaction.objects.filter(id=second["id"]).exists())
+        self.assertFalse(Transaction.objects.filter(id=existing.id).exists())
+
+    def test_any_failure_rolls_back_everything(self):
+        create = self.create_op()
+        response = self.bulk(
+            [
+                create,
+                {"op": "delete", "id": str(uuid.uuid4())},
+                self.create_op(amount="-1"),
+            ]
+        )
+        self.assertEqual(response.status_code, 400)
+        results = response.json()["results"]
+        self.assertEqual([r["status"] for r in results], [424, 404, 400])
+        self.assertNotIn("data", results[0])
+        self.assertIn("amount", results[2]["errors"])
+        self.assertFalse(Transaction.objects.filter(id=create["id"]).exists())
+
+    def test_rejects_other_users_references(self):
+        foreign = str(self.other.account_ids[0])
+        response = self.bulk([self.create_op(account_id=foreign)])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("account_id", response.json()["results"][0]["errors"])
+
+        for data in (
+            self.tx_data(account_id=foreign),
+            self.tx_data(type="transfer", transfer_to_account_id=foreign),
+        ):
+            with self.subTest(data=data):
+                response = self.client.post(
+                    "/api/v1/transactions/", data, format="json"
+                )
+                self.assertEqual(response.status_code, 400)
+
+    def test_create_with_existing_id_conflicts(self):
+        theirs = Transaction.objects.filter(user_id=self.other.id)[0]
+        op = {"op": "create", "id": str(theirs.id), "data": self.tx_data()}
+        response = self.bulk([op])
+        self.assertEqual(response.json()["results"][0]["status"], 409)
+        theirs.refresh_from_db()
+        self.assertEqual(theirs.user_id, self.other.id)
+
+    def test_other_users_rows_are_not_found(self):
+        theirs = Transaction.objects.filter(user_id=self.other.id)[0]
+        response = self.bulk([{"op": "delete", "id": str(theirs.id)}])
+        self.assertEqual(response.json()["results"][0]["status"], 404)
+        self.assertTrue(Transaction.objects.filter(id=theirs.id).exists())
+
+    def test_lookups_do_not_grow_with_the_batch(self):
+        def selects(count):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.bulk([self.create_op() for _ in range(count)])
+            self.assertEqual(response.status_code, 200, response.content)
+            return [q for q in ctx.captured_queries if q["sql"].startswith("SELECT")]
+
+        self.assertEqual(len(selects(2)), len(selects(25)))
+
+    def test_partial_update_keeps_amount(self):
+        tx = Transaction.objects.filter(user_id=self.user.id, type="expense")[0]
+        op = {"op": "update", "id": str(tx.id), "data": {"notes": "Synced"}}
+        response = self.bulk([op])
+        self.assertEqual(response.status_code, 200, response.content)
+
+    def test_other_resources(self):
+        category_id = str(uuid.uuid4())
+        response = self.bulk(
+            [
+                {
+                    "op": "create",
+                    "id": category_id,
+                    "data": {"name": "Pets", "type": "expense"},
+                }
+            ],
+            url="/api/v1/categories/bulk/",
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(Category.objects.get(id=category_id).user_id, self.user.id)
+
+        budget = {"category_id": category_id, "month": 1, "year": 2030}
+        response = self.bulk(
+            [{"op": "create", "id": str(uuid.uuid4()), "data": budget}],
+            url="/api/v1/budgets/bulk/",
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+
+    def test_constraint_violation_conflicts(self):
+        category = Category.objects.filter(user_id=self.user.id, type="expense")[1]
+        budget = {"category_id": str(category.id), "month": 2, "year": 2031}
+        ops = [
+            {"op": "create", "id": str(uuid.uuid4()), "data": budget},
+            {"op": "create", "id": str(uuid.uuid4()), "data": budget},
+            {"op": "create", "id": str(uuid.uuid4()), "data": {**budget, "month": 3}},
+        ]
+        response = self.bulk(ops, url="/api/v1/budgets/bulk/")
+        self.assertEqual(response.status_code, 400)
+        results = response.json()["results"]
+        self.assertEqual([r["status"] for r in results], [424, 409, 424])
+        self.assertEqual(results[1]["id"], ops[1]["id"])
+        self.assertFalse(BudgetPlan.objects.filter(year=2031).exists())
+
+    def test_rejects_bad_bodies(self):
+        for body in ({}, {"operations": {}}, {"operations": [1]}):
+            with self.subTest(body=body):
+                response = self.client.post(BULK_URL, body, format="json")
+                self.assertEqual(response.status_code, 400)
+        response = self.bulk(
+            [{"op": "delete", "id": str(uuid.uuid4())}]
+            * (TransactionViewSet.bulk_max_operations + 1)
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("operations", response.json())
+
+    def test_per_operation_shape_errors(self):
+        results = self.bulk(
+            [{"op": "upsert", "id": str(uuid.uuid4())}, {"op": "delete", "id": "nope"}]
+        ).json()["results"]
+        self.assertEqual([r["status"] for r in results], [400, 400])
+        self.assertIn("op", results[0]["errors"])
+        self.assertIn("id", results[1]["errors"])
+
+    def test_requires_authentication(self):
+        response = APIClient().post(BULK_URL, {"operations": []}, format="json")
+        self.assertEqual(response.status_code, 401)
@@ -0,0 +1,342 @@
+"""Tests for the dashboard response cache, ETags and async view."""
+import importlib
+import json
+import os
+import sys
+import threading
+import unittest
+import uuid
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import patch
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, connections
+from django.test import RequestFactory, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.dashboard import payload as dashboard_payload
+from apps.dashboard.views import AsyncDashboardView, build_payload_async
+from tests.base import SchemaTestCase
+from utils.cache import bump_version, get_version
+from tests.test_auth import make_token, FAKE_SECRET
+
+PAYLOAD = {"consolidated_balance": 100.0, "credit_cards": []}
+
+
+@override_settings(SUPABASE_JWT_SECRET=FAKE_SECRET)
+class DashboardCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        token, self.user_id = make_token()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_payload_built_once_per_version(self):
+        with patch(
+            "apps.dashboard.views.DashboardView.build_payload", return_value=PAYLOAD
+        ) as build:
+            first = self.client.get("/api/v1/dashboard/")
+            second = self.client.get("/api/v1/dashboard/")
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.json(), PAYLOAD)
+        self.assertEqual(build.call_count, 1)
+
+    def test_matching_etag_returns_304_without_building(self):
+        with patch(
+            "apps.dashboard.views.DashboardView.build_payload", return_value=PAYLOAD
+        ) as build:
+            etag = self.client.get("/api/v1/dashboard/")["ETag"]
+            response = self.client.get("/api/v1/dashboard/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(build.call_count, 1)
+
+    def test_version_bump_invalidates(self):
+        with patch(
+            "apps.dashboard.views.DashboardView.build_payload", return_value=PAYLOAD
+        ) as build:
+            etag = self.client.get("/api/v1/dashboard/")["ETag"]
+            bump_version("dashboard", self.user_id)
+            response = self.client.get("/api/v1/dashboard/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(build.call_count, 2)
+
+    def test_sql_payload_setting_uses_database_function(self):
+        with override_settings(DASHBOARD_PAYLOAD_SQL=True), patch(
+            "apps.dashboard.payload.fetch_payload_sql", return_value=PAYLOAD
+        ) as fetch, patch("apps.dashboard.payload.build_payload") as build:
+            response = self.client.get("/api/v1/dashboard/")
+        self.assertEqual(response.json(), PAYLOAD)
+        fetch.assert_called_once()
+        build.assert_not_called()
+
+    def test_failed_write_does_not_bump(self):
+        before = get_version("dashboard", self.user_id)
+        response = self.client.post("/api/v1/transactions/", {}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(get_version("dashboard", self.user_id), before)
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+    )
+    def test_cache_that_keeps_nothing_never_revalidates(self):
+        with patch(
+            "apps.dashboard.views.DashboardView.build_payload", return_value=PAYLOAD
+        ) as build:
+            etag = self.client.get("/api/v1/dashboard/")["ETag"]
+            response = self.client.get("/api/v1/dashboard/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(build.call_count, 2)
+
+
+class ProductionCacheSettingsTest(TestCase):
+    def load(self, **environ):
+        """Execute the production settings modules afresh under `environ`."""
+        saved = {
+            name: sys.modules.pop(name, None)
+            for name in ("config.settings.base", "config.settings.production")
+        }
+        try:
+            with patch.dict(os.environ, environ):
+                return importlib.import_module("config.settings.production")
+        finally:
+            package = vars(sys.modules["config.settings"])
+            for name, module in saved.items():
+                attribute = name.rsplit(".", 1)[1]
+                sys.modules.pop(name, None)
+                package.pop(attribute, None)
+                if module is not None:
+                    sys.modules[name] = package[attribute] = module
+
+    def test_several_workers_need_a_shared_cache(self):
+        with self.assertRaises(ImproperlyConfigured):
+            self.load(WEB_CONCURRENCY="3", CACHE_URL="locmemcache://")
+
+    def test_accepted_configurations(self):
+        self.load(WEB_CONCURRENCY="1", CACHE_URL="locmemcache://")
+        settings = self.load(
+            WEB_CONCURRENCY="3", CACHE_URL="filecache:///tmp/finance-test-cache"
+        )
+        self.assertEqual(
+            settings.CACHES["default"]["BACKEND"],
+            "django.core.cache.backends.filebased.FileBasedCache",
+        )
+
+
+def _fake_results():
+    account = SimpleNamespace(
+        id="a1", name="Card", provider="Visa", type="credit_card",
+        current_balance=Decimal("-20.00"), credit_limit=Decimal("500.00"),
+        billing_date=5, due_date=25,
+    )
+    checking = SimpleNamespace(type="bank", current_balance=Decimal("120.50"))
+    tx = SimpleNamespace(
+        id="t1", type="expense", amount=Decimal("9.99"), description="Lunch",
+        transaction_date=date(2026, 1, 3), account_id="a1", category_id=None,
+    )
+    budget = SimpleNamespace(category_id="c1", planned_amount=Decimal("300"))
+    return {
+        "accounts": [account, checking],
+        "recent_transactions": [tx],
+        "monthly_totals": {"expense": Decimal("9.99")},
+        "budgets": [budget],
+        "expense_actuals": {"c1": Decimal("42")},
+        "category_names": {"c1": "Food"},
+        "card_statements": {
+            "a1": (Decimal("80"), Decimal("0"), Decimal("20"), Decimal("0"))
+        },
+    }
+
+
+def _patched_queries(results, barrier=None):
+    def make(name):
+        def query(user_id, today):
+            if barrier is not None:
+                barrier.wait()
+            return results[name]
+        return query
+    return {name: make(name) for name in dashboard_payload.QUERIES}
+
+
+class AsyncDashboardPayloadTest(TestCase):
+    def test_matches_sync_payload(self):
+        today = date(2026, 1, 15)
+        with patch.dict(dashboard_payload.QUERIES, _patched_queries(_fake_results())):
+            expected = dashboard_payload.build_payload("u1", today)
+            actual = async_to_sync(build_payload_async)("u1", today)
+        self.assertEqual(actual, expected)
+        self.assertEqual(actual["consolidated_balance"], 120.5)
+        self.assertEqual(actual["budget_overview"][0]["category_name"], "Food")
+        self.assertEqual(actual["budget_overview"][0]["actual"], 42.0)
+
+    def test_queries_run_concurrently(self):
+        # Every query blocks until all of them have started; run sequentially
+        # the barrier would time out and raise BrokenBarrierError
+        barrier = threading.Barrier(len(dashboard_payload.QUERIES), timeout=5)
+        with patch.dict(
+            dashboard_payload.QUERIES, _patched_queries(_fake_results(), barrier)
+        ):
+            payload = async_to_sync(build_payload_async)("u1", date(2026, 1, 15))
+        self.assertEqual(payload["monthly_expenses"], 9.99)
+
+
+    def test_query_threads_release_their_connections(self):
+        results = _fake_results()
+        used = []
+
+        def make(name):
+            def query(user_id, today):
+                wrapper = connections["default"]
+                wrapper.ensure_connection()
+                used.append(wrapper)
+                return results[name]
+
+            return query
+
+        # SQLite ignores close() on the in-memory test database
+        with patch.object(
+            type(connections["default"]),
+            "is_in_memory_db",
+            lambda self: False,
+            create=True,
+        ), patch.dict(
+            dashboard_payload.QUERIES, {name: make(name) for name in results}
+        ):
+            async_to_sync(build_payload_async)("u1", date(2026, 1, 15))
+        self.assertEqual(len(used), len(dashboard_payload.QUERIES))
+        for wrapper in used:
+            self.assertIsNone(wrapper.connection)
+
+
+@override_settings(SUPABASE_JWT_SECRET=FAKE_SECRET)
+class AsyncDashboardViewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.view = AsyncDashboardView.as_view()
+        token, self.user_id = make_token()
+        self.auth = f"Bearer {token}"
+
+    def get(self, headers=None):
+        request = self.factory.get("/api/v1/dashboard/", headers=headers)
+        return async_to_sync(self.view)(request)
+
+    def test_requires_authentication(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response["WWW-Authenticate"], "Bearer")
+        self.assertIn("detail", json.loads(response.content))
+
+    def test_invalid_token_rejected(self):
+        response = self.get({"Authorization": "Bearer not-a-jwt"})
+        self.assertEqual(response.status_code, 401)
+
+    def test_cached_payload_and_etag(self):
+        with patch(
+            "apps.dashboard.views.build_payload_async", return_value=PAYLOAD
+        ) as build:
+            first = self.get({"Authorization": self.auth})
+            second = self.get(
+                {"Authorization": self.auth, "If-None-Match": first["ETag"]}
+            )
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(json.loads(first.content), PAYLOAD)
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(build.call_count, 1)
+
+
+@unittest.skipUnless(
+    connection.vendor == "postgresql", "dashboard_payload() is PostgreSQL-only"
+)
+class SqlPayloadEquivalenceTest(SchemaTestCase):
+    """dashboard_payload() must return exactly what the Python builder does."""
+
+    today = date(2026, 3, 15)
+
+    def make_user(self):
+        user_id = uuid.uuid4()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO auth.users (id, email) VALUES (%s, %s)",
+                [user_id, f"{user_id.hex}@example.com"],
+            )
+        return user_id
+
+    def insert(self, table, **values):
+        columns = ", ".join(values)
+        placeholders = ", ".join(["%s"] * len(values))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} ({columns}) VALUES ({placeholders}) RETURNING id",
+                list(values.values()),
+            )
+            return cursor.fetchone()[0]
+
+    def assertEquivalent(self, user_id):
+        expected = dashboard_payload.build_payload(user_id, self.today)
+        actual = dashboard_payload.fetch_payload_sql(user_id, self.today)
+        self.assertEqual(actual, expected)
+        # Same JSON on the wire, key order included
+        self.assertEqual(json.dumps(actual), json.dumps(expected))
+        return actual
+
+    def test_empty_user(self):
+        payload = self.assertEquivalent(self.make_user())
+        self.assertEqual(payload["credit_cards"], [])
+        self.assertEqual(payload["monthly_income"], 0)
+
+    def test_full_dashboard(self):
+        user_id = self.make_user()
+        bank = self.insert(
+            "accounts", user_id=user_id, name="Bank", type="bank", current_balance="1500.25"
+        )
+        self.insert(
+            "accounts", user_id=user_id, name="Old", type="cash",
+            current_balance="99", is_active=False,
+        )
+        card = self.insert(
+            "accounts", user_id=user_id, name="Card", type="credit_card",
+            provider="Visa", credit_limit="2000", billing_date=5, due_date=25,
+        )
+        self.insert(
+            "accounts", user_id=user_id, name="Store card", type="credit_card",
+            credit_limit="0",
+        )
+        food = self.insert("categories", user_id=user_id, name="Food", type="expense")
+        rent = self.insert("categories", user_id=user_id, name="Rent", type="expense")
+        salary = self.insert("categories", user_id=user_id, name="Salary", type="income")
+        for category_id, planned in [(food, "400"), (rent, "1200")]:
+            self.insert(
+                "budget_plans", user_id=user_id, category_id=category_id,
+                month=3, year=2026, planned_amount=planned,
+            )
+        # Twelve rows sharing one created_at (same transaction), so the
+        # recent list depends on the id tie-break
+        for day in range(1, 13):
+            self.insert(
+                "transactions", user_id=user_id, account_id=card if day % 2 else bank,
+                category_id=food if day % 3 else None, type="expense",
+                amount=f"{day}.10", description=f"Day {day}",
+                transaction_date=date(2026, 3, day % 6 + 1),
+            )
+        self.insert(
+            "transactions", user_id=user_id, account_id=bank, category_id=salary,
+            type="income", amount="3000", transaction_date=date(2026, 3, 1),
+        )
+        self.insert(
+            "transactions", user_id=user_id, account_id=bank, category_id=rent,
+            type="expense", amount="1200", transaction_date=date(2026, 2, 28),
+        )
+
+        payload = self.assertEquivalent(user_id)
+        self.assertEqual(len(payload["recent_transactions"]), 10)
+        self.assertEqual([c["name"] for c in payload["credit_cards"]], ["Card", "Store card"])
+        self.assertIsNone(payload["credit_cards"][1]["credit_limit"])
+        self.assertEqual(
+            [b["category_name"] for b in payload["budget_overview"]], ["Rent", "Food"]
+        )
+        self.assertEqual(payload["budget_overview"][0]["actual"], 0)
@@ -0,0 +1,149 @@
+"""Tests for streaming transaction export encoders and the export endpoint."""
+import csv
+import io
+import json
+import uuid
+from datetime import date
+from decimal import Decimal
+from django.test import TestCase
+
+from apps.accounts.models import Account
+from apps.categories.models import Category
+from apps.transactions import exporters
+from apps.transactions.models import Transaction
+from tests.base import AuthenticatedClientMixin, SchemaTestCase
+
+EXPORT_URL = "/api/v1/transactions/export/"
+
+
+def _row(**overrides):
+    row = dict(
+        id=uuid.UUID("550e8400-e29b-41d4-a716-446655440000"),
+        transaction_date=date(2026, 2, 8),
+        type="expense",
+        amount=Decimal("12.50"),
+        account_id=uuid.UUID("660e8400-e29b-41d4-a716-446655440001"),
+        category_id=None,
+        category_name=None,
+        description="Coffee",
+        notes="",
+        transfer_to_account_id=None,
+        created_at=None,
+        updated_at=None,
+    )
+    row.update(overrides)
+    return tuple(row[f] for f in exporters.EXPORT_FIELDS)
+
+
+class ExportEncoderTest(TestCase):
+    def test_csv_header_and_row(self):
+        lines = "".join(exporters.iter_csv([_row()])).splitlines()
+        self.assertEqual(lines[0].split(","), exporters.EXPORT_FIELDS)
+        self.assertIn("2026-02-08,expense,12.50", lines[1])
+
+    def test_csv_neutralises_formulas(self):
+        text = "".join(exporters.iter_csv([_row(description="=HYPERLINK(1)")]))
+        self.assertIn("'=HYPERLINK(1)", text)
+
+    def test_ndjson_matches_api_types(self):
+        lines = "".join(exporters.iter_ndjson([_row(), _row()])).splitlines()
+        self.assertEqual(len(lines), 2)
+        record = json.loads(lines[0])
+        self.assertEqual(record["amount"], "12.50")
+        self.assertEqual(record["id"], "550e8400-e29b-41d4-a716-446655440000")
+        self.assertIsNone(record["category_id"])
+
+    def test_rows_are_chunked(self):
+        rows = [_row()] * (exporters.ROWS_PER_CHUNK + 1)
+        self.assertEqual(len(list(exporters.iter_ndjson(rows))), 2)
+
+    def test_category_names_are_filled_in(self):
+        index = exporters.EXPORT_FIELDS.index("category_name")
+        food = uuid.uuid4()
+        rows = [
+            _row(category_id=category_id)[:index] + _row()[index + 1:]
+            for category_id in (food, None, uuid.uuid4())
+        ]
+        named = list(exporters.with_category_names(rows, {str(food): "Food"}))
+        self.assertEqual(named[0], _row(category_id=food, category_name="Food"))
+        self.assertEqual([row[index] for row in named], ["Food", None, None])
+
+
+class ExportEndpointTest(AuthenticatedClientMixin, SchemaTestCase):
+    dataset = dict(users=2, transactions=150, months=2, seed=41)
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.names = dict(
+            Category.objects.filter(user_id=cls.user.id).values_list("id", "name")
+        )
+
+    def export(self, **params):
+        response = self.client.get(EXPORT_URL, params)
+        self.assertEqual(response.status_code, 200)
+        return response, b"".join(response.streaming_content).decode()
+
+    def expected_ids(self, **filters):
+        return [
+            str(pk)
+            for pk in Transaction.objects.filter(user_id=self.user.id, **filters)
+            .order_by("-transaction_date", "-created_at", "-id")
+            .values_list("id", flat=True)
+        ]
+
+    def test_csv(self):
+        response, text = self.export(format="csv")
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertEqual(
+            response["Content-Disposition"], 'attachment; filename="transactions.csv"'
+        )
+        rows = list(csv.DictReader(io.StringIO(text)))
+        self.assertEqual([row["id"] for row in rows], self.expected_ids())
+        categorized = [row for row in rows if row["category_id"]]
+        self.assertTrue(categorized)
+        for row in categorized:
+            self.assertEqual(
+                row["category_name"], self.names[uuid.UUID(row["category_id"])]
+            )
+        self.assertTrue(
+            all(row["category_name"] == "" for row in rows if not row["category_id"])
+        )
+
+    def test_ndjson(self):
+        response, text = self.export(format="ndjson")
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        records = [json.loads(line) for line in text.splitlines()]
+        self.assertEqual([r["id"] for r in records], self.expected_ids())
+        self.assertEqual(list(records[0]), exporters.EXPORT_FIELDS)
+        for record in records:
+            expected = (
+                self.names[uuid.UUID(record["category_id"])]
+                if record["category_id"]
+                else None
+            )
+            self.assertEqual(record["category_name"], expected)
+
+    def test_filters(self):
+        account = Account.objects.filter(user_id=self.user.id)[0]
+        category_id = next(iter(self.names))
+        month_start = date.today().replace(day=1)
+        for params, filters in (
+            ({"type": "income"}, {"type": "income"}),
+            ({"account_id": str(account.id)}, {"account_id": account.id}),
+            ({"category_id": str(category_id)}, {"category_id": category_id}),
+            (
+                {"date_from": month_start.isoformat()},
+                {"transaction_date__gte": month_start},
+            ),
+        ):
+            with self.subTest(params=params):
+                _, text = self.export(format="ndjson", **params)
+                ids = [json.loads(line)["id"] for line in text.splitlines()]
+                self.assertEqual(ids, self.expected_ids(**filters))
+                self.assertTrue(ids)
+
+    def test_unknown_format(self):
+        response = self.client.get(EXPORT_URL, {"format": "xlsx"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("format", response.json())
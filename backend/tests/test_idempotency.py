@@ -0,0 +1,143 @@
+"""Tests for Idempotency-Key handling on POST endpoints."""
+from datetime import date
+from unittest.mock import patch
+
+from django.core.cache import cache
+
+from apps.categories.models import Category
+from apps.savings.models import SavingPlan
+from apps.transactions.models import Transaction
+from tests.base import AuthenticatedClientMixin, SchemaTestCase
+from utils import idempotency
+
+TRANSACTIONS_URL = "/api/v1/transactions/"
+
+
+class IdempotencyKeyTest(AuthenticatedClientMixin, SchemaTestCase):
+    dataset = dict(users=2, transactions=10, months=1, seed=11)
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.category = Category.objects.filter(user_id=cls.user.id, type="expense")[0]
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def tx_data(self, **overrides):
+        return {
+            "account_id": str(self.user.account_ids[0]),
+            "category_id": str(self.category.id),
+            "type": "expense",
+            "amount": "9.99",
+            "description": "Retried",
+            "transaction_date": date.today().isoformat(),
+            **overrides,
+        }
+
+    def post(self, data, key, client=None, url=TRANSACTIONS_URL):
+        return (client or self.client).post(
+            url, data, format="json", HTTP_IDEMPOTENCY_KEY=key
+        )
+
+    def count(self, user=None):
+        user_id = (user or self.user).id
+        return Transaction.objects.filter(user_id=user_id, description="Retried").count()
+
+    def test_repeat_replays_the_first_response(self):
+        first = self.post(self.tx_data(), "key-1")
+        self.assertEqual(first.status_code, 201)
+        self.assertNotIn(idempotency.REPLAYED_HEADER, first)
+
+        with self.assertNumQueries(0):
+            repeat = self.post(self.tx_data(), "key-1")
+        self.assertEqual(repeat.status_code, 201)
+        self.assertEqual(repeat[idempotency.REPLAYED_HEADER], "true")
+        self.assertEqual(repeat.json(), first.json())
+        self.assertEqual(self.count(), 1)
+
+        self.assertEqual(self.post(self.tx_data(), "key-2").status_code, 201)
+        self.assertEqual(self.count(), 2)
+
+    def test_repeat_reads_the_cache_once(self):
+        self.post(self.tx_data(), "key-1")
+        with patch.object(cache, "get", wraps=cache.get) as get, patch.object(
+            cache, "add", wraps=cache.add
+        ) as add:
+            self.assertEqual(self.post(self.tx_data(), "key-1").status_code, 201)
+        idempotency_reads = [
+            call for call in get.call_args_list
+            if call.args[0].startswith("idempotency:")
+        ]
+        self.assertEqual(len(idempotency_reads), 1)
+        add.assert_not_called()
+
+    def test_concurrent_first_request_conflicts(self):
+        def claimed_meanwhile(key, value, timeout):
+            # The same request from another worker claims the key between
+            # this one's get and add
+            cache.set(key, value, timeout)
+            return False
+
+        with patch.object(cache, "add", side_effect=claimed_meanwhile):
+            response = self.post(self.tx_data(), "key-1")
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(self.count(), 0)
+
+    def test_key_reused_for_another_request(self):
+        self.post(self.tx_data(), "key-1")
+        response = self.post(self.tx_data(amount="1.00"), "key-1")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(idempotency.IDEMPOTENCY_HEADER, response.json())
+        self.assertEqual(self.count(), 1)
+
+    def test_keys_are_per_user(self):
+        other_client = self.client_for(self.other)
+        other_data = self.tx_data(
+            account_id=str(self.other.account_ids[0]), category_id=None
+        )
+        self.assertEqual(self.post(self.tx_data(), "shared").status_code, 201)
+        response = self.post(other_data, "shared", client=other_client)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.count(self.other), 1)
+
+    def test_failed_requests_are_not_kept(self):
+        self.assertEqual(self.post(self.tx_data(amount="-1"), "key-1").status_code, 400)
+        response = self.post(self.tx_data(amount="-1"), "key-1")
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn(idempotency.REPLAYED_HEADER, response)
+
+    def test_request_in_progress_conflicts(self):
+        data = self.tx_data()
+        self.assertEqual(self.post(data, "key-1").status_code, 201)
+        # Put the key back in the state a still-running first request leaves it
+        cache_key = idempotency._cache_key(self.user.id, "key-1")
+        _, fingerprint, *_ = cache.get(cache_key)
+        cache.set(cache_key, (idempotency._PENDING, fingerprint))
+        self.assertEqual(self.post(data, "key-1").status_code, 409)
+
+    def test_other_viewsets_and_actions(self):
+        plan = {"name": "Trip", "target_amount": "500.00"}
+        url = "/api/v1/savings/plans/"
+        for _ in range(2):
+            self.assertEqual(self.post(plan, "plan", url=url).status_code, 201)
+        self.assertEqual(SavingPlan.objects.filter(name="Trip").count(), 1)
+
+        tx = Transaction.objects.filter(user_id=self.user.id, type="expense")[0]
+        bulk = {"operations": [{"op": "delete", "id": str(tx.id)}]}
+        for _ in range(2):
+            response = self.post(bulk, "bulk", url=TRANSACTIONS_URL + "bulk/")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()["results"][0]["status"], 204)
+
+    def test_without_a_key(self):
+        for _ in range(2):
+            response = self.client.post(TRANSACTIONS_URL, self.tx_data(), format="json")
+            self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.count(), 2)
+
+    def test_rejects_overlong_keys(self):
+        response = self.post(self.tx_data(), "k" * (idempotency.MAX_KEY_LENGTH + 1))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.count(), 0)
@@ -0,0 +1,154 @@
+"""Tests for streaming CSV/OFX transaction import."""
+import io
+import uuid
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+
+from apps.accounts.models import Account
+from apps.transactions.importers import (
+    RowError,
+    TransactionImporter,
+    iter_csv_rows,
+    iter_ofx_rows,
+)
+from apps.transactions.models import Transaction
+from tests.base import AuthenticatedClientMixin, SchemaTestCase
+
+OFX_SGML = """OFXHEADER:100
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20260115120000[-5:EST]
+<TRNAMT>-42.50
+<NAME>Uber Trip
+<MEMO>Airport
+</STMTTRN>
+<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20260131<TRNAMT>3000.00<NAME>Payroll</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+
+class ParserTest(TestCase):
+    def test_csv_rows_are_normalised(self):
+        stream = io.StringIO("Date,Amount,Description\n2026-01-15, -42.50 ,Uber\n")
+        rows = list(iter_csv_rows(stream))
+        self.assertEqual(
+            rows, [(2, {"date": "2026-01-15", "amount": "-42.50", "description": "Uber"})]
+        )
+
+    def test_unreadable_csv_line_ends_with_a_row_error(self):
+        stream = io.StringIO(f'date,amount\n2026-01-15,1\n"{"x" * 200_000}",2\n')
+        rows = list(iter_csv_rows(stream))
+        self.assertEqual(rows[0][0], 2)
+        self.assertEqual(rows[1][0], 3)
+        self.assertIsInstance(rows[1][1], RowError)
+
+    def test_ofx_rows(self):
+        rows = [row for _, row in iter_ofx_rows(io.StringIO(OFX_SGML))]
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]["date"], "2026-01-15")
+        self.assertEqual(rows[0]["amount"], "-42.50")
+        self.assertEqual(rows[0]["description"], "Uber Trip")
+        self.assertEqual(rows[0]["notes"], "Airport")
+        self.assertEqual(rows[1]["description"], "Payroll")
+
+    def test_ofx_tags_split_across_chunks(self):
+        whole = [row for _, row in iter_ofx_rows(io.StringIO(OFX_SGML))]
+        chunked = [row for _, row in iter_ofx_rows(io.StringIO(OFX_SGML), chunk_size=7)]
+        self.assertEqual(whole, chunked)
+
+
+class TransactionImporterTest(TestCase):
+    def setUp(self):
+        self.importer = TransactionImporter(uuid.uuid4(), uuid.uuid4(), batch_size=2)
+        self.importer.categories = {}
+
+    def test_sign_infers_type(self):
+        expense = self.importer.build_transaction({"date": "2026-01-15", "amount": "-42.5"})
+        income = self.importer.build_transaction({"date": "2026-01-15", "amount": "10"})
+        self.assertEqual((expense.type, expense.amount), ("expense", Decimal("42.50")))
+        self.assertEqual(income.type, "income")
+        self.assertEqual(expense.transaction_date, date(2026, 1, 15))
+
+    def test_invalid_row_collects_all_errors(self):
+        with self.assertRaises(RowError) as ctx:
+            self.importer.build_transaction({"date": "15/01/2026", "amount": "abc"})
+        self.assertEqual(set(ctx.exception.errors), {"date", "amount"})
+
+    def test_transfer_rows_rejected(self):
+        with self.assertRaises(RowError) as ctx:
+            self.importer.build_transaction(
+                {"date": "2026-01-15", "amount": "5", "type": "transfer"}
+            )
+        self.assertIn("type", ctx.exception.errors)
+
+    def test_run_inserts_valid_rows_in_batches(self):
+        rows = [
+            (2, {"date": "2026-01-01", "amount": "-1"}),
+            (3, {"date": "bad", "amount": "-1"}),
+            (4, {"date": "2026-01-02", "amount": "-2"}),
+            (5, {"date": "2026-01-03", "amount": "0"}),
+            (6, {"date": "2026-01-04", "amount": "4"}),
+        ]
+        with patch("apps.transactions.importers.Account.objects") as accounts, patch.object(
+            TransactionImporter, "_load_categories", return_value={}
+        ), patch("apps.transactions.importers.Transaction.objects.bulk_create") as bulk:
+            accounts.filter.return_value.exists.return_value = True
+            report = self.importer.run(rows)
+
+        self.assertEqual(report["imported"], 3)
+        self.assertEqual(report["failed"], 2)
+        self.assertEqual([e["row"] for e in report["errors"]], [3, 5])
+        self.assertEqual([len(call.args[0]) for call in bulk.call_args_list], [1, 1, 1])
+
+
+class ImportEndpointTest(AuthenticatedClientMixin, SchemaTestCase):
+    dataset = dict(users=1, transactions=10, months=1, seed=23)
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.account = Account.objects.filter(user_id=cls.user.id, type="bank")[0]
+
+    def setUp(self):
+        super().setUp()
+        self.before = Transaction.objects.count()
+
+    def upload(self, content: bytes):
+        return self.client.post(
+            "/api/v1/transactions/import/",
+            {
+                "file": SimpleUploadedFile("export.csv", content),
+                "account_id": str(self.account.id),
+            },
+            format="multipart",
+        )
+
+    def test_import_csv(self):
+        response = self.upload(
+            "\ufeffdate,amount,description\n2026-01-15,-4.50,Café\n".encode()
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.json()["imported"], 1)
+        self.assertTrue(Transaction.objects.filter(description="Café").exists())
+
+    def test_bad_encoding_late_in_the_file_writes_nothing(self):
+        rows = "".join(f"2026-01-15,-{i + 1},Shop\n" for i in range(3000))
+        bad = b"2026-01-16,-1,caf\xe9\n"
+        response = self.upload(b"date,amount,description\n" + rows.encode() + bad)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("file", response.json())
+        self.assertEqual(Transaction.objects.count(), self.before)
+
+    def test_unreadable_csv_line_is_reported(self):
+        content = f'date,amount\n2026-01-15,-1\n"{"x" * 200_000}",-2\n'.encode()
+        response = self.upload(content)
+        self.assertEqual(response.status_code, 201, response.content)
+        report = response.json()
+        self.assertEqual((report["imported"], report["failed"]), (1, 1))
+        self.assertEqual(report["errors"][0]["row"], 3)
+        self.assertIn("file", report["errors"][0]["errors"])
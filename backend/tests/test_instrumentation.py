@@ -0,0 +1,105 @@
+"""Tests for the request metrics middleware."""
+import json
+import logging
+import re
+from datetime import date
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+from django.db import connection, connections
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from rest_framework import serializers
+from rest_framework.test import APIClient
+
+from apps.dashboard import payload as dashboard_payload
+from apps.dashboard.views import build_payload_async
+from utils import batch
+from utils.instrumentation import JSONLogFormatter, RequestMetricsMiddleware
+
+
+class PointSerializer(serializers.Serializer):
+    x = serializers.IntegerField()
+
+
+def query_view(request):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+        cursor.execute("SELECT 2")
+    PointSerializer([{"x": i} for i in range(2000)], many=True).data
+    return HttpResponse("ok")
+
+
+def select_one(*args):
+    # On the calling thread's own connection
+    with connections["default"].cursor() as cursor:
+        cursor.execute("SELECT 1")
+
+
+def batch_view(request):
+    batch.run_tasks([select_one] * 3, concurrent=True)
+    return HttpResponse("ok")
+
+
+def dashboard_view(request):
+    queries = {name: select_one for name in dashboard_payload.QUERIES}
+    with patch.dict(dashboard_payload.QUERIES, queries), patch.object(
+        dashboard_payload, "assemble_payload"
+    ):
+        async_to_sync(build_payload_async)("u1", date(2026, 1, 15))
+    return HttpResponse("ok")
+
+
+def timings(response):
+    return {
+        name: float(dur)
+        for name, dur in re.findall(r"(\w+);dur=([\d.]+)", response["Server-Timing"])
+    }
+
+
+class RequestMetricsMiddlewareTest(TestCase):
+    def setUp(self):
+        self.request = RequestFactory().get("/points/")
+        self.request.resolver_match = None
+
+    def test_server_timing_header(self):
+        response = RequestMetricsMiddleware(query_view)(self.request)
+        header = response["Server-Timing"]
+        self.assertIn('desc="2 queries"', header)
+        self.assertEqual(set(timings(response)), {"db", "serializer", "view", "total"})
+        self.assertGreater(timings(response)["serializer"], 0)
+
+    def test_executor_queries_are_counted(self):
+        response = RequestMetricsMiddleware(batch_view)(self.request)
+        self.assertIn('desc="3 queries"', response["Server-Timing"])
+        response = RequestMetricsMiddleware(dashboard_view)(self.request)
+        self.assertIn(
+            f'desc="{len(dashboard_payload.QUERIES)} queries"',
+            response["Server-Timing"],
+        )
+
+    @override_settings(REQUEST_METRICS_SAMPLE_RATE=0)
+    def test_unsampled_requests_untouched(self):
+        response = RequestMetricsMiddleware(query_view)(self.request)
+        self.assertFalse(response.has_header("Server-Timing"))
+
+    @override_settings(SLOW_QUERY_MS=0)
+    def test_slow_queries_logged_with_endpoint(self):
+        with self.assertLogs("finance.slow_query", level="WARNING") as logs:
+            RequestMetricsMiddleware(query_view)(self.request)
+        self.assertEqual(len(logs.records), 2)
+        record = logs.records[0]
+        self.assertEqual(record.endpoint, "/points/")
+        self.assertEqual(record.sql, "SELECT 1")
+        entry = json.loads(JSONLogFormatter().format(record))
+        self.assertEqual(entry["query_count"], 2)
+        self.assertEqual(entry["method"], "GET")
+
+    def test_fast_queries_not_logged(self):
+        logger = logging.getLogger("finance.slow_query")
+        with self.assertNoLogs(logger, level="WARNING"):
+            RequestMetricsMiddleware(query_view)(self.request)
+
+    def test_api_response_has_header(self):
+        response = APIClient().get("/api/v1/health/")
+        self.assertIn('desc="0 queries"', response["Server-Timing"])
@@ -0,0 +1,90 @@
+"""Tests for balance reconciliation against the transaction ledger."""
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.db.models import F
+
+from apps.accounts import ledger
+from apps.accounts.models import Account
+from tests.base import SchemaTestCase
+
+
+class LedgerTest(SchemaTestCase):
+    dataset = dict(users=2, transactions=200, months=2, seed=31)
+
+    def setUp(self):
+        # Knock two of the user's accounts and one of the other's off the ledger
+        self.drifted = {
+            self.user.account_ids[0]: Decimal("12.34"),
+            self.user.account_ids[1]: Decimal("-50.00"),
+            self.other.account_ids[0]: Decimal("0.01"),
+        }
+        self.balances = self.current_balances()
+        for account_id, offset in self.drifted.items():
+            Account.objects.filter(id=account_id).update(
+                current_balance=F("current_balance") + offset
+            )
+
+    def current_balances(self):
+        return dict(Account.objects.values_list("id", "current_balance"))
+
+    def test_find_drift(self):
+        rows = {row["account_id"]: row for row in ledger.find_drift()}
+        self.assertEqual(set(rows), set(self.drifted))
+        for account_id, offset in self.drifted.items():
+            row = rows[account_id]
+            self.assertEqual(row["expected"], self.balances[account_id])
+            self.assertEqual(row["current"], self.balances[account_id] + offset)
+            self.assertEqual(row["drift"], -offset)
+        self.assertEqual(
+            {row["account_id"] for row in ledger.find_drift(self.user.id)},
+            set(self.user.account_ids[:2]),
+        )
+
+    def test_apply_corrections(self):
+        drifted = ledger.find_drift()
+        self.assertEqual(ledger.apply_corrections(drifted, batch_size=2), 3)
+        self.assertEqual(ledger.find_drift(), [])
+        self.assertEqual(self.current_balances(), self.balances)
+
+    def test_corrections_keep_later_changes(self):
+        drifted = ledger.find_drift(self.user.id)
+        # A balance change committed after the drift was measured
+        account_id = self.user.account_ids[0]
+        Account.objects.filter(id=account_id).update(
+            current_balance=F("current_balance") + 5
+        )
+        ledger.apply_corrections(drifted)
+        self.assertEqual(
+            Account.objects.get(id=account_id).current_balance,
+            self.balances[account_id] + 5,
+        )
+
+    def test_command_reports_without_writing(self):
+        out = StringIO()
+        call_command("reconcile_balances", stdout=out)
+        self.assertIn("3 accounts drifted; rerun with --fix.", out.getvalue())
+        self.assertIn(
+            f"{self.user.account_ids[1]}: current="
+            f"{self.balances[self.user.account_ids[1]] - 50} "
+            f"expected={self.balances[self.user.account_ids[1]]} drift=50.00",
+            out.getvalue(),
+        )
+        self.assertEqual(len(ledger.find_drift()), 3)
+
+    def test_command_fix(self):
+        out = StringIO()
+        call_command("reconcile_balances", "--user", str(self.user.id), "--fix", stdout=out)
+        self.assertIn("Corrected 2 accounts.", out.getvalue())
+        self.assertEqual(
+            [row["account_id"] for row in ledger.find_drift()],
+            [self.other.account_ids[0]],
+        )
+
+        out = StringIO()
+        call_command("reconcile_balances", "--fix", stdout=out)
+        self.assertIn("Corrected 1 accounts.", out.getvalue())
+        call_command("reconcile_balances", stdout=out)
+        self.assertIn("All balances match the ledger.", out.getvalue())
+        self.assertEqual(self.current_balances(), self.balances)
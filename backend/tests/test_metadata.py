@@ -0,0 +1,110 @@
+"""Tests for the process-local category/account metadata cache."""
+from unittest.mock import patch
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from apps.accounts.models import Account
+from apps.categories.models import Category
+from utils import metadata
+from tests.base import AuthenticatedClientMixin, SchemaTestCase
+from utils.cache import bump_version
+
+
+class LRUCacheTest(SimpleTestCase):
+    def test_evicts_least_recently_used(self):
+        lru = metadata.LRUCache(maxsize=2)
+        lru.set("a", 1)
+        lru.set("b", 2)
+        self.assertEqual(lru.get("a"), 1)
+        lru.set("c", 3)
+        self.assertIsNone(lru.get("b"))
+        self.assertEqual((lru.get("a"), lru.get("c"), len(lru)), (1, 3, 2))
+
+
+class MetadataCacheTest(AuthenticatedClientMixin, SchemaTestCase):
+    dataset = dict(users=1, transactions=80, months=1, seed=12)
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        metadata.clear()
+
+    def category_queries(self, path):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return [q for q in ctx.captured_queries if '"categories"' in q["sql"]]
+
+    def test_lookups_hit_the_cache(self):
+        with self.assertNumQueries(2):
+            categories = metadata.category_metadata(self.user.id)
+            accounts = metadata.account_metadata(self.user.id)
+        category = Category.objects.filter(user_id=self.user.id)[0]
+        self.assertEqual(categories[str(category.id)].name, category.name)
+        self.assertEqual(len(accounts), len(self.user.account_ids))
+        with self.assertNumQueries(0):
+            metadata.category_names(self.user.id)
+            metadata.account_metadata(self.user.id)
+
+    def test_aggregating_endpoints_skip_the_category_query(self):
+        paths = (
+            "/api/v1/transactions/summary/",
+            "/api/v1/budgets/progress/",
+            "/api/v1/dashboard/",
+        )
+        self.assertEqual(len(self.category_queries(paths[0])), 1)
+        for path in paths:
+            with self.subTest(path=path):
+                self.assertEqual(self.category_queries(path), [])
+
+    def test_category_writes_invalidate(self):
+        category = Category.objects.filter(user_id=self.user.id, type="expense")[0]
+        self.client.get("/api/v1/budgets/progress/")
+        response = self.client.patch(
+            f"/api/v1/categories/{category.id}/", {"name": "Renamed"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        names = metadata.category_names(self.user.id)
+        self.assertEqual(names[str(category.id)], "Renamed")
+
+    def test_account_writes_invalidate(self):
+        metadata.account_metadata(self.user.id)
+        account_id = self.user.account_ids[0]
+        response = self.client.patch(
+            f"/api/v1/accounts/{account_id}/", {"name": "Joint"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        accounts = metadata.account_metadata(self.user.id)
+        self.assertEqual(accounts[str(account_id)].name, "Joint")
+
+    def test_version_bump_from_another_worker_reloads(self):
+        account_id = str(self.user.account_ids[0])
+        metadata.account_metadata(self.user.id)
+        Account.objects.filter(id=account_id).update(name="Elsewhere")
+        stale = metadata.account_metadata(self.user.id)[account_id]
+        self.assertNotEqual(stale.name, "Elsewhere")
+        bump_version(metadata.METADATA_NAMESPACE, self.user.id)
+        with self.assertNumQueries(1):
+            accounts = metadata.account_metadata(self.user.id)
+        self.assertEqual(accounts[account_id].name, "Elsewhere")
+
+    def test_entries_expire(self):
+        metadata.account_metadata(self.user.id)
+        later = metadata.time.monotonic() + settings.METADATA_CACHE_TTL + 1
+        with patch("utils.metadata.time.monotonic", return_value=later):
+            with self.assertNumQueries(1):
+                metadata.account_metadata(self.user.id)
+            with self.assertNumQueries(0):
+                metadata.account_metadata(self.user.id)
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+    )
+    def test_cache_that_keeps_nothing_always_reloads(self):
+        metadata.account_metadata(self.user.id)
+        with self.assertNumQueries(1):
+            metadata.account_metadata(self.user.id)
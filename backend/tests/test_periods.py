@@ -0,0 +1,130 @@
+"""Tests for reporting periods and their query parameters."""
+from datetime import date, timedelta
+from unittest.mock import patch
+from django.db.models import Q
+from django.test import TestCase
+from rest_framework.exceptions import ValidationError
+
+from apps.transactions import rollups
+from apps.transactions.models import Transaction
+from tests.base import AuthenticatedClientMixin, SchemaTestCase
+from utils.periods import Period
+
+TODAY = date(2026, 5, 17)
+
+
+class PeriodTest(TestCase):
+    def test_month_is_half_open(self):
+        self.assertEqual(Period.month(2026, 12), Period(date(2026, 12, 1), date(2027, 1, 1)))
+
+    def test_quarter_and_year(self):
+        self.assertEqual(Period.quarter(2026, 4), Period(date(2026, 10, 1), date(2027, 1, 1)))
+        self.assertEqual(Period.year(2026), Period(date(2026, 1, 1), date(2027, 1, 1)))
+
+    def test_rolling_includes_today(self):
+        self.assertEqual(Period.rolling(7, TODAY), Period(date(2026, 5, 11), date(2026, 5, 18)))
+
+    def test_q_uses_range_lookups(self):
+        self.assertEqual(
+            Period.month(2026, 2).q(),
+            Q(transaction_date__gte=date(2026, 2, 1)) & Q(transaction_date__lt=date(2026, 3, 1)),
+        )
+        self.assertEqual(Period().q(), Q())
+
+
+class MonthSpanTest(TestCase):
+    def test_open_range(self):
+        self.assertEqual(Period().month_span(), (None, None))
+
+    def test_whole_months(self):
+        period = Period.between(date(2026, 1, 1), date(2026, 2, 28))
+        self.assertEqual(period.month_span(), ((2026, 1), (2026, 2)))
+
+    def test_leap_february_end(self):
+        period = Period.between(None, date(2028, 2, 29))
+        self.assertEqual(period.month_span(), (None, (2028, 2)))
+
+    def test_partial_month_not_eligible(self):
+        self.assertIsNone(Period.between(date(2026, 1, 15), None).month_span())
+        self.assertIsNone(Period.between(None, date(2026, 2, 27)).month_span())
+        self.assertIsNone(Period.rolling(30, TODAY).month_span())
+
+    def test_single_month(self):
+        self.assertEqual(Period.month(2026, 3).single_month(), (2026, 3))
+        self.assertIsNone(Period.quarter(2026, 1).single_month())
+
+
+class FromParamsTest(TestCase):
+    def parse(self, **params):
+        return Period.from_params(params, today=TODAY)
+
+    def test_defaults_to_current_units(self):
+        self.assertEqual(self.parse(period="month"), Period.month(2026, 5))
+        self.assertEqual(self.parse(period="quarter"), Period.quarter(2026, 2))
+        self.assertEqual(self.parse(period="year", year="2025"), Period.year(2025))
+
+    def test_date_range_without_period(self):
+        self.assertEqual(
+            self.parse(date_from="2026-01-01", date_to="2026-01-31"), Period.month(2026, 1)
+        )
+        self.assertIsNone(self.parse())
+
+    def test_rolling(self):
+        self.assertEqual(self.parse(period="rolling", days="7"), Period.rolling(7, TODAY))
+
+    def test_last_representable_date_is_open_ended(self):
+        self.assertEqual(
+            self.parse(date_from="2026-01-01", date_to="9999-12-31"),
+            Period(date(2026, 1, 1), None),
+        )
+        self.assertEqual(self.parse(date_to="9999-12-31"), Period())
+
+    def test_invalid_input_is_a_validation_error(self):
+        for params in [
+            {"period": "fortnight"},
+            {"period": "month", "month": "13"},
+            {"period": "quarter", "quarter": "x"},
+            {"period": "rolling"},
+            {"date_from": "not-a-date"},
+            {"date_from": "2026-02-01", "date_to": "2026-01-01"},
+        ]:
+            with self.subTest(params=params), self.assertRaises(ValidationError):
+                self.parse(**params)
+
+
+class PeriodAggregateTest(AuthenticatedClientMixin, SchemaTestCase):
+    """Rollup and ledger paths must agree; partial periods use the ledger."""
+
+    dataset = dict(users=1, transactions=300, months=3, seed=3)
+
+    def test_month_aligned_rollup_matches_ledger(self):
+        today = date.today()
+        period = Period.month(today.year, today.month)
+        from_rollup = rollups.totals_by_type(self.user.id, period)
+        with patch.object(Period, "month_span", return_value=None):
+            from_ledger = rollups.totals_by_type(self.user.id, period)
+        self.assertEqual(from_rollup, from_ledger)
+        self.assertIn("expense", from_rollup)
+
+    def test_partial_period_sums_the_range(self):
+        period = Period.rolling(10)
+        expected = sum(
+            Transaction.objects.filter(
+                user_id=self.user.id,
+                type="expense",
+                transaction_date__gt=date.today() - timedelta(days=10),
+            ).values_list("amount", flat=True)
+        )
+        rows = rollups.category_summary(self.user.id, "expense", period)
+        self.assertEqual(sum(row["total"] for row in rows), expected)
+
+    def test_endpoints_accept_the_last_representable_date(self):
+        params = {"date_from": "2000-01-01", "date_to": "9999-12-31"}
+        response = self.client.get("/api/v1/transactions/", params)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["count"],
+            Transaction.objects.filter(user_id=self.user.id).count(),
+        )
+        response = self.client.get("/api/v1/transactions/summary/", params)
+        self.assertEqual(response.status_code, 200)
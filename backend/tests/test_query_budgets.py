@@ -0,0 +1,194 @@
+"""Query-count budgets and (on PostgreSQL) query-plan checks per endpoint.
+
+The budgets are upper bounds on the queries each endpoint runs against a
+generated user with a few hundred transactions; an N+1 regression on any
+list or nested lookup blows through them. On PostgreSQL every captured query
+that touches `transactions` is EXPLAINed with sequential scans disabled: if
+the plan still scans the table, no index can serve the query.
+"""
+import json
+import unittest
+from datetime import date
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.accounts.models import Account
+from apps.budgets.models import BudgetPlan
+from apps.categories.models import Category
+from apps.savings.models import SavingPlan
+from apps.savings.suggestions import compute_suggestions
+from apps.transactions.models import Transaction
+from tests.base import AuthenticatedClientMixin, SchemaTestCase
+
+# Endpoint name -> maximum number of queries
+QUERY_BUDGETS = {
+    "dashboard": 7,
+    "budget-progress": 4,
+    "transaction-summary": 2,
+    "transaction-summary-account": 2,
+    "consolidated-balance": 1,
+    "credit-cards": 2,
+    "balance-history": 2,
+    "net-worth": 2,
+    "savings-suggestions": 1,
+    "auth-me": 1,
+    "account-list": 2,
+    "account-detail": 1,
+    "category-list": 2,
+    "category-detail": 1,
+    "transaction-list": 2,
+    "transaction-list-cursor": 1,
+    "transaction-list-filtered": 2,
+    "transaction-search": 2,
+    "transaction-detail": 1,
+    "transaction-export": 1,
+    "transaction-trends": 2,
+    "transaction-trends-account": 2,
+    "budget-list": 2,
+    "budget-detail": 1,
+    "saving-plan-list": 2,
+    "saving-plan-detail": 1,
+    "saving-plan-projection": 2,
+    "saving-plan-projections": 2,
+    "sync": 6,
+}
+
+# Endpoints whose transaction queries must walk idx_transactions_user_date
+USER_DATE_INDEX_ENDPOINTS = {
+    "dashboard",
+    "transaction-list",
+    "transaction-list-cursor",
+    "transaction-export",
+}
+
+USER_DATE_INDEX = "idx_transactions_user_date"
+
+
+class EndpointQueryTestCase(AuthenticatedClientMixin, SchemaTestCase):
+    dataset = dict(users=1, transactions=400, months=3, seed=1)
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        # As after the nightly compute_saving_suggestions run
+        today = date.today()
+        compute_suggestions(today.year, today.month)
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()  # measure the dashboard build, not a cache hit
+
+    def endpoint_paths(self) -> dict:
+        user_id = self.user.id
+        account = Account.objects.filter(user_id=user_id).order_by("created_at", "id")[0]
+        category = Category.objects.filter(user_id=user_id, type="expense")[0]
+        budget = BudgetPlan.objects.filter(user_id=user_id)[0]
+        plan = SavingPlan.objects.filter(user_id=user_id)[0]
+        tx = Transaction.objects.filter(user_id=user_id)[0]
+        month_start = date.today().replace(day=1).isoformat()
+        return {
+            "dashboard": "/api/v1/dashboard/",
+            "budget-progress": "/api/v1/budgets/progress/",
+            "transaction-summary": "/api/v1/transactions/summary/",
+            "transaction-summary-account": (
+                f"/api/v1/transactions/summary/?account_id={account.id}"
+            ),
+            "consolidated-balance": "/api/v1/accounts/consolidated_balance/",
+            "credit-cards": "/api/v1/accounts/credit_cards/",
+            "balance-history": f"/api/v1/accounts/{account.id}/balance_history/",
+            "net-worth": "/api/v1/accounts/net_worth/",
+            "savings-suggestions": "/api/v1/savings/suggestions/",
+            "auth-me": "/api/v1/auth/me/",
+            "account-list": "/api/v1/accounts/",
+            "account-detail": f"/api/v1/accounts/{account.id}/",
+            "category-list": "/api/v1/categories/",
+            "category-detail": f"/api/v1/categories/{category.id}/",
+            "transaction-list": "/api/v1/transactions/",
+            "transaction-list-cursor": "/api/v1/transactions/?pagination=cursor",
+            "transaction-list-filtered": (
+                f"/api/v1/transactions/?category_id={category.id}&date_from={month_start}"
+            ),
+            "transaction-search": "/api/v1/transactions/?search=ride%20sha",
+            "transaction-detail": f"/api/v1/transactions/{tx.id}/",
+            "transaction-export": "/api/v1/transactions/export/?format=ndjson",
+            "transaction-trends": "/api/v1/transactions/trends/?months=24",
+            "transaction-trends-account": (
+                "/api/v1/transactions/trends/?months=24&group_by=account"
+            ),
+            "budget-list": "/api/v1/budgets/",
+            "budget-detail": f"/api/v1/budgets/{budget.id}/",
+            "saving-plan-list": "/api/v1/savings/plans/",
+            "saving-plan-detail": f"/api/v1/savings/plans/{plan.id}/",
+            "saving-plan-projection": f"/api/v1/savings/plans/{plan.id}/projection/",
+            "saving-plan-projections": "/api/v1/savings/plans/projections/",
+            "sync": "/api/v1/sync/",
+        }
+
+    def capture(self, path):
+        """GET `path` and return (response, captured queries), streaming included."""
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(path)
+            if response.streaming:
+                b"".join(response.streaming_content)
+        self.assertEqual(response.status_code, 200, path)
+        return response, ctx.captured_queries
+
+
+class QueryBudgetTest(EndpointQueryTestCase):
+    def test_every_budgeted_endpoint_has_a_path(self):
+        self.assertEqual(set(self.endpoint_paths()), set(QUERY_BUDGETS))
+
+    def test_query_budgets(self):
+        for name, path in self.endpoint_paths().items():
+            with self.subTest(endpoint=name):
+                _, queries = self.capture(path)
+                self.assertLessEqual(
+                    len(queries),
+                    QUERY_BUDGETS[name],
+                    f"{name} ran {len(queries)} queries:\n"
+                    + "\n".join(q["sql"] for q in queries),
+                )
+
+    def test_list_queries_do_not_grow_with_page_size(self):
+        _, small = self.capture("/api/v1/transactions/?page_size=5")
+        _, large = self.capture("/api/v1/transactions/?page_size=200")
+        self.assertEqual(len(small), len(large))
+
+
+def _plan_nodes(node):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+@unittest.skipUnless(connection.vendor == "postgresql", "EXPLAIN checks need PostgreSQL")
+class QueryPlanTest(EndpointQueryTestCase):
+    def explain(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}")
+            plan = cursor.fetchone()[0]
+            cursor.execute("SET LOCAL enable_seqscan = on")
+        plan = json.loads(plan) if isinstance(plan, str) else plan
+        return list(_plan_nodes(plan[0]["Plan"]))
+
+    def test_transaction_queries_use_indexes(self):
+        for name, path in self.endpoint_paths().items():
+            _, queries = self.capture(path)
+            tx_queries = [q["sql"] for q in queries if '"transactions"' in q["sql"]]
+            with self.subTest(endpoint=name):
+                index_names = set()
+                for sql in tx_queries:
+                    nodes = self.explain(sql)
+                    seq_scans = [
+                        n
+                        for n in nodes
+                        if n["Node Type"] == "Seq Scan"
+                        and n.get("Relation Name") == "transactions"
+                    ]
+                    self.assertFalse(seq_scans, f"{name} scans transactions:\n{sql}")
+                    index_names |= {n["Index Name"] for n in nodes if "Index Name" in n}
+                if name in USER_DATE_INDEX_ENDPOINTS:
+                    self.assertIn(USER_DATE_INDEX, index_names, name)
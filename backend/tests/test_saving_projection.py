@@ -0,0 +1,179 @@
+"""Tests for Monte Carlo saving-plan projections."""
+from datetime import date
+from decimal import Decimal
+
+from unittest import mock
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from apps.savings import projection
+from apps.savings.models import SavingPlan
+from apps.transactions import rollups
+from benchmarks.datagen import generate
+from tests.base import AuthenticatedClientMixin, SchemaTestCase
+from utils.periods import Period
+
+PLANS_URL = "/api/v1/savings/plans/"
+TODAY = date(2026, 3, 15)
+
+
+def plan(target, current=0, contribution=None, target_date=None):
+    return SavingPlan(
+        name="Goal",
+        target_amount=Decimal(target),
+        current_amount=Decimal(current),
+        monthly_contribution=Decimal(contribution) if contribution else None,
+        target_date=target_date,
+    )
+
+
+def project(plan, draws):
+    months = projection.plan_months(plan, draws) if draws.shape[0] else None
+    return projection.project(plan, months, draws.shape[1], TODAY)
+
+
+class ProjectionMathTest(SimpleTestCase):
+    def test_completion_months(self):
+        draws = np.full((3, 12), 500.0)
+        np.testing.assert_array_equal(
+            projection.completion_months(draws, 0, 1200, None), [3, 3, 3]
+        )
+        # The contribution caps what a month's surplus can put in
+        np.testing.assert_array_equal(
+            projection.completion_months(draws, 100, 1300, 100.0), [12, 12, 12]
+        )
+        self.assertTrue(
+            np.isinf(projection.completion_months(draws, 0, 1300, 100.0)).all()
+        )
+
+    def test_deficit_months_contribute_nothing(self):
+        draws = np.array([[-300.0, 200.0, 200.0], [200.0, 200.0, -50.0]])
+        np.testing.assert_array_equal(
+            projection.completion_months(draws, 0, 400, None), [3, 2]
+        )
+
+    def test_probability_by_target_date(self):
+        draws = np.full((10, 120), 500.0)
+        late = plan(1200, target_date=date(2026, 5, 1))
+        self.assertEqual(project(late, draws)["probability"], 0.0)
+        on_time = project(plan(1200, target_date=date(2026, 6, 1)), draws)
+        self.assertEqual(on_time["probability"], 1.0)
+        self.assertEqual(set(on_time["completion_dates"].values()), {"2026-06"})
+
+    def test_percentiles_follow_the_paths(self):
+        # Half the paths save 100 a month, half 1000
+        draws = np.repeat([[100.0], [1000.0]], 50, axis=0).repeat(120, axis=1)
+        payload = project(plan(3000), draws)
+        self.assertEqual(payload["probability"], 1.0)
+        self.assertEqual(payload["completion_dates"]["p10"], "2026-06")
+        self.assertEqual(payload["completion_dates"]["p90"], "2028-09")
+
+    def test_unreachable_and_reached_plans(self):
+        draws = np.full((10, 120), 10.0)
+        payload = project(plan(5000), draws)
+        self.assertEqual(payload["probability"], 0.0)
+        self.assertEqual(set(payload["completion_dates"].values()), {None})
+        reached = project(plan(100, current=150), draws)
+        self.assertEqual(reached["probability"], 1.0)
+        self.assertEqual(reached["completion_dates"]["p50"], "2026-03")
+
+    def test_no_history(self):
+        payload = project(plan(100), np.zeros((0, 120)))
+        self.assertIsNone(payload["probability"])
+        self.assertEqual(set(payload["completion_dates"].values()), {None})
+
+    def test_chunks_draw_the_same_paths(self):
+        surpluses = np.array([-200.0, 50.0, 300.0, 800.0])
+        plans = [plan(3000), plan(2000, contribution=150), plan(10, current=20)]
+        whole_draws = surpluses[
+            np.random.default_rng(7).integers(len(surpluses), size=(1000, 120))
+        ]
+        whole = [projection.plan_months(p, whole_draws) for p in plans]
+        # 700 path months a chunk: 5 paths at a time, the last chunk short
+        with mock.patch.object(projection, "CHUNK_MONTHS", 700):
+            chunked = projection.simulate(
+                plans, surpluses, 1000, 120, np.random.default_rng(7)
+            )
+        for expected, months in zip(whole, chunked):
+            np.testing.assert_array_equal(months, expected)
+
+
+class ProjectionEndpointTest(AuthenticatedClientMixin, SchemaTestCase):
+    dataset = dict(users=1, transactions=400, months=8, seed=15)
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.plans = list(SavingPlan.objects.filter(user_id=cls.user.id))
+
+    def get(self, path, params=None):
+        response = self.client.get(path, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_surpluses_come_from_complete_months(self):
+        today = date.today()
+        surpluses = projection.monthly_surpluses(self.user.id, 24, today)
+        last_month = Period.last_months(2, today).months()[0]
+        totals = rollups.totals_by_type(self.user.id, Period.month(*last_month))
+        self.assertAlmostEqual(
+            surpluses[-1],
+            float(totals.get("income", 0) - totals.get("expense", 0)),
+            places=2,
+        )
+        # Starts at the first generated month, not 24 months back
+        self.assertLessEqual(len(surpluses), 8)
+
+    def test_plan_projection(self):
+        plan = self.plans[0]
+        url = f"{PLANS_URL}{plan.id}/projection/"
+        with self.assertNumQueries(2):
+            payload = self.get(url, {"paths": 2000})
+        self.assertEqual(payload["plan_id"], str(plan.id))
+        self.assertEqual(payload["paths"], 2000)
+        self.assertGreater(payload["history_months"], 0)
+        self.assertTrue(0 <= payload["probability"] <= 1)
+        dates = [d for d in payload["completion_dates"].values() if d]
+        self.assertEqual(dates, sorted(dates))
+        # Seeded from the user id: the same history gives the same projection
+        self.assertEqual(self.get(url, {"paths": 2000}), payload)
+
+    def test_batch_matches_single_plans(self):
+        with self.assertNumQueries(2):
+            batch = self.get(f"{PLANS_URL}projections/")
+        self.assertEqual(len(batch["projections"]), len(self.plans))
+        for item in batch["projections"]:
+            single = self.get(f"{PLANS_URL}{item['plan_id']}/projection/")
+            self.assertEqual(single["probability"], item["probability"])
+            self.assertEqual(single["completion_dates"], item["completion_dates"])
+
+    def test_long_horizons_run_fewer_paths(self):
+        plan = self.plans[0]
+        plan.target_date = date(date.today().year + 60, 1, 1)
+        plan.save()
+        payload = self.get(
+            f"{PLANS_URL}{plan.id}/projection/", {"paths": projection.MAX_PATHS}
+        )
+        self.assertEqual(payload["horizon_months"], projection.MAX_HORIZON_MONTHS)
+        self.assertEqual(
+            payload["paths"],
+            projection.MAX_SIMULATED_MONTHS // projection.MAX_HORIZON_MONTHS,
+        )
+        self.assertTrue(0 <= payload["probability"] <= 1)
+
+    def test_other_users_plan(self):
+        (other,) = generate(users=1, transactions=10, months=1, seed=16)
+        other_plan = SavingPlan.objects.filter(user_id=other.id)[0]
+        response = self.client.get(f"{PLANS_URL}{other_plan.id}/projection/")
+        self.assertEqual(response.status_code, 404)
+
+    def test_invalid_params(self):
+        url = f"{PLANS_URL}{self.plans[0].id}/projection/"
+        for params in (
+            {"paths": 10},
+            {"paths": projection.MAX_PATHS + 1},
+            {"history": 1},
+        ):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get(url, params).status_code, 400)
@@ -0,0 +1,161 @@
+"""Tests for the rule registry and stored saving suggestions."""
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.savings import rules
+from apps.savings.models import SavingSuggestion
+from apps.savings.rules import SavingRuleEngine
+from apps.accounts.models import Account
+from apps.savings.suggestions import compute_suggestions
+from apps.transactions import rollups
+from apps.transactions.models import Transaction
+from apps.users.models import Profile
+from tests.base import AuthenticatedClientMixin, SchemaTestCase
+from utils.periods import Period
+
+SUGGESTIONS_URL = "/api/v1/savings/suggestions/"
+
+
+class RuleRegistryTest(TestCase):
+    def test_registered_rules_are_evaluated(self):
+        with patch.dict(rules.RULES):
+
+            @rules.register_rule("half", "Half", "Save half of any surplus.")
+            def half(income, surplus):
+                amount = surplus.clip(min=0) / 2
+                return amount, surplus > 0
+
+            result = SavingRuleEngine.suggest(Decimal("3000"), Decimal("2000"))
+        suggestions = {s["rule"]: s for s in result["suggestions"]}
+        self.assertEqual(list(suggestions)[-1], "half")
+        self.assertEqual(suggestions["half"]["suggested_monthly_amount"], 500.0)
+        self.assertNotIn("half", rules.RULES)
+
+    def test_batch_matches_single_user(self):
+        incomes = [5000, 0, 1234.56, 800]
+        expenses = [3000, 10, 1000, 900.5]
+        batch = SavingRuleEngine.payloads(incomes, expenses)
+        for payload, income, expense in zip(batch, incomes, expenses):
+            single = SavingRuleEngine.suggest(
+                Decimal(str(income)), Decimal(str(expense))
+            )
+            self.assertEqual(payload, single)
+        self.assertEqual(batch[2]["suggestions"][0]["suggested_monthly_amount"], 246.91)
+
+
+class StoredSuggestionsTest(AuthenticatedClientMixin, SchemaTestCase):
+    dataset = dict(users=3, transactions=60, months=2, seed=14)
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        Profile.objects.filter(id=cls.users[0].id).update(
+            monthly_income=Decimal("4200")
+        )
+        cls.today = date.today()
+
+    def expected(self, user):
+        income = Profile.objects.get(id=user.id).monthly_income or Decimal("0")
+        totals = rollups.totals_by_type(
+            user.id, Period.month(self.today.year, self.today.month)
+        )
+        return SavingRuleEngine.suggest(income, totals.get("expense") or Decimal("0"))
+
+    def test_batch_run_stores_every_user(self):
+        # Profiles, expense totals, one upsert: independent of the user count
+        with self.assertNumQueries(3):
+            count = compute_suggestions(self.today.year, self.today.month)
+        self.assertEqual(count, Profile.objects.count())
+        for user in self.users:
+            stored = SavingSuggestion.objects.get(
+                user_id=user.id, year=self.today.year, month=self.today.month
+            )
+            self.assertEqual(stored.payload, self.expected(user))
+
+    def test_view_reads_the_stored_row(self):
+        compute_suggestions(self.today.year, self.today.month)
+        client = self.client_for(self.users[0])
+        with self.assertNumQueries(1):
+            response = client.get(SUGGESTIONS_URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), self.expected(self.users[0]))
+        self.assertEqual(response.json()["monthly_income"], 4200.0)
+
+    def test_view_computes_a_missing_month_once(self):
+        client = self.client_for(self.users[1])
+        params = {"period": "month", "year": 2020, "month": 2}
+        first = client.get(SUGGESTIONS_URL, params)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.json()["monthly_expenses"], 0.0)
+        self.assertEqual(SavingSuggestion.objects.filter(year=2020).count(), 1)
+        with self.assertNumQueries(1):
+            self.assertEqual(client.get(SUGGESTIONS_URL, params).json(), first.json())
+
+    def test_rerun_refreshes_stored_rows(self):
+        compute_suggestions(self.today.year, self.today.month)
+        Profile.objects.filter(id=self.users[0].id).update(
+            monthly_income=Decimal("9000")
+        )
+        compute_suggestions(self.today.year, self.today.month)
+        stored = SavingSuggestion.objects.get(
+            user_id=self.users[0].id, year=self.today.year, month=self.today.month
+        )
+        self.assertEqual(stored.payload["monthly_income"], 9000.0)
+        self.assertEqual(SavingSuggestion.objects.count(), len(self.users))
+
+    def test_command(self):
+        out = StringIO()
+        call_command(
+            "compute_saving_suggestions", "--year", "2025", "--month", "3", stdout=out
+        )
+        self.assertIn(f"Stored suggestions for {len(self.users)} users", out.getvalue())
+        self.assertEqual(SavingSuggestion.objects.filter(year=2025, month=3).count(), 3)
+
+    def expenses(self, client, params):
+        return client.get(SUGGESTIONS_URL, params).json()["monthly_expenses"]
+
+    def test_writes_after_a_read_change_the_payload(self):
+        user = self.users[0]
+        client = self.client_for(user)
+        account = Account.objects.filter(user_id=user.id)[0]
+        past = {"period": "month", "year": 2020, "month": 2}
+        self.assertEqual(self.expenses(client, past), 0)
+
+        response = client.post(
+            "/api/v1/transactions/",
+            {
+                "account_id": str(account.id),
+                "type": "expense",
+                "amount": "250.00",
+                "transaction_date": "2020-02-29",
+            },
+        )
+        self.assertEqual(response.status_code, 201)
+        # The rollup trigger is PostgreSQL-only; mirror it here
+        rollups.rebuild_rollups(user.id)
+        self.assertEqual(self.expenses(client, past), 250.0)
+
+        Transaction.objects.filter(id=response.json()["id"]).delete()
+        rollups.rebuild_rollups(user.id)
+        self.assertEqual(self.expenses(client, past), 0)
+
+        self.assertEqual(client.get(SUGGESTIONS_URL).json()["monthly_income"], 4200.0)
+        # As a Data API write would, with the updated_at trigger
+        Profile.objects.filter(id=user.id).update(
+            monthly_income=Decimal("6100"), updated_at=timezone.now()
+        )
+        with self.assertNumQueries(4):
+            self.assertEqual(
+                client.get(SUGGESTIONS_URL).json()["monthly_income"], 6100.0
+            )
+
+    def test_missing_profile(self):
+        Profile.objects.filter(id=self.users[2].id).delete()
+        response = self.client_for(self.users[2]).get(SUGGESTIONS_URL)
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,143 @@
+"""Tests for ranked transaction search."""
+import unittest
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test import SimpleTestCase
+
+from apps.accounts.models import Account
+from apps.transactions.models import Transaction
+from apps.transactions.search import search_terms
+from benchmarks.datagen import generate
+from tests.base import AuthenticatedClientMixin, SchemaTestCase
+
+TRANSACTIONS_URL = "/api/v1/transactions/"
+
+
+class SearchTermsTest(SimpleTestCase):
+    def test_words_only(self):
+        self.assertEqual(search_terms('Ride-Share "NEAR" *'), ["ride", "share", "near"])
+        self.assertEqual(search_terms("café 42"), ["café", "42"])
+        self.assertEqual(search_terms(" & | ( ) "), [])
+
+    def test_term_cap(self):
+        self.assertEqual(len(search_terms(" ".join("abcdefghijklmnop"))), 8)
+
+
+class TransactionSearchTest(AuthenticatedClientMixin, SchemaTestCase):
+    dataset = dict(users=1, transactions=200, months=2, seed=21)
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.checking, cls.wallet = Account.objects.filter(
+            user_id=cls.user.id, name__in=["Checking", "Wallet"]
+        ).order_by("name")
+        today = date.today()
+        cls.in_description = cls.add("Airport Shuttle", "", cls.checking, today)
+        cls.in_notes = cls.add(
+            "Taxi", "shuttle to the airport", cls.wallet, today - timedelta(1)
+        )
+        cls.income = cls.add(
+            "Airport refund", "", cls.checking, today, type="income"
+        )
+
+    @classmethod
+    def add(cls, description, notes, account, day, type="expense"):
+        return Transaction.objects.create(
+            user_id=cls.user.id,
+            account_id=account.id,
+            type=type,
+            amount=Decimal("20"),
+            description=description,
+            notes=notes,
+            transaction_date=day,
+        )
+
+    def ids(self, **params):
+        response = self.client.get(TRANSACTIONS_URL, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return [row["id"] for row in response.json()["results"]]
+
+    def test_description_outranks_notes(self):
+        self.assertEqual(
+            self.ids(search="airport shuttle"),
+            [str(self.in_description.id), str(self.in_notes.id)],
+        )
+
+    def test_prefix_terms(self):
+        self.assertEqual(
+            self.ids(search="airp shut"),
+            [str(self.in_description.id), str(self.in_notes.id)],
+        )
+        self.assertEqual(
+            set(self.ids(search="AIRPORT")),
+            {str(self.in_description.id), str(self.in_notes.id), str(self.income.id)},
+        )
+
+    def test_combines_with_filters(self):
+        self.assertEqual(
+            self.ids(search="airport", type="income"), [str(self.income.id)]
+        )
+        self.assertEqual(
+            self.ids(search="airport", account_id=str(self.wallet.id)),
+            [str(self.in_notes.id)],
+        )
+
+    def test_summary_totals_only_matches(self):
+        response = self.client.get(
+            f"{TRANSACTIONS_URL}summary/", {"search": "airport"}
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(
+            [(row["category_id"], row["total"], row["count"]) for row in response.json()],
+            [(None, "40.00", 2)],
+        )
+
+    def test_matches_every_generated_row(self):
+        expected = Transaction.objects.filter(
+            user_id=self.user.id, description="Ride Share"
+        ).count()
+        self.assertGreater(expected, 0)
+        response = self.client.get(TRANSACTIONS_URL, {"search": "ride share"})
+        self.assertEqual(response.json()["count"], expected)
+
+    def test_cursor_pages_by_date(self):
+        response = self.client.get(
+            TRANSACTIONS_URL, {"search": "airport", "pagination": "cursor"}
+        )
+        dates = [row["transaction_date"] for row in response.json()["results"]]
+        self.assertEqual(len(dates), 3)
+        self.assertEqual(dates, sorted(dates, reverse=True))
+
+    def test_index_follows_updates_and_deletes(self):
+        Transaction.objects.filter(id=self.in_description.id).update(
+            description="Harbour ferry"
+        )
+        self.assertEqual(self.ids(search="ferry"), [str(self.in_description.id)])
+        self.assertNotIn(str(self.in_description.id), self.ids(search="airport"))
+        Transaction.objects.filter(id=self.in_notes.id).delete()
+        self.assertEqual(self.ids(search="airport"), [str(self.income.id)])
+
+    def test_no_terms(self):
+        self.assertEqual(self.ids(search="!!"), [])
+        self.assertEqual(len(self.ids(search="")), 50)
+
+    def test_other_users_rows(self):
+        (other,) = generate(users=1, transactions=20, months=1, seed=22)
+        Transaction.objects.create(
+            user_id=other.id,
+            account_id=Account.objects.filter(user_id=other.id)[0].id,
+            type="expense",
+            amount=Decimal("5"),
+            description="Airport parking",
+            transaction_date=date.today(),
+        )
+        self.assertEqual(len(self.ids(search="airport")), 3)
+
+    @unittest.skipUnless(
+        connection.vendor == "postgresql", "trigram matching is PostgreSQL-only"
+    )
+    def test_misspelled_merchant(self):
+        self.assertEqual(self.ids(search="airprot")[0], str(self.in_description.id))
@@ -0,0 +1,127 @@
+"""Tests for the values_list() list path and the orjson renderer."""
+import uuid
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+from django.utils.translation import gettext_lazy
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+from apps.accounts.models import Account
+from apps.accounts.serializers import AccountSerializer
+from apps.budgets.serializers import BudgetPlanSerializer
+from apps.transactions.models import Transaction
+from apps.transactions.serializers import TransactionSerializer
+from tests.base import AuthenticatedClientMixin, SchemaTestCase
+from utils.renderers import ORJSONRenderer
+from utils.rows import RowEncoder, row_encoder
+
+LIST_PATHS = [
+    "/api/v1/transactions/",
+    "/api/v1/transactions/?page=2&page_size=40",
+    "/api/v1/transactions/?pagination=cursor&page_size=25",
+    "/api/v1/transactions/?type=expense&period=rolling&days=20",
+    "/api/v1/accounts/",
+    "/api/v1/budgets/",
+    "/api/v1/budgets/?page_size=5",
+]
+
+
+class RowListTest(AuthenticatedClientMixin, SchemaTestCase):
+    dataset = dict(users=1, transactions=300, months=2, seed=3)
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        account_id = cls.user.account_ids[0]
+        Transaction.objects.create(
+            user_id=cls.user.id,
+            account_id=account_id,
+            type=Transaction.TYPE_EXPENSE,
+            amount=Decimal("12.5"),
+            description="Café \u2028 über \U0001f600",
+            notes='quote " backslash \\ tab \t',
+            transaction_date=date.today(),
+        )
+        Account.objects.filter(id=account_id).update(credit_limit=None, provider="")
+
+    def get(self, path, fast):
+        with override_settings(FAST_LIST_READS=fast):
+            response = self.client.get(path, HTTP_ACCEPT="application/json")
+        self.assertEqual(response.status_code, 200, path)
+        return response
+
+    def test_list_responses_are_byte_identical(self):
+        for path in LIST_PATHS:
+            with self.subTest(path=path):
+                self.assertEqual(
+                    self.get(path, fast=True).content, self.get(path, fast=False).content
+                )
+
+    def test_cursor_pages_follow_the_same_links(self):
+        fast = self.get("/api/v1/transactions/?pagination=cursor", fast=True).json()
+        slow = self.get("/api/v1/transactions/?pagination=cursor", fast=False).json()
+        self.assertIsNotNone(fast["next"])
+        self.assertEqual(fast["next"], slow["next"])
+
+    def test_lists_render_identically_with_orjson(self):
+        for path in LIST_PATHS:
+            with self.subTest(path=path):
+                data = self.get(path, fast=True).data
+                self.assertEqual(
+                    ORJSONRenderer().render(data), JSONRenderer().render(data)
+                )
+
+    def test_falls_back_for_unsupported_serializers(self):
+        class MethodFieldSerializer(serializers.ModelSerializer):
+            label = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Transaction
+                fields = ["id", "label"]
+
+            def get_label(self, obj):
+                return str(obj)
+
+        self.assertIsNone(row_encoder(MethodFieldSerializer))
+        self.assertIsNone(row_encoder(serializers.Serializer))
+        for serializer_class in (TransactionSerializer, AccountSerializer, BudgetPlanSerializer):
+            self.assertIsInstance(row_encoder(serializer_class), RowEncoder)
+
+
+class ORJSONRendererTest(TestCase):
+    def assertSameBytes(self, data):
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_matches_json_renderer(self):
+        self.assertSameBytes(
+            {
+                "id": uuid.UUID("5e6f0f0e-3a43-4bb5-9f3c-7a6c1e9c0d11"),
+                "amount": Decimal("1234.50"),
+                "ratio": 0.125,
+                "count": 3,
+                "active": True,
+                "missing": None,
+                "date": date(2026, 3, 1),
+                "utc": datetime(2026, 3, 1, 12, 30, 5, 123456, tzinfo=dt_timezone.utc),
+                "naive": datetime(2026, 3, 1, 12, 30),
+                "text": "line\u2028para\u2029 é \U0001f600 \"q\" \\ \n",
+                "lazy": gettext_lazy("Uncategorized"),
+                "nested": [{"a": [1, 2.5, "x"]}, (), {}],
+            }
+        )
+
+    def test_falls_back_for_values_orjson_rejects(self):
+        self.assertSameBytes({"big": 2**70})
+        self.assertSameBytes({1: "non-string key"})
+
+    def test_indent_uses_json_renderer(self):
+        data = {"a": [1, 2]}
+        self.assertEqual(
+            ORJSONRenderer().render(data, "application/json; indent=2"),
+            JSONRenderer().render(data, "application/json; indent=2"),
+        )
+
+    def test_none_renders_empty(self):
+        self.assertEqual(ORJSONRenderer().render(None), b"")
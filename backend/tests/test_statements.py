@@ -0,0 +1,174 @@
+"""Tests for credit card statement cycles."""
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+
+from apps.accounts.models import Account
+from apps.accounts.statements import StatementCycle, minimum_due
+from apps.transactions.models import Transaction
+from tests.base import AuthenticatedClientMixin, SchemaTestCase
+
+CARDS_URL = "/api/v1/accounts/credit_cards/"
+
+
+class StatementCycleTest(SimpleTestCase):
+    def cycle(self, billing_day, today):
+        c = StatementCycle.for_billing_day(billing_day, today)
+        return c.previous_close, c.last_close, c.next_close
+
+    def test_mid_month(self):
+        self.assertEqual(
+            self.cycle(5, date(2026, 3, 15)),
+            (date(2026, 2, 5), date(2026, 3, 5), date(2026, 4, 5)),
+        )
+
+    def test_closing_today_is_still_the_current_cycle(self):
+        self.assertEqual(
+            self.cycle(15, date(2026, 3, 15)),
+            (date(2026, 1, 15), date(2026, 2, 15), date(2026, 3, 15)),
+        )
+
+    def test_short_months_close_on_their_last_day(self):
+        self.assertEqual(
+            self.cycle(31, date(2026, 3, 10)),
+            (date(2026, 1, 31), date(2026, 2, 28), date(2026, 3, 31)),
+        )
+        self.assertEqual(
+            self.cycle(30, date(2024, 3, 1)),
+            (date(2024, 1, 30), date(2024, 2, 29), date(2024, 3, 30)),
+        )
+
+    def test_year_boundary(self):
+        self.assertEqual(
+            self.cycle(20, date(2026, 1, 10)),
+            (date(2025, 11, 20), date(2025, 12, 20), date(2026, 1, 20)),
+        )
+
+    def test_payment_due(self):
+        cycle = StatementCycle.for_billing_day(5, date(2026, 3, 15))
+        self.assertEqual(cycle.payment_due(25), date(2026, 3, 25))
+        self.assertEqual(cycle.payment_due(5), date(2026, 4, 5))
+        cycle = StatementCycle.for_billing_day(20, date(2026, 2, 1))
+        self.assertEqual(cycle.payment_due(31), date(2026, 1, 31))
+        self.assertEqual(cycle.payment_due(10), date(2026, 2, 10))
+        cycle = StatementCycle.for_billing_day(31, date(2026, 2, 10))
+        self.assertEqual(cycle.payment_due(30), date(2026, 2, 28))
+
+    def test_minimum_due(self):
+        self.assertEqual(minimum_due(Decimal("1000")), Decimal("50.00"))
+        self.assertEqual(minimum_due(Decimal("40")), Decimal("10.00"))
+        self.assertEqual(minimum_due(Decimal("4.50")), Decimal("4.50"))
+        self.assertEqual(minimum_due(Decimal("-20")), Decimal("0.00"))
+
+
+class CreditCardStatementsTest(AuthenticatedClientMixin, SchemaTestCase):
+    dataset = dict(users=1, transactions=200, months=3, seed=17)
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        today = date.today()
+        cls.cycle = StatementCycle.for_billing_day(5, today)
+        cls.bank = Account.objects.filter(user_id=cls.user.id, type="bank")[0]
+        cls.card = Account.objects.create(
+            user_id=cls.user.id,
+            name="Test card",
+            type=Account.TYPE_CREDIT_CARD,
+            credit_limit=Decimal("2000"),
+            billing_date=5,
+            due_date=25,
+            # 300 charged in the statement, 50 more since; 100 paid since
+            current_balance=Decimal("-250"),
+        )
+        cls.no_cycle = Account.objects.create(
+            user_id=cls.user.id,
+            name="Old card",
+            type=Account.TYPE_CREDIT_CARD,
+            current_balance=Decimal("-10"),
+        )
+        last = cls.cycle.last_close
+        for day, tx_type, amount in [
+            (cls.cycle.previous_close, "expense", "999"),  # an older statement
+            (cls.cycle.previous_close + timedelta(1), "expense", "280"),
+            (last, "expense", "40"),
+            (last, "income", "20"),  # refund
+            (last + timedelta(1), "expense", "50"),
+        ]:
+            cls.add(day, tx_type, amount)
+        cls.add(
+            last + timedelta(1),
+            "transfer",
+            "100",
+            account_id=cls.bank.id,
+            transfer_to_account_id=cls.card.id,
+        )
+
+    @classmethod
+    def add(cls, day, tx_type, amount, **fields):
+        Transaction.objects.create(
+            user_id=cls.user.id,
+            account_id=fields.pop("account_id", cls.card.id),
+            type=tx_type,
+            amount=Decimal(amount),
+            transaction_date=day,
+            **fields,
+        )
+
+    def cards(self):
+        response = self.client.get(CARDS_URL)
+        self.assertEqual(response.status_code, 200)
+        return {card["id"]: card for card in response.json()}
+
+    def test_statement_and_current_cycle(self):
+        card = self.cards()[str(self.card.id)]
+        last = self.cycle.last_close
+        due = self.cycle.payment_due(25)
+        self.assertEqual(
+            card["statement"],
+            {
+                "start": (self.cycle.previous_close + timedelta(1)).isoformat(),
+                "end": last.isoformat(),
+                "charges": 320.0,
+                "credits": 20.0,
+                "balance": 300.0,
+                "minimum_due": 15.0,
+                "due_date": due.isoformat(),
+                "days_until_due": (due - date.today()).days,
+            },
+        )
+        self.assertEqual(
+            card["current_cycle"],
+            {
+                "start": (last + timedelta(1)).isoformat(),
+                "end": self.cycle.next_close.isoformat(),
+                "charges": 50.0,
+                "credits": 100.0,
+            },
+        )
+        self.assertEqual(card["utilization"], 12.5)
+
+    def test_card_without_billing_date(self):
+        card = self.cards()[str(self.no_cycle.id)]
+        self.assertIsNone(card["statement"])
+        self.assertIsNone(card["current_cycle"])
+        self.assertIsNone(card["utilization"])
+
+    def test_queries_do_not_grow_with_cards(self):
+        for i in range(5):
+            Account.objects.create(
+                user_id=self.user.id,
+                name=f"Extra {i}",
+                type=Account.TYPE_CREDIT_CARD,
+                credit_limit=Decimal("500"),
+                billing_date=28 + i % 4,
+            )
+        with self.assertNumQueries(2):
+            cards = self.cards()
+        del cards[str(self.no_cycle.id)]
+        self.assertTrue(all(card["statement"] for card in cards.values()))
+
+    def test_dashboard_cards(self):
+        response = self.client.get("/api/v1/dashboard/")
+        cards = {card["id"]: card for card in response.json()["credit_cards"]}
+        self.assertEqual(cards[str(self.card.id)]["statement"]["balance"], 300.0)
@@ -0,0 +1,149 @@
+"""Tests for the delta sync endpoint and its tombstones."""
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.accounts.models import Account
+from apps.budgets.models import BudgetPlan
+from apps.categories.models import Category
+from apps.savings.models import SavingPlan
+from apps.sync.models import Tombstone
+from apps.sync.views import DELETED, SYNC_ENTITIES, SyncView, encode_cursor
+from apps.transactions.models import Transaction
+from tests.base import AuthenticatedClientMixin, SchemaTestCase
+
+SYNC_URL = "/api/v1/sync/"
+MODELS = [Account, Category, Transaction, BudgetPlan, SavingPlan]
+
+
+class SyncViewTest(AuthenticatedClientMixin, SchemaTestCase):
+    dataset = dict(users=2, transactions=60, months=2, seed=7)
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        # Everything last changed a day ago, well outside the cursor overlap
+        cls.changed_at = timezone.now() - timedelta(days=1)
+        for model in MODELS:
+            model.objects.update(updated_at=cls.changed_at)
+
+    def sync(self, since=None):
+        response = self.client.get(SYNC_URL, {"since": since} if since else {})
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def ids(self, payload, key):
+        return {row["id"] for row in payload[key]}
+
+    def test_initial_sync_returns_everything(self):
+        payload = self.sync()
+        self.assertTrue(payload["reset"])
+        self.assertFalse(payload["has_more"])
+        for key, (model, _) in SYNC_ENTITIES.items():
+            ids = model.objects.filter(user_id=self.user.id).values_list("id", flat=True)
+            self.assertEqual(self.ids(payload, key), {str(pk) for pk in ids}, key)
+        self.assertIn("updated_at", payload["categories"][0])
+
+    def test_idle_sync_is_empty_and_cheap(self):
+        cursor = self.sync()["cursor"]
+        with self.assertNumQueries(6):
+            payload = self.sync(cursor)
+        self.assertFalse(payload["reset"])
+        for key in SYNC_ENTITIES:
+            self.assertEqual(payload[key], [], key)
+            self.assertEqual(payload[DELETED][key], [], key)
+
+    def test_changes_and_deletes_since_cursor(self):
+        cursor = self.sync()["cursor"]
+        tx = Transaction.objects.filter(user_id=self.user.id, type="expense")[0]
+        response = self.client.patch(
+            f"/api/v1/transactions/{tx.id}/",
+            {"description": "Edited", "amount": "5.00"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        plan = SavingPlan.objects.filter(user_id=self.user.id)[0]
+        self.assertEqual(
+            self.client.delete(f"/api/v1/savings/plans/{plan.id}/").status_code, 204
+        )
+        Transaction.objects.filter(user_id=self.other.id).update(description="Other")
+
+        payload = self.sync(cursor)
+        self.assertEqual(self.ids(payload, "transactions"), {str(tx.id)})
+        self.assertEqual(payload["transactions"][0]["description"], "Edited")
+        self.assertEqual(payload[DELETED]["saving_plans"], [str(plan.id)])
+        self.assertEqual(payload["saving_plans"], [])
+
+    def test_pages_cover_every_row_once(self):
+        # All rows share one updated_at, so paging relies on the id tie-break
+        seen = {key: [] for key in SYNC_ENTITIES}
+        cursor, calls = None, 0
+        with patch.object(SyncView, "page_size", 25):
+            while True:
+                payload = self.sync(cursor)
+                calls += 1
+                for key in SYNC_ENTITIES:
+                    seen[key] += [row["id"] for row in payload[key]]
+                cursor = payload["cursor"]
+                if not payload["has_more"]:
+                    break
+        self.assertGreater(calls, 2)
+        for key, (model, _) in SYNC_ENTITIES.items():
+            self.assertEqual(len(seen[key]), len(set(seen[key])), key)
+            self.assertEqual(
+                len(seen[key]), model.objects.filter(user_id=self.user.id).count(), key
+            )
+
+    def test_recent_changes_are_sent_again_within_the_overlap(self):
+        cursor = self.sync()["cursor"]
+        Category.objects.filter(user_id=self.user.id, name="Salary").update(
+            name="Wages", updated_at=timezone.now()
+        )
+        first = self.sync(cursor)
+        second = self.sync(first["cursor"])
+        self.assertEqual([row["name"] for row in first["categories"]], ["Wages"])
+        self.assertEqual(second["categories"], first["categories"])
+
+    def test_expired_cursor_resets(self):
+        old = timezone.now() - timedelta(days=365)
+        cursor = encode_cursor({DELETED: (old, 0)})
+        payload = self.sync(cursor)
+        self.assertTrue(payload["reset"])
+        self.assertEqual(
+            len(payload["accounts"]), Account.objects.filter(user_id=self.user.id).count()
+        )
+
+    def test_invalid_cursor(self):
+        for cursor in ("garbage", encode_cursor({"nope": (timezone.now(), 0)})):
+            response = self.client.get(SYNC_URL, {"since": cursor})
+            self.assertEqual(response.status_code, 400)
+
+    def test_requires_authentication(self):
+        self.assertEqual(APIClient().get(SYNC_URL).status_code, 401)
+
+
+class TombstoneTest(SchemaTestCase):
+    dataset = dict(users=1, transactions=20, months=1, seed=8)
+
+    def test_deletes_write_tombstones(self):
+        account_id = self.user.account_ids[0]
+        Account.objects.get(id=account_id).delete()
+        tombstone = Tombstone.objects.get(object_id=account_id)
+        self.assertEqual(tombstone.entity, "accounts")
+        self.assertEqual(tombstone.user_id, self.user.id)
+        self.assertLess(abs(tombstone.deleted_at - timezone.now()), timedelta(minutes=1))
+
+    def test_purge_removes_old_tombstones(self):
+        Transaction.objects.filter(user_id=self.user.id).delete()
+        count = Tombstone.objects.count()
+        Tombstone.objects.filter(id__lte=Tombstone.objects.order_by("id")[4].id).update(
+            deleted_at=timezone.now() - timedelta(days=100)
+        )
+        out = StringIO()
+        call_command("purge_sync_tombstones", "--days", "90", stdout=out)
+        self.assertIn("Deleted 5 tombstones", out.getvalue())
+        self.assertEqual(Tombstone.objects.count(), count - 5)
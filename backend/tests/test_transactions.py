@@ -1,7 +1,10 @@
-"""Tests for Transaction serializer validation."""
+"""Tests for Transaction serializer validation and pagination."""
+import uuid
+from datetime import date, datetime, timezone
 from django.test import TestCase
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import NotFound, ValidationError
 
+from apps.transactions.pagination import TransactionCursorPagination
 from apps.transactions.serializers import TransactionSerializer
 
 
@@ -47,3 +50,20 @@ class TransactionSerializerTest(TestCase):
             )
         )
         self.assertTrue(serializer.is_valid(), serializer.errors)
+
+
+class TransactionCursorTest(TestCase):
+    def test_cursor_round_trip(self):
+        paginator = TransactionCursorPagination()
+        tx_id = uuid.uuid4()
+        created_at = datetime(2026, 2, 8, 10, 30, 15, 123456, tzinfo=timezone.utc)
+        cursor = paginator.encode_cursor(date(2026, 2, 8), created_at, tx_id)
+        self.assertEqual(
+            paginator.decode_cursor(cursor), (date(2026, 2, 8), created_at, tx_id)
+        )
+
+    def test_invalid_cursor_rejected(self):
+        paginator = TransactionCursorPagination()
+        for cursor in ["garbage", "bm90fGF8Y3Vyc29y", ""]:
+            with self.assertRaises(NotFound):
+                paginator.decode_cursor(cursor)
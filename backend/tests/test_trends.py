@@ -0,0 +1,123 @@
+"""Tests for the spending trends endpoint."""
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+from django.core.cache import cache
+from django.db.models import Sum
+from django.test import SimpleTestCase
+
+from apps.transactions import trends
+from apps.transactions.models import Transaction
+from tests.base import AuthenticatedClientMixin, SchemaTestCase
+from utils.periods import Period
+
+TRENDS_URL = "/api/v1/transactions/trends/"
+
+
+class TrendMathTest(SimpleTestCase):
+    def test_build_matrix_zero_fills_and_sorts(self):
+        months = [(2026, 1), (2026, 2), (2026, 3)]
+        rows = [
+            (2026, 1, "a", Decimal("5")),
+            (2026, 3, "b", Decimal("20")),
+            (2026, 3, "a", Decimal("1")),
+            (2025, 12, "c", Decimal("99")),  # outside the window
+        ]
+        keys, matrix = trends.build_matrix(rows, months)
+        self.assertEqual(keys, ["b", "a"])
+        np.testing.assert_array_equal(matrix, [[0, 0, 20], [5, 0, 1]])
+
+    def test_empty(self):
+        keys, matrix = trends.build_matrix([], [(2026, 1)])
+        self.assertEqual((keys, matrix.shape), ([], (0, 1)))
+
+    def test_moving_average_and_change(self):
+        matrix = np.array([[3.0, 6.0, 9.0, 0.0]])
+        np.testing.assert_allclose(
+            trends.moving_average(matrix, 2), [[3.0, 4.5, 7.5, 4.5]]
+        )
+        np.testing.assert_allclose(
+            trends.moving_average(matrix, 10), [[3.0, 4.5, 6.0, 4.5]]
+        )
+        np.testing.assert_array_equal(
+            trends.month_over_month(matrix), [[np.nan, 3.0, 3.0, -9.0]]
+        )
+
+
+class TrendsEndpointTest(AuthenticatedClientMixin, SchemaTestCase):
+    dataset = dict(users=1, transactions=300, months=6, seed=13)
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def trends(self, **params):
+        response = self.client.get(TRENDS_URL, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_category_totals_match_monthly_summaries(self):
+        payload = self.trends(months=6)
+        self.assertEqual(len(payload["months"]), 6)
+        self.assertEqual(payload["months"][-1], date.today().strftime("%Y-%m"))
+        by_key = {s["key"]: s for s in payload["series"]}
+        for i, month in enumerate(payload["months"]):
+            year, month = map(int, month.split("-"))
+            summary = self.client.get(
+                "/api/v1/transactions/summary/",
+                {"period": "month", "year": year, "month": month},
+            ).json()
+            for row in summary:
+                series = by_key[row["category_id"]]
+                self.assertEqual(series["totals"][i], float(row["total"]))
+                self.assertEqual(series["label"], row["category_name"])
+            self.assertAlmostEqual(
+                payload["total"]["totals"][i],
+                sum(float(row["total"]) for row in summary),
+                places=2,
+            )
+
+    def test_series_are_dense_and_largest_first(self):
+        payload = self.trends(months=24, window=3)
+        sums = [sum(s["totals"]) for s in payload["series"]]
+        self.assertEqual(sums, sorted(sums, reverse=True))
+        for series in payload["series"] + [payload["total"]]:
+            self.assertEqual(len(series["totals"]), 24)
+            self.assertEqual(len(series["moving_average"]), 24)
+            self.assertIsNone(series["change"][0])
+        # Before the generated history every month is a zero, not a gap
+        self.assertEqual(payload["total"]["totals"][:12], [0.0] * 12)
+
+    def test_group_by_account(self):
+        payload = self.trends(months=6, group_by="account", type="income")
+        expected = Transaction.objects.filter(
+            user_id=self.user.id, type="income"
+        ).filter(Period.last_months(6).q())
+        for series in payload["series"]:
+            total = expected.filter(account_id=series["key"]).aggregate(t=Sum("amount"))
+            self.assertAlmostEqual(sum(series["totals"]), float(total["t"]), places=2)
+            self.assertIsNotNone(series["label"])
+
+    def test_group_by_type(self):
+        payload = self.trends(months=3, group_by="type")
+        self.assertIsNone(payload["type"])
+        self.assertEqual(
+            {s["key"] for s in payload["series"]}, {"income", "expense", "transfer"}
+        )
+
+    def test_one_query_with_warm_metadata(self):
+        self.trends()
+        with self.assertNumQueries(1):
+            self.trends(months=24)
+
+    def test_invalid_params(self):
+        for params in (
+            {"group_by": "payee"},
+            {"type": "refund"},
+            {"months": 0},
+            {"months": trends.MAX_MONTHS + 1},
+            {"window": "x"},
+        ):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get(TRENDS_URL, params).status_code, 400)
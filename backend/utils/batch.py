@@ -0,0 +1,155 @@
+"""Batched GET requests.
+
+POST /batch/ with {"paths": ["accounts/", "budgets/progress/?month=3", ...]}
+runs each path (relative to /api/v1/) as a GET through its view, in-process,
+and returns {"responses": [{"path", "status", "body"}, ...]} in the same
+order. The batch request is authenticated once; sub-requests reuse its user
+and token instead of verifying the JWT again.
+"""
+import asyncio
+import contextvars
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.db import connection
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .workers import run_task
+
+logger = logging.getLogger(__name__)
+
+API_URLCONF = "config.api_urls"
+API_PREFIX = "/api/v1/"
+BATCH_MAX_REQUESTS = 20
+
+# Request metadata that describes the batch body rather than a GET
+_BODY_META = ("CONTENT_TYPE", "CONTENT_LENGTH", "HTTP_CONTENT_TYPE", "wsgi.input")
+
+_batch_executor = ThreadPoolExecutor(
+    max_workers=max(settings.BATCH_MAX_WORKERS, 1), thread_name_prefix="batch-request"
+)
+
+
+def _error(path, status_code, detail):
+    return {"path": path, "status": status_code, "body": {"detail": detail}}
+
+
+def _response_body(response):
+    if isinstance(response, Response):
+        return response.data
+    content_type = response.get("Content-Type", "")
+    if content_type.startswith("application/json") and response.content:
+        return json.loads(response.content)
+    return response.content.decode() or None
+
+
+async def _await(awaitable):
+    return await awaitable
+
+
+class BatchView(APIView):
+    """
+    POST /batch/
+    Body: {"paths": [relative GET path, ...]} (at most BATCH_MAX_REQUESTS)
+    Each item gets its own status code; the batch itself returns 200.
+
+    Items run concurrently on BATCH_MAX_WORKERS threads, each with its own
+    database connection, except inside a transaction (e.g. ATOMIC_REQUESTS),
+    where other connections would not see its writes and items run in order.
+    """
+
+    def post(self, request):
+        paths = request.data.get("paths") if isinstance(request.data, dict) else None
+        if not isinstance(paths, list) or not all(isinstance(p, str) for p in paths):
+            raise ValidationError({"paths": "Expected a list of paths."})
+        if len(paths) > BATCH_MAX_REQUESTS:
+            raise ValidationError(
+                {"paths": f"At most {BATCH_MAX_REQUESTS} paths per batch."}
+            )
+
+        tasks = [self.subrequest_task(request, path) for path in paths]
+        concurrent = (
+            len(tasks) > 1
+            and settings.BATCH_MAX_WORKERS > 1
+            and not connection.in_atomic_block
+        )
+        return Response({"responses": run_tasks(tasks, concurrent)})
+
+    def subrequest_task(self, request, path):
+        """A callable returning the envelope item for GET `path`."""
+        parts = urlsplit(path)
+        if parts.scheme or parts.netloc or parts.fragment:
+            return lambda: _error(
+                path, status.HTTP_400_BAD_REQUEST, "Expected a relative path."
+            )
+        route = "/" + parts.path.lstrip("/")
+        try:
+            match = resolve(route, urlconf=API_URLCONF)
+        except Resolver404:
+            return lambda: _error(path, status.HTTP_404_NOT_FOUND, "Not found.")
+        if getattr(match.func, "view_class", None) is type(self):
+            return lambda: _error(
+                path, status.HTTP_400_BAD_REQUEST, "Batches cannot nest."
+            )
+
+        sub = HttpRequest()
+        sub.method = "GET"
+        sub.path = sub.path_info = API_PREFIX + route.lstrip("/")
+        sub.META = {k: v for k, v in request.META.items() if k not in _BODY_META}
+        sub.META.update(
+            REQUEST_METHOD="GET",
+            PATH_INFO=sub.path_info,
+            QUERY_STRING=parts.query,
+            HTTP_ACCEPT="application/json",
+        )
+        sub.GET = QueryDict(parts.query)
+        sub.resolver_match = match
+        # DRF's Request takes these in place of running the authenticators
+        sub._force_auth_user = request.user
+        sub._force_auth_token = request.auth
+
+        def task():
+            try:
+                response = match.func(sub, *match.args, **match.kwargs)
+                if asyncio.iscoroutine(response):
+                    response = async_to_sync(_await)(response)
+                if response.streaming:
+                    response.close()
+                    return _error(
+                        path,
+                        status.HTTP_400_BAD_REQUEST,
+                        "Streaming responses cannot be batched.",
+                    )
+                return {
+                    "path": path,
+                    "status": response.status_code,
+                    "body": _response_body(response),
+                }
+            except Exception:
+                logger.exception("batch item failed: %s", path)
+                return _error(
+                    path, status.HTTP_500_INTERNAL_SERVER_ERROR, "Internal server error."
+                )
+
+        return task
+
+
+def run_tasks(tasks, concurrent: bool) -> list:
+    if concurrent:
+        # Each task in a copy of the request's context, for its metrics
+        contexts = [contextvars.copy_context() for _ in tasks]
+        return list(
+            _batch_executor.map(
+                lambda context, task: context.run(run_task, task), contexts, tasks
+            )
+        )
+    return [task() for task in tasks]
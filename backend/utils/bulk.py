@@ -0,0 +1,159 @@
+"""Bulk writes for replaying an offline queue in one request.
+
+POST /<resource>/bulk/ with
+
+    {"operations": [
+        {"op": "create", "id": "<client uuid>", "data": {...}},
+        {"op": "update", "id": "<uuid>", "data": {...}},   # partial
+        {"op": "delete", "id": "<uuid>"}
+    ]}
+
+applies the operations in order inside one database transaction. Either all
+of them are applied (200) or none are (400); the response lists a result
+per operation either way:
+
+    {"results": [{"op", "id", "status", "data" | "errors"}, ...]}
+
+Each operation runs in its own savepoint, so one that breaks a database
+constraint (say a second budget for the same category and month) reports
+409 and the operations after it still get their own results. Valid
+operations of a batch that failed report status 424.
+"""
+import uuid
+
+from django.db import IntegrityError, transaction as db_transaction
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .serializers import prefetch_owned_ids
+
+OP_CREATE = "create"
+OP_UPDATE = "update"
+OP_DELETE = "delete"
+OPERATIONS = (OP_CREATE, OP_UPDATE, OP_DELETE)
+
+
+def _parse_id(value):
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+class BulkWriteMixin:
+    """
+    ModelViewSet mixin adding the `bulk` action. Rows targeted by updates and
+    deletes, id conflicts for creates and the serializer's owned references
+    are each loaded with one query before any operation runs; creates,
+    updates and deletes go through perform_create/update/destroy as usual.
+    """
+
+    bulk_max_operations = 500
+
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        operations = (
+            request.data.get("operations") if isinstance(request.data, dict) else None
+        )
+        if not isinstance(operations, list) or not all(
+            isinstance(op, dict) for op in operations
+        ):
+            raise ValidationError({"operations": "Expected a list of operations."})
+        if len(operations) > self.bulk_max_operations:
+            raise ValidationError(
+                {"operations": f"At most {self.bulk_max_operations} operations."}
+            )
+
+        ids = [_parse_id(op.get("id")) for op in operations]
+        model = self.get_serializer_class().Meta.model
+        creates, targets = [], []
+        for pk, op in zip(ids, operations):
+            if pk is not None:
+                (creates if op.get("op") == OP_CREATE else targets).append(pk)
+        instances = {obj.id: obj for obj in self.get_queryset().filter(id__in=targets)}
+        # Any user's rows: a create must not collide with them either
+        taken = set(model.objects.filter(id__in=creates).values_list("id", flat=True))
+        context = self.get_serializer_context()
+        context["owned_ids"] = prefetch_owned_ids(
+            self.get_serializer_class(),
+            [op.get("data") for op in operations],
+            request.user.id,
+        )
+
+        results = []
+        with db_transaction.atomic():
+            for pk, op in zip(ids, operations):
+                try:
+                    with db_transaction.atomic():
+                        result = self.apply_operation(
+                            op, pk, instances, taken, context
+                        )
+                except IntegrityError:
+                    result = self._op_error(
+                        {"op": op.get("op"), "id": op.get("id")},
+                        {"detail": "Conflicts with an existing row."},
+                        status.HTTP_409_CONFLICT,
+                    )
+                results.append(result)
+            failed = any(result["status"] >= 400 for result in results)
+            if failed:
+                db_transaction.set_rollback(True)
+
+        if failed:
+            for result in results:
+                if result["status"] < 400:
+                    result["status"] = status.HTTP_424_FAILED_DEPENDENCY
+                    result.pop("data", None)
+            return Response({"results": results}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({"results": results})
+
+    def apply_operation(self, op, pk, instances, taken, context) -> dict:
+        kind = op.get("op")
+        result = {"op": kind, "id": op.get("id")}
+        if kind not in OPERATIONS:
+            return self._op_error(
+                result, {"op": [f"Expected one of: {', '.join(OPERATIONS)}."]}
+            )
+        if pk is None:
+            return self._op_error(result, {"id": ["A valid UUID is required."]})
+
+        if kind == OP_CREATE:
+            if pk in taken:
+                return self._op_error(
+                    result, {"id": ["Already exists."]}, status.HTTP_409_CONFLICT
+                )
+            serializer = self.get_serializer_class()(
+                data=op.get("data"), context=context
+            )
+            if not serializer.is_valid():
+                return self._op_error(result, serializer.errors)
+            serializer.validated_data["id"] = pk
+            self.perform_create(serializer)
+            instances[pk] = serializer.instance
+            taken.add(pk)
+            result.update(status=status.HTTP_201_CREATED, data=serializer.data)
+            return result
+
+        instance = instances.get(pk)
+        if instance is None:
+            return self._op_error(
+                result, {"detail": "Not found."}, status.HTTP_404_NOT_FOUND
+            )
+        if kind == OP_DELETE:
+            self.perform_destroy(instance)
+            del instances[pk]
+            return {**result, "status": status.HTTP_204_NO_CONTENT}
+
+        serializer = self.get_serializer_class()(
+            instance, data=op.get("data"), partial=True, context=context
+        )
+        if not serializer.is_valid():
+            return self._op_error(result, serializer.errors)
+        self.perform_update(serializer)
+        return {**result, "status": status.HTTP_200_OK, "data": serializer.data}
+
+    @staticmethod
+    def _op_error(result, errors, status_code=status.HTTP_400_BAD_REQUEST):
+        return {**result, "status": status_code, "errors": errors}
@@ -0,0 +1,63 @@
+"""Per-user cache versions invalidated by writes.
+
+Cached payloads embed the user's current version in their key; a write bumps
+the version so stale entries are never read again and simply age out.
+
+Versions live in the default cache, so every worker must share it: a
+process-local backend (locmem) only invalidates the worker that served the
+write, and production settings refuse it when gunicorn runs more than one
+worker. A cache that keeps nothing (dummy) gets a new version on every
+read, so nothing cached under one is ever reused.
+"""
+import time
+
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+
+
+def _version_key(namespace: str, user_id) -> str:
+    return f"version:{namespace}:{user_id}"
+
+
+def _new_epoch() -> int:
+    # Seeded from the clock so a lost counter never revisits an old version
+    return time.time_ns() // 1000
+
+
+def get_version(namespace: str, user_id) -> int:
+    key = _version_key(namespace, user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _new_epoch(), timeout=None)
+        version = cache.get(key)
+    if version is None:
+        return _new_epoch()
+    return version
+
+
+def bump_version(namespace: str, user_id) -> None:
+    key = _version_key(namespace, user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _new_epoch(), timeout=None)
+
+
+class CacheVersionMixin:
+    """
+    Viewset mixin that bumps the user's versions for `cache_namespaces`
+    after every successful unsafe request (create, update, delete, actions).
+    """
+
+    cache_namespaces: tuple = ()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and request.user is not None
+        ):
+            for namespace in self.cache_namespaces:
+                bump_version(namespace, request.user.id)
+        return response
@@ -0,0 +1,129 @@
+"""Idempotency-Key support for POST requests.
+
+A client that retries a POST after a timeout sends the same Idempotency-Key
+header both times. The first request runs normally and its response is kept
+in the cache for IDEMPOTENCY_KEY_TTL seconds; a repeat with the same key
+gets that response back (with an Idempotent-Replayed header) without running
+the view, so nothing is written twice. Keys are scoped to the user.
+
+Each key is one cache entry, so a repeat costs a single cache read: a
+primary-key lookup with the database cache backend, none at all with the
+others. A first request misses and then claims the key atomically with
+cache.add() before the view runs, so of two racing first requests only one
+runs it. The cache must be shared by all workers (see CACHE_URL) for repeats
+to be caught across them.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.response import Response
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+# How long a key stays claimed while its first request is running
+PENDING_TIMEOUT = 60
+
+_PENDING = "pending"
+_DONE = "done"
+
+
+class IdempotencyConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "A request with this Idempotency-Key is still in progress."
+    default_code = "idempotency_conflict"
+
+
+class _Replay(Exception):
+    def __init__(self, response):
+        self.response = response
+
+
+def _cache_key(user_id, key: str) -> str:
+    digest = hashlib.sha256(key.encode()).hexdigest()
+    return f"idempotency:{user_id}:{digest}"
+
+
+def _fingerprint(request) -> str:
+    """Hash of what the request asks for, to catch a key reused for another."""
+    body = json.dumps(request.data, sort_keys=True, default=str)
+    return hashlib.sha256(f"{request.get_full_path()}\n{body}".encode()).hexdigest()
+
+
+class IdempotencyMixin:
+    """
+    Viewset mixin honouring the Idempotency-Key header on POST (creates and
+    POST actions). Only responses below 400 are kept: a request that failed
+    wrote nothing, so the client may retry it with the same key.
+    """
+
+    _idempotency = None
+
+    def initial(self, request, *args, **kwargs):
+        self._idempotency = None
+        super().initial(request, *args, **kwargs)
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if request.method != "POST" or key is None or request.user is None:
+            return
+        if not 0 < len(key) <= MAX_KEY_LENGTH:
+            raise ValidationError(
+                {IDEMPOTENCY_HEADER: f"Expected 1 to {MAX_KEY_LENGTH} characters."}
+            )
+
+        cache_key = _cache_key(request.user.id, key)
+        fingerprint = _fingerprint(request)
+        stored = cache.get(cache_key)
+        if stored is None:
+            if cache.add(cache_key, (_PENDING, fingerprint), timeout=PENDING_TIMEOUT):
+                self._idempotency = (cache_key, fingerprint)
+                return
+            # Claimed by a concurrent first request since the get
+            stored = cache.get(cache_key)
+            if stored is None:
+                # ...which failed and released it again
+                raise IdempotencyConflict()
+        state, stored_fingerprint, *result = stored
+        if stored_fingerprint != fingerprint:
+            raise ValidationError(
+                {IDEMPOTENCY_HEADER: "Already used for a different request."}
+            )
+        if state == _PENDING:
+            raise IdempotencyConflict()
+        status_code, data = result
+        raise _Replay(
+            Response(data, status=status_code, headers={REPLAYED_HEADER: "true"})
+        )
+
+    def handle_exception(self, exc):
+        if isinstance(exc, _Replay):
+            return exc.response
+        try:
+            return super().handle_exception(exc)
+        except Exception:
+            self._release_idempotency_key()
+            raise
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self._idempotency is not None:
+            cache_key, fingerprint = self._idempotency
+            if isinstance(response, Response) and response.status_code < 400:
+                cache.set(
+                    cache_key,
+                    (_DONE, fingerprint, response.status_code, response.data),
+                    timeout=settings.IDEMPOTENCY_KEY_TTL,
+                )
+                self._idempotency = None
+            else:
+                self._release_idempotency_key()
+        return response
+
+    def _release_idempotency_key(self):
+        if self._idempotency is not None:
+            cache.delete(self._idempotency[0])
+            self._idempotency = None
@@ -0,0 +1,187 @@
+"""Per-request database and serialization timing.
+
+RequestMetricsMiddleware times a sample of requests and reports, in a
+Server-Timing header:
+
+    db;dur=12.4;desc="3 queries", serializer;dur=1.8, view;dur=4.0, total;dur=18.2
+
+`db` is time spent executing SQL, `serializer` covers serializer.data and
+response rendering, and `view` is the rest of the time in the view. Queries
+slower than SLOW_QUERY_MS on a sampled request are logged to the
+"finance.slow_query" logger along with the endpoint that ran them.
+
+Queries that a request runs on executor threads (the async dashboard's
+query pool, concurrent /batch/ items) count too: tasks started through
+utils.workers.run_task carry the request's metrics and add them to their own
+thread's connection, so `db` is the summed time of every query, concurrent
+or not. A streamed body (the transaction export) is produced after the
+header is sent, so its queries are not in it.
+
+Unsampled requests cost one random() call; sampled ones add a timer around
+each query and each serializer.data access.
+"""
+import json
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connection
+from rest_framework.serializers import BaseSerializer
+
+slow_query_logger = logging.getLogger("finance.slow_query")
+
+MAX_LOGGED_SQL = 2000
+
+_current_metrics: ContextVar["RequestMetrics | None"] = ContextVar(
+    "request_metrics", default=None
+)
+
+
+class RequestMetrics:
+    def __init__(self, slow_query_seconds: float):
+        self.slow_query_seconds = slow_query_seconds
+        self.query_count = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.slow_queries = []
+        # Executor threads of the same request report here concurrently
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def __call__(self, execute, sql, params, many, context):
+        """connection.execute_wrapper hook."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            with self._lock:
+                self.query_count += 1
+                self.db_time += duration
+                if duration >= self.slow_query_seconds:
+                    self.slow_queries.append((sql, duration))
+
+    def server_timing(self, total: float, render: float) -> str:
+        serializer = self.serializer_time + render
+        view = max(total - self.db_time - serializer, 0.0)
+        return ", ".join(
+            [
+                f'db;dur={self.db_time * 1000:.1f};desc="{self.query_count} queries"',
+                f"serializer;dur={serializer * 1000:.1f}",
+                f"view;dur={view * 1000:.1f}",
+                f"total;dur={total * 1000:.1f}",
+            ]
+        )
+
+
+def _timed_data(original):
+    def data(self):
+        metrics = _current_metrics.get()
+        # Serializer.data reaches BaseSerializer.data through super(); time the
+        # outermost access only
+        if metrics is None or getattr(metrics._local, "serializing", False):
+            return original(self)
+        metrics._local.serializing = True
+        start = time.perf_counter()
+        try:
+            return original(self)
+        finally:
+            elapsed = time.perf_counter() - start
+            with metrics._lock:
+                metrics.serializer_time += elapsed
+            metrics._local.serializing = False
+
+    data._request_metrics = True
+    return property(data)
+
+
+def install_serializer_timer():
+    if not getattr(BaseSerializer.data.fget, "_request_metrics", False):
+        BaseSerializer.data = _timed_data(BaseSerializer.data.fget)
+
+
+@contextmanager
+def track_queries():
+    """
+    Count this thread's queries into the current request's metrics, if it
+    is sampled. For executor threads, which the middleware does not see;
+    they need the request's context (contextvars) to find them.
+    """
+    metrics = _current_metrics.get()
+    if metrics is None:
+        yield
+        return
+    with connection.execute_wrapper(metrics):
+        yield
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = settings.REQUEST_METRICS_SAMPLE_RATE
+        self.slow_query_seconds = settings.SLOW_QUERY_MS / 1000
+        install_serializer_timer()
+
+    def __call__(self, request):
+        if not self.sample_rate or random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        metrics = RequestMetrics(self.slow_query_seconds)
+        token = _current_metrics.set(metrics)
+        request._metrics_render_start = None
+        start = time.perf_counter()
+        try:
+            with connection.execute_wrapper(metrics):
+                response = self.get_response(request)
+        finally:
+            _current_metrics.reset(token)
+        end = time.perf_counter()
+
+        render_start = request._metrics_render_start
+        render = end - render_start if render_start is not None else 0.0
+        response["Server-Timing"] = metrics.server_timing(end - start, render)
+        if metrics.slow_queries:
+            self.log_slow_queries(request, metrics)
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered right after this hook returns
+        request._metrics_render_start = time.perf_counter()
+        return response
+
+    def log_slow_queries(self, request, metrics):
+        match = request.resolver_match
+        endpoint = match.view_name if match else request.path
+        for sql, duration in metrics.slow_queries:
+            slow_query_logger.warning(
+                "slow query",
+                extra={
+                    "endpoint": endpoint,
+                    "method": request.method,
+                    "duration_ms": round(duration * 1000, 1),
+                    "query_count": metrics.query_count,
+                    "sql": sql[:MAX_LOGGED_SQL],
+                },
+            )
+
+
+class JSONLogFormatter(logging.Formatter):
+    """One JSON object per line with the record's `extra` fields."""
+
+    FIELDS = ("endpoint", "method", "duration_ms", "query_count", "sql")
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(
+            {field: getattr(record, field) for field in self.FIELDS if hasattr(record, field)}
+        )
+        return json.dumps(entry, default=str)
@@ -0,0 +1,123 @@
+"""Process-local cache of each user's category and account metadata.
+
+Aggregating endpoints label category and account ids with names, types and
+colors that change rarely. Each process keeps recently used users' metadata
+in a bounded LRU. Entries are stamped with the user's "metadata" version
+from utils.cache, which category and account writes bump; a hit costs one
+cache read and no query.
+
+A bump reaches every process only when the default cache is shared (see
+CACHE_URL; production requires one with several workers). With the
+process-local default another process can serve old names, and so can any
+process after a write made outside the API. Entries therefore also expire
+METADATA_CACHE_TTL seconds after loading. Under a cache that keeps nothing
+(dummy) each lookup gets a new version and reloads.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+from django.conf import settings
+
+from apps.accounts.models import Account
+from apps.categories.models import Category
+from .cache import get_version
+
+METADATA_NAMESPACE = "metadata"
+
+
+class CategoryMeta(NamedTuple):
+    name: str
+    type: str
+    color: str
+    icon: str
+
+
+class AccountMeta(NamedTuple):
+    name: str
+    type: str
+    provider: str
+    currency_code: str
+
+
+class LRUCache:
+    """Thread-safe mapping that drops the least recently used key past maxsize."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return None
+            return self._data[key]
+
+    def set(self, key, value) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+_cache = LRUCache(settings.METADATA_CACHE_SIZE)
+
+
+def _cached(kind: str, user_id, load) -> dict:
+    # Read the version first: a write racing the load leaves the entry under
+    # the old version, so it is reloaded on the next lookup
+    version = get_version(METADATA_NAMESPACE, user_id)
+    now = time.monotonic()
+    key = (kind, str(user_id))
+    entry = _cache.get(key)
+    if entry is not None and entry[0] == version and entry[1] > now:
+        return entry[2]
+    data = load(user_id)
+    _cache.set(key, (version, now + settings.METADATA_CACHE_TTL, data))
+    return data
+
+
+def _load_categories(user_id) -> dict:
+    rows = Category.objects.filter(user_id=user_id).values_list(
+        "id", "name", "type", "color", "icon"
+    )
+    return {str(pk): CategoryMeta(*fields) for pk, *fields in rows}
+
+
+def _load_accounts(user_id) -> dict:
+    # Inactive accounts included: their transactions still need labels
+    rows = Account.objects.filter(user_id=user_id).values_list(
+        "id", "name", "type", "provider", "currency_code"
+    )
+    return {str(pk): AccountMeta(*fields) for pk, *fields in rows}
+
+
+def category_metadata(user_id) -> dict:
+    """{str(category id): CategoryMeta} for the user's categories."""
+    return _cached("categories", user_id, _load_categories)
+
+
+def account_metadata(user_id) -> dict:
+    """{str(account id): AccountMeta} for the user's accounts."""
+    return _cached("accounts", user_id, _load_accounts)
+
+
+def category_names(user_id) -> dict:
+    return {pk: meta.name for pk, meta in category_metadata(user_id).items()}
+
+
+def clear() -> None:
+    """Drop this process's entries (tests; data changed behind the API)."""
+    _cache.clear()
@@ -0,0 +1,179 @@
+"""Reporting periods as half-open date ranges.
+
+A Period is [start, end) over dates; either side may be open. Filtering
+with `transaction_date >= start AND transaction_date < end` keeps the
+predicate sargable, so the (user_id, transaction_date) index serves it with
+a range scan, where `__month`/`__year` lookups compile to EXTRACT() and scan
+the user's whole history.
+
+Periods that start and end on month boundaries can also be answered from
+the monthly rollups (see month_span()).
+
+Query parameters (Period.from_params):
+    period=month    [year=YYYY] [month=1-12]     default: current month
+    period=quarter  [year=YYYY] [quarter=1-4]    default: current quarter
+    period=year     [year=YYYY]                  default: current year
+    period=range    [date_from=YYYY-MM-DD] [date_to=YYYY-MM-DD]  (inclusive)
+    period=rolling  days=N                       the last N days, today included
+Without `period`, date_from/date_to select a range.
+"""
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+
+PERIOD_MONTH = "month"
+PERIOD_QUARTER = "quarter"
+PERIOD_YEAR = "year"
+PERIOD_RANGE = "range"
+PERIOD_ROLLING = "rolling"
+PERIOD_KINDS = (PERIOD_MONTH, PERIOD_QUARTER, PERIOD_YEAR, PERIOD_RANGE, PERIOD_ROLLING)
+
+MAX_ROLLING_DAYS = 3660
+
+
+def _add_months(year: int, month: int, months: int) -> date:
+    index = year * 12 + (month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+@dataclass(frozen=True)
+class Period:
+    start: date | None = None  # inclusive
+    end: date | None = None  # exclusive
+
+    @classmethod
+    def month(cls, year: int, month: int) -> "Period":
+        return cls(date(year, month, 1), _add_months(year, month, 1))
+
+    @classmethod
+    def quarter(cls, year: int, quarter: int) -> "Period":
+        first_month = (quarter - 1) * 3 + 1
+        return cls(date(year, first_month, 1), _add_months(year, first_month, 3))
+
+    @classmethod
+    def year(cls, year: int) -> "Period":
+        return cls(date(year, 1, 1), date(year + 1, 1, 1))
+
+    @classmethod
+    def last_months(cls, months: int, today: date | None = None) -> "Period":
+        """The last `months` calendar months, the current one included."""
+        today = today or date.today()
+        return cls(
+            _add_months(today.year, today.month, 1 - months),
+            _add_months(today.year, today.month, 1),
+        )
+
+    @classmethod
+    def between(cls, date_from: date | None, date_to: date | None) -> "Period":
+        """
+        Inclusive bounds, as the API's date_from/date_to filters take them.
+        date_to=date.max has no day after it and leaves the end open.
+        """
+        if not date_to or date_to == date.max:
+            return cls(date_from, None)
+        return cls(date_from, date_to + timedelta(days=1))
+
+    @classmethod
+    def rolling(cls, days: int, today: date | None = None) -> "Period":
+        today = today or date.today()
+        return cls(today - timedelta(days=days - 1), today + timedelta(days=1))
+
+    @classmethod
+    def from_params(cls, params, today: date | None = None, default: str | None = None):
+        """
+        Parse a period from query parameters. Returns None when no period was
+        given and there is no `default` kind; raises ValidationError on bad input.
+        """
+        today = today or date.today()
+        kind = params.get("period") or default
+        if not kind and (params.get("date_from") or params.get("date_to")):
+            kind = PERIOD_RANGE
+        if not kind:
+            return None
+        if kind not in PERIOD_KINDS:
+            raise ValidationError({"period": f"Expected one of: {', '.join(PERIOD_KINDS)}."})
+
+        if kind == PERIOD_RANGE:
+            date_from = date_param(params, "date_from")
+            date_to = date_param(params, "date_to")
+            if date_from and date_to and date_to < date_from:
+                raise ValidationError({"date_to": "Must not be before date_from."})
+            return cls.between(date_from, date_to)
+        if kind == PERIOD_ROLLING:
+            days = int_param(params, "days", None, 1, MAX_ROLLING_DAYS)
+            if days is None:
+                raise ValidationError({"days": "This field is required."})
+            return cls.rolling(days, today)
+
+        year = int_param(params, "year", today.year, 1, 9998)
+        if kind == PERIOD_MONTH:
+            return cls.month(year, int_param(params, "month", today.month, 1, 12))
+        if kind == PERIOD_QUARTER:
+            current = (today.month - 1) // 3 + 1
+            return cls.quarter(year, int_param(params, "quarter", current, 1, 4))
+        return cls.year(year)
+
+    def q(self, field: str = "transaction_date") -> Q:
+        condition = Q()
+        if self.start:
+            condition &= Q(**{f"{field}__gte": self.start})
+        if self.end:
+            condition &= Q(**{f"{field}__lt": self.end})
+        return condition
+
+    def filter(self, queryset, field: str = "transaction_date"):
+        return queryset.filter(self.q(field))
+
+    def month_span(self):
+        """
+        ((first_year, first_month), (last_year, last_month)) covered by the
+        period, either side None when open, or None if a bound does not fall
+        on a month boundary.
+        """
+        if (self.start and self.start.day != 1) or (self.end and self.end.day != 1):
+            return None
+        last = self.end - timedelta(days=1) if self.end else None
+        return (
+            (self.start.year, self.start.month) if self.start else None,
+            (last.year, last.month) if last else None,
+        )
+
+    def months(self) -> list:
+        """[(year, month), ...] for each month of a bounded, month-aligned period."""
+        first = (self.start.year, self.start.month)
+        count = (self.end.year - first[0]) * 12 + self.end.month - first[1]
+        return [
+            (d.year, d.month) for d in (_add_months(*first, i) for i in range(count))
+        ]
+
+    def single_month(self):
+        """(year, month) if the period is exactly one calendar month, else None."""
+        span = self.month_span()
+        if span and span[0] and span[0] == span[1]:
+            return span[0]
+        return None
+
+
+def date_param(params, name: str) -> date | None:
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValidationError({name: "Expected a date in YYYY-MM-DD format."})
+
+
+def int_param(params, name: str, default, minimum: int, maximum: int):
+    value = params.get(name)
+    if value in (None, ""):
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValidationError({name: "A valid integer is required."})
+    if not minimum <= number <= maximum:
+        raise ValidationError({name: f"Must be between {minimum} and {maximum}."})
+    return number
@@ -0,0 +1,158 @@
+"""values_list() read path for list endpoints.
+
+ModelSerializer(many=True) builds a model instance per row and then calls
+each field's get_attribute() and to_representation(). For list pages the
+same output can be produced straight from values_list() rows: RowEncoder
+compiles the serializer's readable fields once into (source, converter)
+pairs and turns each row into the dict the serializer would have returned.
+
+Only plain model-field serializers qualify. A serializer with a method
+field, a dotted or relational source, or a field type without a converter
+here gets no encoder, and the list falls back to the serializer.
+"""
+import decimal
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework.settings import ISO_8601, api_settings
+
+# Field types whose database values already are their representation
+IDENTITY_FIELDS = (serializers.CharField, serializers.IntegerField, serializers.BooleanField)
+
+_encoders = {}
+
+
+def _decimal_converter(field):
+    coerce = getattr(field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+    if field.normalize_output or field.localize or not coerce:
+        return None
+    if field.decimal_places is None:
+        return lambda value: f"{value:f}"
+    exponent = decimal.Decimal(".1") ** field.decimal_places
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+    rounding = field.rounding
+
+    def convert(value):
+        return f"{value.quantize(exponent, rounding=rounding, context=context):f}"
+
+    return convert
+
+
+def _datetime_converter(field):
+    if getattr(field, "format", api_settings.DATETIME_FORMAT) != ISO_8601:
+        return None
+    tz = field.timezone if hasattr(field, "timezone") else field.default_timezone()
+    if tz is None:
+        return None
+
+    def convert(value):
+        if timezone.is_naive(value):
+            return field.to_representation(value)
+        value = value.astimezone(tz).isoformat()
+        return value[:-6] + "Z" if value.endswith("+00:00") else value
+
+    return convert
+
+
+def _date_converter(field):
+    if getattr(field, "format", api_settings.DATE_FORMAT) != ISO_8601:
+        return None
+    return lambda value: value.isoformat()
+
+
+def _converter(field):
+    """
+    (converter or None for identity) for a serializer field, or False if the
+    field has no fast converter.
+    """
+    kind = type(field)
+    if kind in IDENTITY_FIELDS:
+        return None
+    if kind is serializers.ChoiceField:
+        # Choices stored as strings map to themselves
+        if all(isinstance(key, str) for key in field.choice_strings_to_values.values()):
+            return None
+        return False
+    if kind is serializers.UUIDField:
+        return str if field.uuid_format == "hex_verbose" else False
+    if kind is serializers.DecimalField:
+        return _decimal_converter(field) or False
+    if kind is serializers.DateTimeField:
+        return _datetime_converter(field) or False
+    if kind is serializers.DateField:
+        return _date_converter(field) or False
+    return False
+
+
+class RowEncoder:
+    """Turns values_list(*sources) rows into serializer-shaped dicts."""
+
+    def __init__(self, names, sources, converters):
+        self.names = tuple(names)
+        self.sources = tuple(sources)
+        self._fields = tuple(zip(names, converters))
+
+    @classmethod
+    def for_serializer(cls, serializer):
+        """RowEncoder matching `serializer`'s output, or None if it has none."""
+        model = getattr(getattr(serializer, "Meta", None), "model", None)
+        if model is None:
+            return None
+        names, sources, converters = [], [], []
+        for field in serializer._readable_fields:
+            if "." in field.source or field.source == "*":
+                return None
+            try:
+                model_field = model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                return None
+            if model_field.is_relation or not model_field.concrete:
+                return None
+            converter = _converter(field)
+            if converter is False:
+                return None
+            names.append(field.field_name)
+            sources.append(model_field.attname)
+            converters.append(converter)
+        return cls(names, sources, converters)
+
+    def __call__(self, row):
+        return {
+            name: value if convert is None or value is None else convert(value)
+            for (name, convert), value in zip(self._fields, row)
+        }
+
+
+def row_encoder(serializer_class):
+    """Cached RowEncoder for a ModelSerializer class (None if unsupported)."""
+    key = (serializer_class, timezone.get_current_timezone_name())
+    if key not in _encoders:
+        _encoders[key] = RowEncoder.for_serializer(serializer_class())
+    return _encoders[key]
+
+
+class RowListMixin:
+    """
+    Serve `list` from values_list() rows through a RowEncoder when the
+    serializer supports it and settings.FAST_LIST_READS is on. Paginators
+    see named rows, so attribute access (e.g. for cursors) still works.
+    """
+
+    def list(self, request, *args, **kwargs):
+        encoder = settings.FAST_LIST_READS and row_encoder(self.get_serializer_class())
+        if not encoder:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset()).values_list(
+            *encoder.sources, named=True
+        )
+        page = self.paginate_queryset(queryset)
+        data = [encoder(row) for row in (queryset if page is None else page)]
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
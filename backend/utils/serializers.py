@@ -0,0 +1,69 @@
+"""Shared serializer helpers."""
+import uuid
+from collections import defaultdict
+
+from rest_framework import serializers
+
+INVALID_REFERENCE = 'Invalid pk "{value}" - object does not exist.'
+
+
+class OwnedReferencesMixin:
+    """
+    ModelSerializer mixin for UUID columns that point at another of the
+    user's rows. `owned_references` maps field name -> model; a value that is
+    not one of the requesting user's rows fails validation as if it did not
+    exist. Costs one query per referenced model, or none for models whose ids
+    the view prefetched into context["owned_ids"] (see prefetch_owned_ids).
+    """
+
+    owned_references: dict = {}
+
+    def to_internal_value(self, data):
+        attrs = super().to_internal_value(data)
+        request = self.context.get("request")
+        if request is None or request.user is None:
+            return attrs
+
+        by_model = defaultdict(dict)
+        for field, model in self.owned_references.items():
+            if attrs.get(field) is not None:
+                by_model[model][field] = attrs[field]
+
+        prefetched = self.context.get("owned_ids", {})
+        errors = {}
+        for model, values in by_model.items():
+            owned = prefetched.get(model)
+            if owned is None:
+                owned = set(
+                    model.objects.filter(
+                        user_id=request.user.id, id__in=values.values()
+                    ).values_list("id", flat=True)
+                )
+            for field, value in values.items():
+                if value not in owned:
+                    errors[field] = [INVALID_REFERENCE.format(value=value)]
+        if errors:
+            raise serializers.ValidationError(errors)
+        return attrs
+
+
+def prefetch_owned_ids(serializer_class, payloads, user_id) -> dict:
+    """
+    {model: ids owned by user_id} for every reference in `payloads`, one
+    query per model, to pass as context["owned_ids"].
+    """
+    references = getattr(serializer_class, "owned_references", {})
+    wanted = {model: set() for model in references.values()}
+    for data in payloads:
+        if not isinstance(data, dict):
+            continue
+        for field, model in references.items():
+            try:
+                wanted[model].add(uuid.UUID(str(data[field])))
+            except (KeyError, ValueError):
+                continue
+    owned = {}
+    for model, ids in wanted.items():
+        queryset = model.objects.filter(user_id=user_id, id__in=ids)
+        owned[model] = set(queryset.values_list("id", flat=True)) if ids else set()
+    return owned
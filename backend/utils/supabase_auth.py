@@ -2,8 +2,18 @@
 
 Supports both HS256 (legacy) and ES256 (current Supabase) signed tokens.
 ES256 tokens are verified via Supabase's JWKS endpoint.
+
+Verified claims are kept in a bounded LRU keyed by token hash until the
+token expires, and the JWKS is prefetched and refreshed in a background
+thread, so requests neither re-verify signatures nor wait on the network.
 """
+import hashlib
+import logging
 import ssl
+import threading
+import time
+from collections import OrderedDict
+
 import certifi
 import jwt
 from jwt import PyJWKClient
@@ -11,19 +21,140 @@ from django.conf import settings
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 
+logger = logging.getLogger(__name__)
+
+TOKEN_CACHE_SIZE = 10_000
+JWKS_REFRESH_INTERVAL = 300  # seconds
+# Longer than the refresh interval so a request only fetches if refreshing stalls
+JWKS_CACHE_LIFESPAN = 3600
+
+
+class VerifiedTokenCache:
+    """Thread-safe LRU of verified JWT claims, honored until the token's exp."""
+
+    def __init__(self, maxsize: int = TOKEN_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str):
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, token: str, payload: dict) -> None:
+        exp = payload.get("exp")
+        if not isinstance(exp, (int, float)):
+            return  # never cache tokens that do not expire
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (payload, exp)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+
+_token_cache = VerifiedTokenCache()
+
+
+def token_cache_stats() -> dict:
+    """Hit/miss counters of this process's verified-token cache."""
+    return _token_cache.stats()
+
 
 # Cache the JWKS client per project URL
 _jwks_clients: dict = {}
+_jwks_refreshers: dict = {}
+_jwks_lock = threading.Lock()
 
 
 def _get_jwks_client(supabase_url: str) -> PyJWKClient:
-    if supabase_url not in _jwks_clients:
-        ssl_context = ssl.create_default_context(cafile=certifi.where())
-        _jwks_clients[supabase_url] = PyJWKClient(
-            f"{supabase_url}/auth/v1/.well-known/jwks.json",
-            ssl_context=ssl_context,
-        )
-    return _jwks_clients[supabase_url]
+    with _jwks_lock:
+        if supabase_url not in _jwks_clients:
+            ssl_context = ssl.create_default_context(cafile=certifi.where())
+            _jwks_clients[supabase_url] = PyJWKClient(
+                f"{supabase_url}/auth/v1/.well-known/jwks.json",
+                lifespan=JWKS_CACHE_LIFESPAN,
+                ssl_context=ssl_context,
+            )
+        return _jwks_clients[supabase_url]
+
+
+class JWKSRefresher(threading.Thread):
+    """Daemon thread that fetches the JWKS immediately, then every `interval`."""
+
+    def __init__(self, client: PyJWKClient, interval: float = JWKS_REFRESH_INTERVAL):
+        super().__init__(name="jwks-refresher", daemon=True)
+        self.client = client
+        self.interval = interval
+        self._stopped = threading.Event()
+
+    def run(self):
+        while True:
+            try:
+                self.client.get_jwk_set(refresh=True)
+            except jwt.PyJWKClientError as exc:
+                logger.warning("JWKS refresh failed: %s", exc)
+            if self._stopped.wait(self.interval):
+                return
+
+    def stop(self):
+        self._stopped.set()
+
+
+def start_jwks_refresh(supabase_url: str | None = None, interval: float | None = None):
+    """
+    Prefetch the project's JWKS and keep it fresh in the background.
+    Call once per worker process at startup (wsgi.py / asgi.py); repeated
+    calls for the same URL are no-ops.
+    """
+    supabase_url = supabase_url or getattr(settings, "SUPABASE_URL", "")
+    if not supabase_url:
+        return None
+    client = _get_jwks_client(supabase_url)
+    with _jwks_lock:
+        refresher = _jwks_refreshers.get(supabase_url)
+        if refresher is None or not refresher.is_alive():
+            refresher = JWKSRefresher(client, interval or JWKS_REFRESH_INTERVAL)
+            _jwks_refreshers[supabase_url] = refresher
+            refresher.start()
+    return refresher
+
+
+def stop_jwks_refresh() -> None:
+    with _jwks_lock:
+        refreshers = list(_jwks_refreshers.values())
+        _jwks_refreshers.clear()
+    for refresher in refreshers:
+        refresher.stop()
 
 
 class SupabaseUser:
@@ -62,6 +193,15 @@ class SupabaseJWTAuthentication(BaseAuthentication):
         if not token:
             return None
 
+        payload = _token_cache.get(token)
+        if payload is None:
+            payload = self._verify(token)
+            _token_cache.set(token, payload)
+
+        user = SupabaseUser(payload)
+        return (user, token)
+
+    def _verify(self, token: str) -> dict:
         try:
             header = jwt.get_unverified_header(token)
             alg = header.get("alg", "HS256")
@@ -92,9 +232,10 @@ class SupabaseJWTAuthentication(BaseAuthentication):
             raise AuthenticationFailed("Invalid token audience.")
         except jwt.InvalidTokenError as exc:
             raise AuthenticationFailed(f"Invalid token: {exc}")
+        except jwt.PyJWKClientError as exc:
+            raise AuthenticationFailed(f"Unable to verify token signature: {exc}")
 
-        user = SupabaseUser(payload)
-        return (user, token)
+        return payload
 
     def authenticate_header(self, request):
         return "Bearer"
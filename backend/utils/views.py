@@ -3,11 +3,17 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 
+from .supabase_auth import token_cache_stats
+
 
 class HealthCheckView(APIView):
-    """Health check endpoint for Render keep-alive monitoring."""
+    """
+    Health check endpoint for Render keep-alive monitoring.
+    Also reports this process's verified-token cache counters (hits,
+    misses, size, maxsize) under token_cache.
+    """
 
     permission_classes = [AllowAny]
 
     def get(self, request):
-        return Response({"status": "ok"})
+        return Response({"status": "ok", "token_cache": token_cache_stats()})
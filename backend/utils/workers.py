@@ -0,0 +1,28 @@
+"""Connection handling for work run on executor threads.
+
+Django expires stale connections when a request starts and closes them when
+it finishes (or keeps them, up to CONN_MAX_AGE), but only on the thread that
+serves the request. Executor threads outlive requests, so each task does the
+same around itself; otherwise with CONN_MAX_AGE=0 every pool thread keeps an
+idle connection open after its first task.
+
+Tasks also count their queries into the request's Server-Timing metrics
+(utils.instrumentation), provided they run in the request's context:
+sync_to_async copies it, a plain executor needs contextvars.copy_context().
+"""
+from django.db import close_old_connections
+
+from .instrumentation import track_queries
+
+
+def run_task(func, *args):
+    """
+    Call func(*args) between the connection cleanup of a request, counting
+    its queries into the request's metrics.
+    """
+    close_old_connections()
+    try:
+        with track_queries():
+            return func(*args)
+    finally:
+        close_old_connections()
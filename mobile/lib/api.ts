@@ -15,3 +15,43 @@ api.interceptors.request.use(async (config) => {
   }
   return config
 })
+
+export interface BatchItem<T = unknown> {
+  path: string
+  status: number
+  body: T
+}
+
+// Fetch several GET paths (relative to the API base URL) in one round trip;
+// items come back in order, each with its own status
+export async function batchGet(paths: string[]): Promise<BatchItem[]> {
+  const { data } = await api.post<{ responses: BatchItem[] }>('/batch/', { paths })
+  return data.responses
+}
+
+export type BulkOperation =
+  | { op: 'create'; id: string; data: Record<string, unknown> }
+  | { op: 'update'; id: string; data: Record<string, unknown> }
+  | { op: 'delete'; id: string }
+
+export interface BulkResult {
+  op: BulkOperation['op']
+  id: string
+  status: number
+  data?: Record<string, unknown>
+  errors?: Record<string, unknown>
+}
+
+// Replay queued offline writes for one resource (e.g. 'transactions',
+// 'savings/plans') in a single transaction: all apply or none do
+export async function bulkWrite(
+  resource: string,
+  operations: BulkOperation[]
+): Promise<{ ok: boolean; results: BulkResult[] }> {
+  const response = await api.post<{ results: BulkResult[] }>(
+    `/${resource}/bulk/`,
+    { operations },
+    { validateStatus: (status) => status === 200 || status === 400 }
+  )
+  return { ok: response.status === 200, results: response.data.results ?? [] }
+}
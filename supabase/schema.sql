@@ -40,7 +40,8 @@ CREATE TABLE public.categories (
     icon TEXT NOT NULL DEFAULT '',
     color CHAR(7) NOT NULL DEFAULT '#94a3b8',
     is_default BOOLEAN NOT NULL DEFAULT FALSE,
-    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
 );
 
 ALTER TABLE public.categories ENABLE ROW LEVEL SECURITY;
@@ -119,11 +120,77 @@ ALTER TABLE public.transactions ENABLE ROW LEVEL SECURITY;
 CREATE POLICY "transactions_all" ON public.transactions
     FOR ALL USING (auth.uid() = user_id);
 
-CREATE INDEX idx_transactions_user_date ON public.transactions (user_id, transaction_date DESC);
+-- Covers the list ordering and the keyset cursor (transaction_date, created_at, id)
+CREATE INDEX idx_transactions_user_date ON public.transactions (user_id, transaction_date DESC, created_at DESC, id DESC);
 CREATE INDEX idx_transactions_account ON public.transactions (account_id);
 CREATE INDEX idx_transactions_category ON public.transactions (category_id);
 
 
+-- ============================================================
+-- TRANSACTION SEARCH
+-- GET /transactions/?search= matches a prefix tsquery against
+-- search_vector and, for partial or misspelled merchant names, pg_trgm
+-- word similarity against description (apps/transactions/search.py).
+-- ============================================================
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+ALTER TABLE public.transactions ADD COLUMN search_vector TSVECTOR
+    GENERATED ALWAYS AS (to_tsvector('simple', description || ' ' || notes)) STORED;
+
+CREATE INDEX idx_transactions_search ON public.transactions USING GIN (search_vector);
+CREATE INDEX idx_transactions_description_trgm
+    ON public.transactions USING GIN (description gin_trgm_ops);
+
+
+-- ============================================================
+-- TRANSACTION MONTHLY ROLLUPS
+-- Maintained by transaction_rollup_trigger; read by the aggregating
+-- endpoints instead of summing raw transactions.
+-- ============================================================
+CREATE TABLE public.transaction_monthly_rollups (
+    id BIGSERIAL PRIMARY KEY,
+    user_id UUID NOT NULL REFERENCES public.profiles(id) ON DELETE CASCADE,
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL CHECK (month BETWEEN 1 AND 12),
+    category_id UUID,
+    type TEXT NOT NULL CHECK (type IN ('income', 'expense', 'transfer')),
+    total_amount NUMERIC(17, 2) NOT NULL DEFAULT 0,
+    transaction_count INTEGER NOT NULL DEFAULT 0,
+    UNIQUE NULLS NOT DISTINCT (user_id, year, month, category_id, type)
+);
+
+ALTER TABLE public.transaction_monthly_rollups ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "transaction_monthly_rollups_select" ON public.transaction_monthly_rollups
+    FOR SELECT USING (auth.uid() = user_id);
+
+
+-- ============================================================
+-- ACCOUNT BALANCE SNAPSHOTS
+-- An account's balance at the end of each day with activity, kept in sync
+-- by the balance_snapshot triggers; days without a row carry the previous
+-- day's balance forward. Balance history and net worth charts read one
+-- range of this table instead of replaying the ledger.
+-- ============================================================
+CREATE TABLE public.account_balance_snapshots (
+    id BIGSERIAL PRIMARY KEY,
+    user_id UUID NOT NULL REFERENCES public.profiles(id) ON DELETE CASCADE,
+    account_id UUID NOT NULL REFERENCES public.accounts(id) ON DELETE CASCADE,
+    snapshot_date DATE NOT NULL,
+    balance NUMERIC(17, 2) NOT NULL,
+    UNIQUE (account_id, snapshot_date)
+);
+
+ALTER TABLE public.account_balance_snapshots ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "account_balance_snapshots_select" ON public.account_balance_snapshots
+    FOR SELECT USING (auth.uid() = user_id);
+
+-- The unique key serves one account's history; this serves net worth
+CREATE INDEX idx_account_balance_snapshots_user_date
+    ON public.account_balance_snapshots (user_id, snapshot_date);
+
+
 -- ============================================================
 -- SAVING PLANS
 -- ============================================================
@@ -147,6 +214,27 @@ CREATE POLICY "saving_plans_all" ON public.saving_plans
     FOR ALL USING (auth.uid() = user_id);
 
 
+-- ============================================================
+-- SAVING SUGGESTIONS
+-- One row per user and month, written in bulk by the nightly
+-- compute_saving_suggestions command and read by GET /savings/suggestions/.
+-- ============================================================
+CREATE TABLE public.saving_suggestions (
+    id BIGSERIAL PRIMARY KEY,
+    user_id UUID NOT NULL REFERENCES public.profiles(id) ON DELETE CASCADE,
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL CHECK (month BETWEEN 1 AND 12),
+    payload JSONB NOT NULL,
+    computed_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    UNIQUE (user_id, year, month)
+);
+
+ALTER TABLE public.saving_suggestions ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "saving_suggestions_select" ON public.saving_suggestions
+    FOR SELECT USING (auth.uid() = user_id);
+
+
 -- ============================================================
 -- TRIGGER: Auto-update updated_at
 -- ============================================================
@@ -162,6 +250,10 @@ CREATE TRIGGER profiles_updated_at
     BEFORE UPDATE ON public.profiles
     FOR EACH ROW EXECUTE FUNCTION set_updated_at();
 
+CREATE TRIGGER categories_updated_at
+    BEFORE UPDATE ON public.categories
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
 CREATE TRIGGER budget_plans_updated_at
     BEFORE UPDATE ON public.budget_plans
     FOR EACH ROW EXECUTE FUNCTION set_updated_at();
@@ -179,6 +271,68 @@ CREATE TRIGGER saving_plans_updated_at
     FOR EACH ROW EXECUTE FUNCTION set_updated_at();
 
 
+-- ============================================================
+-- DELTA SYNC
+-- GET /sync/ pages each table by (updated_at, id) per user and reports
+-- deletes from sync_tombstones, which the triggers below fill. No foreign
+-- key on user_id: deleting a profile cascades into deletes that still
+-- write tombstones. Old tombstones are removed by purge_sync_tombstones.
+-- ============================================================
+CREATE TABLE public.sync_tombstones (
+    id BIGSERIAL PRIMARY KEY,
+    user_id UUID NOT NULL,
+    entity TEXT NOT NULL,
+    object_id UUID NOT NULL,
+    deleted_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+ALTER TABLE public.sync_tombstones ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "sync_tombstones_select" ON public.sync_tombstones
+    FOR SELECT USING (auth.uid() = user_id);
+
+CREATE INDEX idx_sync_tombstones_user_deleted ON public.sync_tombstones (user_id, deleted_at, id);
+CREATE INDEX idx_accounts_user_updated ON public.accounts (user_id, updated_at, id);
+CREATE INDEX idx_transactions_user_updated ON public.transactions (user_id, updated_at, id);
+CREATE INDEX idx_categories_user_updated ON public.categories (user_id, updated_at, id);
+CREATE INDEX idx_budget_plans_user_updated ON public.budget_plans (user_id, updated_at, id);
+CREATE INDEX idx_saving_plans_user_updated ON public.saving_plans (user_id, updated_at, id);
+
+CREATE OR REPLACE FUNCTION record_sync_tombstones()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO public.sync_tombstones (user_id, entity, object_id)
+    SELECT user_id, TG_TABLE_NAME, id FROM old_rows;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+CREATE TRIGGER accounts_tombstones
+    AFTER DELETE ON public.accounts
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION record_sync_tombstones();
+
+CREATE TRIGGER transactions_tombstones
+    AFTER DELETE ON public.transactions
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION record_sync_tombstones();
+
+CREATE TRIGGER categories_tombstones
+    AFTER DELETE ON public.categories
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION record_sync_tombstones();
+
+CREATE TRIGGER budget_plans_tombstones
+    AFTER DELETE ON public.budget_plans
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION record_sync_tombstones();
+
+CREATE TRIGGER saving_plans_tombstones
+    AFTER DELETE ON public.saving_plans
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION record_sync_tombstones();
+
+
 -- ============================================================
 -- TRIGGER: Auto-create profile on Supabase signup
 -- ============================================================
@@ -203,55 +357,413 @@ CREATE TRIGGER on_auth_user_created
 
 -- ============================================================
 -- TRIGGER: Auto-update account balance on transaction change
+-- Statement-level: the transition tables of each INSERT/UPDATE/DELETE
+-- statement are folded into one net delta per account, so bulk imports,
+-- bulk deletes and recategorizations touch every account row once.
 -- ============================================================
-CREATE OR REPLACE FUNCTION update_account_balance()
+DROP TRIGGER IF EXISTS transaction_balance_trigger ON public.transactions;
+DROP FUNCTION IF EXISTS update_account_balance();
+
+CREATE OR REPLACE FUNCTION update_account_balances()
 RETURNS TRIGGER AS $$
 BEGIN
     IF TG_OP = 'INSERT' THEN
-        IF NEW.type = 'income' THEN
-            UPDATE public.accounts SET current_balance = current_balance + NEW.amount WHERE id = NEW.account_id;
-        ELSIF NEW.type = 'expense' THEN
-            UPDATE public.accounts SET current_balance = current_balance - NEW.amount WHERE id = NEW.account_id;
-        ELSIF NEW.type = 'transfer' THEN
-            UPDATE public.accounts SET current_balance = current_balance - NEW.amount WHERE id = NEW.account_id;
-            UPDATE public.accounts SET current_balance = current_balance + NEW.amount WHERE id = NEW.transfer_to_account_id;
-        END IF;
+        UPDATE public.accounts a
+        SET current_balance = a.current_balance + d.delta
+        FROM (
+            SELECT account_id, SUM(delta) AS delta
+            FROM (
+                SELECT account_id,
+                       CASE WHEN type = 'income' THEN amount ELSE -amount END AS delta
+                FROM new_rows
+                UNION ALL
+                SELECT transfer_to_account_id, amount
+                FROM new_rows
+                WHERE type = 'transfer' AND transfer_to_account_id IS NOT NULL
+            ) legs
+            GROUP BY account_id
+        ) d
+        WHERE a.id = d.account_id AND d.delta <> 0;
 
     ELSIF TG_OP = 'DELETE' THEN
-        IF OLD.type = 'income' THEN
-            UPDATE public.accounts SET current_balance = current_balance - OLD.amount WHERE id = OLD.account_id;
-        ELSIF OLD.type = 'expense' THEN
-            UPDATE public.accounts SET current_balance = current_balance + OLD.amount WHERE id = OLD.account_id;
-        ELSIF OLD.type = 'transfer' THEN
-            UPDATE public.accounts SET current_balance = current_balance + OLD.amount WHERE id = OLD.account_id;
-            UPDATE public.accounts SET current_balance = current_balance - OLD.amount WHERE id = OLD.transfer_to_account_id;
-        END IF;
+        UPDATE public.accounts a
+        SET current_balance = a.current_balance + d.delta
+        FROM (
+            SELECT account_id, SUM(delta) AS delta
+            FROM (
+                SELECT account_id,
+                       CASE WHEN type = 'income' THEN -amount ELSE amount END AS delta
+                FROM old_rows
+                UNION ALL
+                SELECT transfer_to_account_id, -amount
+                FROM old_rows
+                WHERE type = 'transfer' AND transfer_to_account_id IS NOT NULL
+            ) legs
+            GROUP BY account_id
+        ) d
+        WHERE a.id = d.account_id AND d.delta <> 0;
 
     ELSIF TG_OP = 'UPDATE' THEN
-        -- Reverse the old transaction
-        IF OLD.type = 'income' THEN
-            UPDATE public.accounts SET current_balance = current_balance - OLD.amount WHERE id = OLD.account_id;
-        ELSIF OLD.type = 'expense' THEN
-            UPDATE public.accounts SET current_balance = current_balance + OLD.amount WHERE id = OLD.account_id;
-        ELSIF OLD.type = 'transfer' THEN
-            UPDATE public.accounts SET current_balance = current_balance + OLD.amount WHERE id = OLD.account_id;
-            UPDATE public.accounts SET current_balance = current_balance - OLD.amount WHERE id = OLD.transfer_to_account_id;
-        END IF;
-        -- Apply the new transaction
-        IF NEW.type = 'income' THEN
-            UPDATE public.accounts SET current_balance = current_balance + NEW.amount WHERE id = NEW.account_id;
-        ELSIF NEW.type = 'expense' THEN
-            UPDATE public.accounts SET current_balance = current_balance - NEW.amount WHERE id = NEW.account_id;
-        ELSIF NEW.type = 'transfer' THEN
-            UPDATE public.accounts SET current_balance = current_balance - NEW.amount WHERE id = NEW.account_id;
-            UPDATE public.accounts SET current_balance = current_balance + NEW.amount WHERE id = NEW.transfer_to_account_id;
-        END IF;
+        -- Reverse the old rows and apply the new ones in a single pass
+        UPDATE public.accounts a
+        SET current_balance = a.current_balance + d.delta
+        FROM (
+            SELECT account_id, SUM(delta) AS delta
+            FROM (
+                SELECT account_id,
+                       CASE WHEN type = 'income' THEN -amount ELSE amount END AS delta
+                FROM old_rows
+                UNION ALL
+                SELECT transfer_to_account_id, -amount
+                FROM old_rows
+                WHERE type = 'transfer' AND transfer_to_account_id IS NOT NULL
+                UNION ALL
+                SELECT account_id,
+                       CASE WHEN type = 'income' THEN amount ELSE -amount END
+                FROM new_rows
+                UNION ALL
+                SELECT transfer_to_account_id, amount
+                FROM new_rows
+                WHERE type = 'transfer' AND transfer_to_account_id IS NOT NULL
+            ) legs
+            GROUP BY account_id
+        ) d
+        WHERE a.id = d.account_id AND d.delta <> 0;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Transition tables require one trigger per event
+CREATE TRIGGER transaction_balance_insert
+    AFTER INSERT ON public.transactions
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION update_account_balances();
+
+CREATE TRIGGER transaction_balance_update
+    AFTER UPDATE ON public.transactions
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION update_account_balances();
+
+CREATE TRIGGER transaction_balance_delete
+    AFTER DELETE ON public.transactions
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION update_account_balances();
+
+
+-- ============================================================
+-- TRIGGER: Keep monthly rollups in sync with transactions
+-- ============================================================
+CREATE OR REPLACE FUNCTION apply_monthly_rollup(
+    p_user_id UUID,
+    p_date DATE,
+    p_category_id UUID,
+    p_type TEXT,
+    p_amount NUMERIC,
+    p_count INTEGER
+)
+RETURNS VOID AS $$
+BEGIN
+    INSERT INTO public.transaction_monthly_rollups AS r
+        (user_id, year, month, category_id, type, total_amount, transaction_count)
+    VALUES (
+        p_user_id,
+        EXTRACT(YEAR FROM p_date)::INTEGER,
+        EXTRACT(MONTH FROM p_date)::INTEGER,
+        p_category_id,
+        p_type,
+        p_amount,
+        p_count
+    )
+    ON CONFLICT (user_id, year, month, category_id, type) DO UPDATE
+        SET total_amount = r.total_amount + EXCLUDED.total_amount,
+            transaction_count = r.transaction_count + EXCLUDED.transaction_count;
+
+    DELETE FROM public.transaction_monthly_rollups
+    WHERE user_id = p_user_id
+      AND year = EXTRACT(YEAR FROM p_date)::INTEGER
+      AND month = EXTRACT(MONTH FROM p_date)::INTEGER
+      AND category_id IS NOT DISTINCT FROM p_category_id
+      AND type = p_type
+      AND transaction_count = 0;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- Only the trigger below may call it: Supabase grants EXECUTE on public
+-- functions to anon and authenticated, and over RPC this would rewrite any
+-- user's rollups past RLS
+REVOKE EXECUTE ON FUNCTION apply_monthly_rollup(UUID, DATE, UUID, TEXT, NUMERIC, INTEGER)
+    FROM PUBLIC, anon, authenticated;
+
+CREATE OR REPLACE FUNCTION update_monthly_rollup()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'UPDATE'
+        AND (OLD.user_id, OLD.transaction_date, OLD.category_id, OLD.type, OLD.amount)
+            IS NOT DISTINCT FROM
+            (NEW.user_id, NEW.transaction_date, NEW.category_id, NEW.type, NEW.amount)
+    THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM public.apply_monthly_rollup(
+            OLD.user_id, OLD.transaction_date, OLD.category_id, OLD.type, -OLD.amount, -1
+        );
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM public.apply_monthly_rollup(
+            NEW.user_id, NEW.transaction_date, NEW.category_id, NEW.type, NEW.amount, 1
+        );
     END IF;
 
     RETURN NULL;
 END;
 $$ LANGUAGE plpgsql SECURITY DEFINER;
 
-CREATE TRIGGER transaction_balance_trigger
+CREATE TRIGGER transaction_rollup_trigger
     AFTER INSERT OR UPDATE OR DELETE ON public.transactions
-    FOR EACH ROW EXECUTE FUNCTION update_account_balance();
+    FOR EACH ROW EXECUTE FUNCTION update_monthly_rollup();
+
+
+-- ============================================================
+-- TRIGGER: Keep daily balance snapshots in sync with transactions
+-- Statement-level like the balance trigger: each statement's legs are
+-- folded into one delta per account and day. A day without a snapshot is
+-- inserted at the previous day's balance, then every delta is added to its
+-- day and all later days, so backdated writes roll forward.
+-- ============================================================
+CREATE OR REPLACE FUNCTION apply_balance_snapshots(
+    p_account_ids UUID[],
+    p_dates DATE[],
+    p_deltas NUMERIC[]
+)
+RETURNS VOID AS $$
+BEGIN
+    INSERT INTO public.account_balance_snapshots
+        (user_id, account_id, snapshot_date, balance)
+    SELECT a.user_id, d.account_id, d.snapshot_date, COALESCE((
+        SELECT s.balance
+        FROM public.account_balance_snapshots s
+        WHERE s.account_id = d.account_id AND s.snapshot_date < d.snapshot_date
+        ORDER BY s.snapshot_date DESC
+        LIMIT 1
+    ), a.initial_balance)
+    FROM (
+        SELECT DISTINCT account_id, snapshot_date
+        FROM unnest(p_account_ids, p_dates) AS d (account_id, snapshot_date)
+    ) d
+    JOIN public.accounts a ON a.id = d.account_id
+    ON CONFLICT (account_id, snapshot_date) DO NOTHING;
+
+    UPDATE public.account_balance_snapshots s
+    SET balance = s.balance + x.delta
+    FROM (
+        SELECT later.id, SUM(d.delta) AS delta
+        FROM unnest(p_account_ids, p_dates, p_deltas)
+            AS d (account_id, snapshot_date, delta)
+        JOIN public.account_balance_snapshots later
+            ON later.account_id = d.account_id
+           AND later.snapshot_date >= d.snapshot_date
+        GROUP BY later.id
+    ) x
+    WHERE s.id = x.id;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- Only the trigger below may call it: Supabase grants EXECUTE on public
+-- functions to anon and authenticated, and over RPC this would write any
+-- account's snapshots past RLS
+REVOKE EXECUTE ON FUNCTION apply_balance_snapshots(UUID[], DATE[], NUMERIC[])
+    FROM PUBLIC, anon, authenticated;
+
+CREATE OR REPLACE FUNCTION update_balance_snapshots()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_account_ids UUID[];
+    v_dates DATE[];
+    v_deltas NUMERIC[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(account_id), array_agg(transaction_date), array_agg(delta)
+        INTO v_account_ids, v_dates, v_deltas
+        FROM (
+            SELECT account_id, transaction_date, SUM(delta) AS delta
+            FROM (
+                SELECT account_id, transaction_date,
+                       CASE WHEN type = 'income' THEN amount ELSE -amount END AS delta
+                FROM new_rows
+                UNION ALL
+                SELECT transfer_to_account_id, transaction_date, amount
+                FROM new_rows
+                WHERE type = 'transfer' AND transfer_to_account_id IS NOT NULL
+            ) legs
+            GROUP BY account_id, transaction_date
+        ) d
+        WHERE delta <> 0;
+
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(account_id), array_agg(transaction_date), array_agg(delta)
+        INTO v_account_ids, v_dates, v_deltas
+        FROM (
+            SELECT account_id, transaction_date, SUM(delta) AS delta
+            FROM (
+                SELECT account_id, transaction_date,
+                       CASE WHEN type = 'income' THEN -amount ELSE amount END AS delta
+                FROM old_rows
+                UNION ALL
+                SELECT transfer_to_account_id, transaction_date, -amount
+                FROM old_rows
+                WHERE type = 'transfer' AND transfer_to_account_id IS NOT NULL
+            ) legs
+            GROUP BY account_id, transaction_date
+        ) d
+        WHERE delta <> 0;
+
+    ELSIF TG_OP = 'UPDATE' THEN
+        -- Reverse the old rows on their dates and apply the new ones on theirs
+        SELECT array_agg(account_id), array_agg(transaction_date), array_agg(delta)
+        INTO v_account_ids, v_dates, v_deltas
+        FROM (
+            SELECT account_id, transaction_date, SUM(delta) AS delta
+            FROM (
+                SELECT account_id, transaction_date,
+                       CASE WHEN type = 'income' THEN -amount ELSE amount END AS delta
+                FROM old_rows
+                UNION ALL
+                SELECT transfer_to_account_id, transaction_date, -amount
+                FROM old_rows
+                WHERE type = 'transfer' AND transfer_to_account_id IS NOT NULL
+                UNION ALL
+                SELECT account_id, transaction_date,
+                       CASE WHEN type = 'income' THEN amount ELSE -amount END
+                FROM new_rows
+                UNION ALL
+                SELECT transfer_to_account_id, transaction_date, amount
+                FROM new_rows
+                WHERE type = 'transfer' AND transfer_to_account_id IS NOT NULL
+            ) legs
+            GROUP BY account_id, transaction_date
+        ) d
+        WHERE delta <> 0;
+    END IF;
+
+    IF v_account_ids IS NOT NULL THEN
+        PERFORM public.apply_balance_snapshots(v_account_ids, v_dates, v_deltas);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+CREATE TRIGGER transaction_balance_snapshot_insert
+    AFTER INSERT ON public.transactions
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION update_balance_snapshots();
+
+CREATE TRIGGER transaction_balance_snapshot_update
+    AFTER UPDATE ON public.transactions
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION update_balance_snapshots();
+
+CREATE TRIGGER transaction_balance_snapshot_delete
+    AFTER DELETE ON public.transactions
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION update_balance_snapshots();
+
+
+-- ============================================================
+-- FUNCTION: Whole dashboard payload in one round trip
+-- Mirrors apps/dashboard/payload.py and returns the same JSON, so
+-- DashboardView can pass it through (DASHBOARD_PAYLOAD_SQL=true).
+-- SECURITY INVOKER: called over the Data API, RLS still limits it to
+-- the caller's own rows.
+-- ============================================================
+CREATE OR REPLACE FUNCTION dashboard_payload(p_user_id UUID, p_today DATE)
+RETURNS JSON AS $$
+    WITH active_accounts AS (
+        SELECT *
+        FROM public.accounts
+        WHERE user_id = p_user_id AND is_active
+    ),
+    recent AS (
+        SELECT id, type, amount, description, transaction_date, account_id,
+               category_id, created_at
+        FROM public.transactions
+        WHERE user_id = p_user_id
+        ORDER BY transaction_date DESC, created_at DESC, id DESC
+        LIMIT 10
+    ),
+    month_totals AS (
+        SELECT category_id, type, total_amount
+        FROM public.transaction_monthly_rollups
+        WHERE user_id = p_user_id
+          AND year = EXTRACT(YEAR FROM p_today)::INTEGER
+          AND month = EXTRACT(MONTH FROM p_today)::INTEGER
+    ),
+    budgets AS (
+        SELECT id, category_id, planned_amount
+        FROM public.budget_plans
+        WHERE user_id = p_user_id
+          AND year = EXTRACT(YEAR FROM p_today)::INTEGER
+          AND month = EXTRACT(MONTH FROM p_today)::INTEGER
+        ORDER BY planned_amount DESC, id
+        LIMIT 5
+    )
+    SELECT json_build_object(
+        'consolidated_balance', (
+            SELECT COALESCE(SUM(current_balance), 0.0)
+            FROM active_accounts
+            WHERE type <> 'credit_card'
+        ),
+        'credit_cards', COALESCE((
+            SELECT json_agg(json_build_object(
+                'id', id,
+                'name', name,
+                'provider', provider,
+                'current_balance', current_balance,
+                'credit_limit', NULLIF(credit_limit, 0),
+                'billing_date', billing_date,
+                'due_date', due_date
+            ) ORDER BY created_at, id)
+            FROM active_accounts
+            WHERE type = 'credit_card'
+        ), '[]'::json),
+        'recent_transactions', COALESCE((
+            SELECT json_agg(json_build_object(
+                'id', id,
+                'type', type,
+                'amount', amount,
+                'description', description,
+                'transaction_date', transaction_date,
+                'account_id', account_id,
+                'category_id', category_id
+            ) ORDER BY transaction_date DESC, created_at DESC, id DESC)
+            FROM recent
+        ), '[]'::json),
+        'monthly_income', COALESCE(
+            (SELECT SUM(total_amount) FROM month_totals WHERE type = 'income'), 0
+        ),
+        'monthly_expenses', COALESCE(
+            (SELECT SUM(total_amount) FROM month_totals WHERE type = 'expense'), 0
+        ),
+        'budget_overview', COALESCE((
+            SELECT json_agg(json_build_object(
+                'category_id', b.category_id,
+                'category_name', COALESCE(c.name, 'Unknown'),
+                'planned', b.planned_amount,
+                'actual', COALESCE((
+                    SELECT SUM(m.total_amount)
+                    FROM month_totals m
+                    WHERE m.type = 'expense' AND m.category_id = b.category_id
+                ), 0)
+            ) ORDER BY b.planned_amount DESC, b.id)
+            FROM budgets b
+            LEFT JOIN public.categories c ON c.id = b.category_id
+        ), '[]'::json),
+        'current_month', json_build_object(
+            'month', EXTRACT(MONTH FROM p_today)::INTEGER,
+            'year', EXTRACT(YEAR FROM p_today)::INTEGER
+        )
+    );
+$$ LANGUAGE sql STABLE;